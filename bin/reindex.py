@@ -0,0 +1,42 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Run full reindex of fulltext records in worker processes.
+
+Usage: python bin/reindex.py --processes 4 [--snapshots] [--resume]
+"""
+import argparse
+import json
+
+from ggrc.app import app
+from ggrc.fulltext import reindex
+
+
+def main():
+  """Parse arguments and run the reindex."""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument("--processes", type=int, default=1,
+                      help="number of worker processes")
+  parser.add_argument("--snapshots", action="store_true",
+                      help="reindex snapshots as well")
+  parser.add_argument("--resume", action="store_true",
+                      help="skip partitions finished by the previous run")
+  parser.add_argument("--partition-size", type=int,
+                      default=reindex.PARTITION_SIZE,
+                      help="number of ids in one partition")
+  parser.add_argument("models", nargs="*",
+                      help="names of models to reindex, all by default")
+  args = parser.parse_args()
+  with app.app_context():
+    report = reindex.run(
+        model_names=args.models or None,
+        with_snapshots=args.snapshots,
+        processes=args.processes,
+        resume=args.resume,
+        partition_size=args.partition_size,
+    )
+  print json.dumps(report, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+  main()
@@ -153,14 +153,25 @@ def init_permissions_provider():
   permissions.get_permissions_provider()
 
 
+def init_publish_plans():
+  """Compile JSON publish plans of all models."""
+  from ggrc.builder import json
+  from ggrc.models import all_models
+  json.compile_publish_plans(all_models.all_models)
+
+
 def init_extra_listeners():
   """Initializes listeners for additional services"""
   from ggrc.automapper import register_automapping_listeners
   from ggrc.snapshotter.listeners import register_snapshot_listeners
   from ggrc.fulltext import listeners
+  from ggrc.query.result_cache import register_result_cache_listeners
+  from ggrc.cache.utils import register_permission_cache_listeners
   register_automapping_listeners()
   register_snapshot_listeners()
   listeners.register_fulltext_listeners()
+  register_result_cache_listeners()
+  register_permission_cache_listeners()
 
 
 def _enable_debug_toolbar():
@@ -292,6 +303,7 @@ init_extension_blueprints(app)
 init_gdrive_routes(app)
 init_permissions_provider()
 init_extra_listeners()
+init_publish_plans()
 notifications.register_notification_listeners()
 
 _enable_debug_toolbar()
@@ -3,6 +3,7 @@
 
 """Automapper generator."""
 
+import collections
 from datetime import datetime
 import logging
 
@@ -13,16 +14,20 @@ from ggrc.automapper import rules
 from ggrc import login
 from ggrc.models.audit import Audit
 from ggrc.models.automapping import Automapping
-from ggrc.models.relationship import Relationship, RelationshipsCache, Stub
+from ggrc.models.relationship import Relationship, Stub
 from ggrc.models.issue import Issue
 from ggrc.models import exceptions
 from ggrc.rbac import permissions
 from ggrc.models.cache import Cache
 from ggrc.utils import benchmark
+from ggrc.utils import list_chunks
 
 
 logger = logging.getLogger(__name__)
 
+# Key of relationships waiting for automapping in Session.info
+PENDING_KEY = "automapper_relationships"
+
 
 class AutomapperGenerator(object):
   """Generator for automappings.
@@ -30,81 +35,181 @@ class AutomapperGenerator(object):
   Consumes automapping rules and newly created Relationships, creates
   autogenerated Relationships registering them in Automappings table.
 
-  Note: we can rely on the order of src/dst pairs of queued and
-  inserted mappings since we only queue ordered pairs (see `order`).
+  All new relationships of a session seed one run. Rules are applied to all
+  edges found in the previous step at once: related objects of every rule are
+  fetched with one query per step, permissions are checked once per object and
+  existing relationships are found with one query per step.
+
+  Note: we can rely on the order of src/dst pairs of processed and
+  inserted mappings since we only use ordered pairs (see `order`).
   """
 
-  COUNT_LIMIT = 10000
+  COUNT_LIMIT = 100000
+  # Number of objects or pairs used in one query
+  CHUNK_SIZE = 1000
 
   def __init__(self):
     self.processed = set()
-    self.queue = set()
-    self.auto_mappings = set()
+    # Parent relationship: set of pairs implied by it
+    self.auto_mappings = collections.defaultdict(set)
     self.automapping_ids = set()
-    self.related_cache = RelationshipsCache()
-
-  def related(self, obj):
-    """Return obj's relationship stubs"""
-    if obj in self.related_cache.cache:
-      return self.related_cache.cache[obj]
-
-    # Pre-fetch neighborhood for enqueued objects since we're gonna need these
-    # results in a few steps. This drastically reduces number of queries.
-    stubs = {s for rel in self.queue for s in rel}
-    stubs.add(obj)
-    self.related_cache.populate_cache(stubs)
-
-    return self.related_cache.cache[obj]
+    # Related objects of automappings generated by this generator
+    self.new_related = collections.defaultdict(set)
+    self._update_permissions = {}
 
   @staticmethod
   def order(src, dst):
     return (src, dst) if src < dst else (dst, src)
 
-  def generate_automappings(self, relationship):
-    """Generate Automappings for a given relationship"""
-    # pylint: disable=protected-access
-    self.auto_mappings = set()
+  def generate_automappings(self, relationships):
+    """Generate Automappings for given relationships.
+
+    Every generated relationship is registered in the Automapping of the
+    relationship that implied it.
+    """
     with benchmark("Automapping generate_automappings"):
-      # initial relationship is special since it is already created and
-      # processing it would abort the loop so we manually enqueue the
-      # neighborhood
-      src = Stub.from_source(relationship)
-      dst = Stub.from_destination(relationship)
-      self._step(src, dst)
-      self._step(dst, src)
-      while self.queue:
-        if len(self.auto_mappings) > self.COUNT_LIMIT:
-          break
-        src, dst = entry = self.queue.pop()
-
-        if {src.type, dst.type} != {"Audit", "Issue"}:
-          # Auditor doesn't have edit (+map) permission on the Audit,
-          # but the Auditor should be allowed to Raise an Issue.
-          # Since Issue-Assessment-Audit is the only rule that
-          # triggers Issue to Audit mapping, we should skip the
-          # permission check for it
-          if not (permissions.is_allowed_update(src.type, src.id, None) and
-                  permissions.is_allowed_update(dst.type, dst.id, None)):
-            continue
-
-        created = self._ensure_relationship(src, dst)
-        self.processed.add(entry)
-        if not created:
-          # If the edge already exists it means that auto mappings for it have
-          # already been processed and it is safe to cut here.
-          continue
-        self._step(src, dst)
-        self._step(dst, src)
-
-      if len(self.auto_mappings) <= self.COUNT_LIMIT:
-        self._flush(relationship)
-      else:
-        logger.error("Automapping limit exceeded: limit=%s, count=%s",
-                     self.COUNT_LIMIT, len(self.auto_mappings))
-
-  def _flush(self, parent_relationship):
+      edges = {}
+      for relationship in relationships:
+        src = Stub.from_source(relationship)
+        dst = Stub.from_destination(relationship)
+        edges.setdefault((src, dst), relationship)
+        edges.setdefault((dst, src), relationship)
+      while edges:
+        created = self._ensure_relationships(self._get_candidates(edges))
+        edges = {}
+        for (src, dst), parent in created.iteritems():
+          self.auto_mappings[parent].add((src, dst))
+          if len(self.auto_mappings[parent]) <= self.COUNT_LIMIT:
+            edges.setdefault((src, dst), parent)
+            edges.setdefault((dst, src), parent)
+
+      for parent, auto_mappings in self.auto_mappings.iteritems():
+        if len(auto_mappings) <= self.COUNT_LIMIT:
+          self._flush(parent, auto_mappings)
+        else:
+          logger.error("Automapping limit exceeded: limit=%s, count=%s",
+                       self.COUNT_LIMIT, len(auto_mappings))
+      self.auto_mappings.clear()
+
+  def _get_related(self, types_by_stub):
+    """Get related objects of the given types for every stub.
+
+    Args:
+      types_by_stub: dict of stubs and sets of types of related objects.
+
+    Returns:
+      dict of stubs and sets of related stubs.
+    """
+    related = collections.defaultdict(set)
+    stubs = [stub for stub, types in types_by_stub.iteritems() if types]
+    if not stubs:
+      return related
+    all_types = set().union(*types_by_stub.itervalues())
+    rel = Relationship
+    cols = db.session.query(rel.source_type, rel.source_id,
+                            rel.destination_type, rel.destination_id)
+    for stubs_chunk in list_chunks(stubs, self.CHUNK_SIZE):
+      keys = [(stub.type, stub.id) for stub in stubs_chunk]
+      # Union is here to convince mysql to use two separate indices
+      query = cols.filter(
+          sa.tuple_(rel.source_type, rel.source_id).in_(keys),
+          rel.destination_type.in_(all_types),
+      ).union_all(cols.filter(
+          sa.tuple_(rel.destination_type, rel.destination_id).in_(keys),
+          rel.source_type.in_(all_types),
+      ))
+      for src_type, src_id, dst_type, dst_id in query:
+        src, dst = Stub(src_type, src_id), Stub(dst_type, dst_id)
+        if dst.type in types_by_stub.get(src, ()):
+          related[src].add(dst)
+        if src.type in types_by_stub.get(dst, ()):
+          related[dst].add(src)
+    for stub in stubs:
+      related[stub].update(obj for obj in self.new_related.get(stub, ())
+                           if obj.type in types_by_stub[stub])
+    return related
+
+  def _get_candidates(self, edges):
+    """Get unprocessed pairs implied by the rules for the directed edges.
+
+    Args:
+      edges: dict of directed edges and their parent relationships.
+
+    Returns:
+      dict of ordered pairs and their parent relationships.
+    """
+    types_by_stub = collections.defaultdict(set)
+    for src, dst in edges:
+      types_by_stub[dst] |= rules.rules.get((src.type, dst.type), frozenset())
+    related = self._get_related(types_by_stub)
+    candidates = {}
+    for (src, dst), parent in edges.iteritems():
+      mappings = rules.rules.get((src.type, dst.type))
+      if not mappings:
+        continue
+      for obj in related[dst]:
+        entry = self.order(obj, src)
+        if obj.type in mappings and obj != src and \
+           entry not in self.processed:
+          candidates.setdefault(entry, parent)
+    return candidates
+
+  def _can_update(self, stub):
+    if stub not in self._update_permissions:
+      self._update_permissions[stub] = permissions.is_allowed_update(
+          stub.type, stub.id, None)
+    return self._update_permissions[stub]
+
+  def _is_allowed(self, src, dst):
+    """Check if the user can map src and dst."""
+    if {src.type, dst.type} == {"Audit", "Issue"}:
+      # Auditor doesn't have edit (+map) permission on the Audit,
+      # but the Auditor should be allowed to Raise an Issue.
+      # Since Issue-Assessment-Audit is the only rule that
+      # triggers Issue to Audit mapping, we should skip the
+      # permission check for it
+      return True
+    return self._can_update(src) and self._can_update(dst)
+
+  def _get_existing(self, pairs):
+    """Get pairs that are already related."""
+    existing = {(src, dst) for src, dst in pairs
+                if dst in self.new_related.get(src, ())}
+    rel = Relationship
+    columns = (rel.source_type, rel.source_id,
+               rel.destination_type, rel.destination_id)
+    for pairs_chunk in list_chunks(list(pairs), self.CHUNK_SIZE):
+      keys = [(src.type, src.id, dst.type, dst.id) for src, dst in pairs_chunk]
+      keys.extend((dst_type, dst_id, src_type, src_id)
+                  for src_type, src_id, dst_type, dst_id in keys[:])
+      query = db.session.query(*columns).filter(sa.tuple_(*columns).in_(keys))
+      for src_type, src_id, dst_type, dst_id in query:
+        existing.add(self.order(Stub(src_type, src_id),
+                                Stub(dst_type, dst_id)))
+    return existing
+
+  def _ensure_relationships(self, candidates):
+    """Create relationships of candidates that don't exist already.
+
+    Returns:
+      dict of created pairs and their parent relationships. If a relationship
+      already exists, automappings for it have already been processed and it
+      is safe to cut there.
+    """
+    allowed = {entry for entry in candidates if self._is_allowed(*entry)}
+    self.processed |= allowed
+    existing = self._get_existing(allowed)
+    created = {entry: candidates[entry] for entry in allowed
+               if entry not in existing}
+    self._check_single_audit_restriction(created)
+    for src, dst in created:
+      self.new_related[src].add(dst)
+      self.new_related[dst].add(src)
+    return created
+
+  def _flush(self, parent_relationship, auto_mappings):
     """Manually INSERT generated automappings."""
-    if not self.auto_mappings:
+    if not auto_mappings:
       return
     with benchmark("Automapping flush"):
       current_user_id = login.get_current_user_id()
@@ -128,7 +233,7 @@ class AutomapperGenerator(object):
       inserter = Relationship.__table__.insert().prefix_with("IGNORE")
       original = self.order(Stub.from_source(parent_relationship),
                             Stub.from_destination(parent_relationship))
-      db.session.execute(inserter.values([{
+      rows = [{
           "id": None,
           "modified_by_id": current_user_id,
           "created_at": now,
@@ -142,8 +247,10 @@ class AutomapperGenerator(object):
           "parent_id": parent_relationship.id,
           "automapping_id": automapping_id,
           "is_external": False}
-          for src, dst in self.auto_mappings
-          if (src, dst) != original]))  # (src, dst) is sorted
+          for src, dst in auto_mappings
+          if (src, dst) != original]  # (src, dst) is sorted
+      for rows_chunk in list_chunks(rows, self.CHUNK_SIZE):
+        db.session.execute(inserter.values(rows_chunk))
 
       self._set_audit_id_for_issues(automapping_id)
 
@@ -194,65 +301,68 @@ class AutomapperGenerator(object):
         )
     )
 
-  def _step(self, src, dst):
-    """Step through the automapping rules tree."""
-    mappings = rules.rules[src.type, dst.type]
-    if mappings:
-      dst_related = (o for o in self.related(dst)
-                     if o.type in mappings and o != src)
-      for related in dst_related:
-        entry = self.order(related, src)
-        if entry not in self.processed:
-          self.queue.add(entry)
-
-  def _ensure_relationship(self, src, dst):
-    """Create the relationship if not exists already.
-
-    Returns:
-      True if a relationship was created;
-      False otherwise.
-    """
-    # even though self.cache is defaultdict, self.cache[key] adds key
-    # to self.cache if it is not present, and we should avoid it
-    if dst in self.related(src):
-      return False
-    if src in self.related(dst):
-      return False
-
-    self._check_single_audit_restriction(src, dst)
-
-    self.auto_mappings.add((src, dst))
-
-    if src in self.related_cache.cache:
-      self.related_cache.cache[src].add(dst)
-    if dst in self.related_cache.cache:
-      self.related_cache.cache[dst].add(src)
-
-    return True
-
-  def _check_single_audit_restriction(self, src, dst):
-    """Fail if dst (Issue) is already mapped to an Audit."""
-    # src, dst are ordered since they come from self.queue
-    if (src.type, dst.type) == ("Audit", "Issue"):
-      if "Audit" in (related.type for related in self.related(dst)):
+  def _check_single_audit_restriction(self, pairs):
+    """Fail if an Issue would be mapped to multiple Audits."""
+    # pairs are ordered, so Audit is always the source
+    new_audits = collections.defaultdict(set)
+    for src, dst in pairs:
+      if (src.type, dst.type) == ("Audit", "Issue"):
+        new_audits[dst].add(src)
+    if not new_audits:
+      return
+    related = self._get_related({issue: {"Audit"} for issue in new_audits})
+    for issue, audits in new_audits.iteritems():
+      if len(audits | related[issue]) > 1:
         raise exceptions.ValidationError(
             "This request will result in automapping that will map "
             "Issue#{issue.id} to multiple Audits."
-            .format(issue=dst)
+            .format(issue=issue)
         )
 
 
+def automap(session):
+  """Generate automappings for relationships flushed since the last run.
+
+  This is the pre-commit phase of automapping: it must run after the last
+  flush and before revisions of the modified objects are logged.
+  """
+  pending = session.info.get(PENDING_KEY, [])
+  count = len(pending)
+  relationships = [rel for rel in pending[:count] if rel in session]
+  if relationships:
+    with benchmark("automap"):
+      automapper = AutomapperGenerator()
+      try:
+        automapper.generate_automappings(relationships)
+        automapper.propagate_acl()
+      except Exception:
+        # Flushed relationships must not be committed without automappings
+        session.rollback()
+        raise
+  del pending[:count]
+
+
 def register_automapping_listeners():
   """Register event listeners for auto mapper."""
   # pylint: disable=unused-variable,unused-argument
 
-  def automap(session, _):
-    """Automap after_flush handler."""
-    with benchmark("automap"):
-      automapper = AutomapperGenerator()
-      for obj in session.new:
-        if isinstance(obj, Relationship):
-          automapper.generate_automappings(obj)
-      automapper.propagate_acl()
+  def collect_relationships(session, _):
+    """Store new relationships for the next automapping run."""
+    new_relationships = [obj for obj in session.new
+                         if isinstance(obj, Relationship)]
+    if new_relationships:
+      session.info.setdefault(PENDING_KEY, []).extend(new_relationships)
+
+  def clear_relationships(session, _):
+    """Drop relationships when the outermost transaction ends.
+
+    Relationships of rolled back transactions don't exist anymore and
+    relationships committed without automapping (plain_commit or commit with
+    disabled hooks) must not be automapped by the next transaction.
+    """
+    if session.transaction is None:
+      session.info.pop(PENDING_KEY, None)
 
-  sa.event.listen(sa.orm.session.Session, "after_flush", automap)
+  sa.event.listen(sa.orm.session.Session, "after_flush", collect_relationships)
+  sa.event.listen(sa.orm.session.Session, "after_transaction_end",
+                  clear_relationships)
@@ -58,6 +58,8 @@ def get_db():
       if not database.session.commit_hooks_enable_flag:
         return
       database.session.flush()
+      from ggrc.automapper import automap
+      automap(database.session)
       if hasattr(database.session, "reindex_set"):
         database.session.reindex_set.push_ft_records()
 
@@ -0,0 +1,307 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Compiled JSON publishers for models with stub only references.
+
+Builder.publish_attrs publishes one ORM object at a time and loads related
+objects while doing it. For models whose published attributes are plain
+columns and references to other objects, the same JSON can be built from a
+single column projection query and one query per collection of references,
+without loading ORM objects at all. References are published as
+LazyStubRepresentation and are rendered by publish_representation.
+
+A publisher is compiled once per model. Models with attributes that need the
+ORM object (custom publish, association proxies, properties computed in
+python, inclusions) are not compiled and are published with Builder.
+"""
+
+from collections import defaultdict
+from logging import getLogger
+
+import sqlalchemy as sa
+from sqlalchemy.ext.associationproxy import AssociationProxy
+from sqlalchemy.orm.attributes import InstrumentedAttribute
+from sqlalchemy.orm.interfaces import MANYTOONE
+from sqlalchemy.orm.interfaces import ONETOMANY
+from sqlalchemy.orm.properties import ColumnProperty
+from sqlalchemy.orm.properties import RelationshipProperty
+from sqlalchemy.sql.elements import BinaryExpression
+
+import ggrc.models
+from ggrc import db
+from ggrc.builder.json import LazyStubRepresentation
+from ggrc.builder.json import get_json_builder
+from ggrc.models.mixins.base import Identifiable
+from ggrc.utils import url_for
+from ggrc.utils import view_url_for
+
+
+logger = getLogger(__name__)
+
+_PUBLISHERS = {}
+
+
+class NotCompilable(Exception):
+  """Attribute can't be published without ORM object."""
+
+
+def _defining_class(model, attr_name):
+  for base in model.__mro__:
+    if attr_name in base.__dict__:
+      return base
+  return None
+
+
+def _is_custom_published(model, attr_name):
+  return any(attr_name in (getattr(base, "_custom_publish", None) or {})
+             for base in model.__mro__)
+
+
+def _table_column(class_attr):
+  """Get table column of a column attribute or None."""
+  if not (isinstance(class_attr, InstrumentedAttribute) and
+          isinstance(class_attr.property, ColumnProperty)):
+    return None
+  columns = class_attr.property.columns
+  if len(columns) != 1 or not isinstance(columns[0], sa.Column):
+    return None
+  return columns[0]
+
+
+def _stub_type(mapper):
+  """Get the type name used for stubs of objects of the mapper."""
+  model = mapper.class_
+  if ggrc.models.get_model(model.__name__) is not model:
+    raise NotCompilable("{} has no stub query".format(model.__name__))
+  if not {"context_id", "updated_at"} <= set(mapper.c.keys()):
+    raise NotCompilable("{} has no stub columns".format(model.__name__))
+  return model.__name__
+
+
+def _polymorphic_type_names(mapper):
+  """Get stub type names of polymorphic objects of the mapper.
+
+  Returns:
+    None if objects of the mapper are not polymorphic, otherwise dict of
+    polymorphic identities of the mapper and its subclasses and stub type
+    names of their objects.
+  """
+  if mapper.polymorphic_on is None:
+    return None
+  return {
+      sub_mapper.polymorphic_identity: _stub_type(sub_mapper)
+      for sub_mapper in mapper.self_and_descendants
+      if sub_mapper.polymorphic_identity is not None
+  }
+
+
+def _polymorphic_type_column(mapper, id_column):
+  """Get the polymorphic identity of objects referenced by id_column."""
+  type_column = mapper.polymorphic_on
+  target_id = mapper.primary_key[0]
+  if not isinstance(type_column, sa.Column) or \
+     type_column.table is not target_id.table:
+    raise NotCompilable("polymorphic identity of {}".format(
+        mapper.class_.__name__))
+  table = target_id.table.alias()
+  return sa.select([table.c[type_column.key]]).where(
+      table.c[target_id.key] == id_column
+  ).as_scalar()
+
+
+class _ColumnAttr(object):
+  """Attribute published as a column value."""
+
+  def __init__(self, column):
+    self.columns = [column]
+
+  @staticmethod
+  def publish(values):
+    return values[0]
+
+
+class _StubAttr(object):
+  """Reference published as a stub of an object with a known type."""
+
+  def __init__(self, target_type, id_column):
+    self.target_type = target_type
+    self.columns = [id_column]
+
+  def publish(self, values):
+    if values[0] is None:
+      return None
+    return LazyStubRepresentation(self.target_type, values[0])
+
+
+class _PolymorphicStubAttr(object):
+  """Reference to an object with type stored in a column.
+
+  The type is stored in <attr>_type column or in the polymorphic identity
+  column of the referenced object, type_names maps polymorphic identities to
+  stub types.
+  """
+
+  def __init__(self, type_column, id_column, type_names=None):
+    self.columns = [type_column, id_column]
+    self.type_names = type_names
+
+  def publish(self, values):
+    type_, id_ = values
+    if self.type_names is not None:
+      type_ = self.type_names.get(type_)
+    if not id_ or not type_:
+      return None
+    return LazyStubRepresentation(type_, id_)
+
+
+class _CollectionAttr(object):
+  """One to many relationship published as a list of stubs."""
+
+  def __init__(self, prop):
+    target = prop.mapper
+    self.type_names = _polymorphic_type_names(target)
+    if self.type_names is None:
+      self.target_type = _stub_type(target)
+    if prop.secondary is not None or len(prop.local_remote_pairs) != 1:
+      raise NotCompilable("complex join of {}".format(prop.key))
+    if not isinstance(prop.primaryjoin, BinaryExpression):
+      raise NotCompilable("filtered join of {}".format(prop.key))
+    _, self.remote_column = prop.local_remote_pairs[0]
+    self.target = target
+    self.target_id = target.primary_key[0]
+    self.order_by = prop.order_by or [self.target_id]
+    self.columns = []
+
+  def load(self, ids):
+    """Get stubs of related objects for every object id."""
+    if self.type_names is None:
+      type_column = sa.literal(self.target_type)
+    else:
+      type_column = self.target.polymorphic_on
+    rows = db.session.query(
+        self.remote_column, self.target_id, type_column
+    ).filter(
+        self.remote_column.in_(ids)
+    ).order_by(*self.order_by)
+    if self.type_names is not None:
+      rows = rows.filter(type_column.in_(self.type_names))
+    stubs = defaultdict(list)
+    for parent_id, target_id, type_ in rows:
+      if self.type_names is not None:
+        type_ = self.type_names[type_]
+      stubs[parent_id].append(LazyStubRepresentation(type_, target_id))
+    return stubs
+
+
+class CompiledPublisher(object):
+  """Publisher of JSON representations of a model from column rows."""
+
+  def __init__(self, model):
+    # pylint: disable=protected-access
+    self.model = model
+    self.attrs = {}
+    self.collections = {}
+    builder = get_json_builder(model)
+    if builder._include_links:
+      raise NotCompilable("{} has include links".format(model.__name__))
+    if len(list(model.__mapper__.self_and_descendants)) > 1:
+      raise NotCompilable("{} is polymorphic".format(model.__name__))
+    for attr_name in builder._publish_attrs:
+      attr = self._compile_attr(attr_name)
+      if isinstance(attr, _CollectionAttr):
+        self.collections[attr_name] = attr
+      else:
+        self.attrs[attr_name] = attr
+
+  def _compile_attr(self, attr_name):
+    """Get the compiled publisher of a single attribute."""
+    model = self.model
+    if _is_custom_published(model, attr_name):
+      raise NotCompilable("custom publish of {}".format(attr_name))
+    class_attr = getattr(model, attr_name)
+    column = _table_column(class_attr)
+    if column is not None:
+      return _ColumnAttr(column)
+    if attr_name == "type" and _defining_class(model, "type") is Identifiable:
+      return _ColumnAttr(sa.literal(model.__name__))
+    if isinstance(class_attr, AssociationProxy):
+      raise NotCompilable("association proxy {}".format(attr_name))
+    if (isinstance(class_attr, InstrumentedAttribute) and
+            isinstance(class_attr.property, RelationshipProperty)):
+      return self._compile_relationship(class_attr.property)
+    if class_attr.__class__.__name__ == "property":
+      type_column = _table_column(getattr(model, attr_name + "_type", None))
+      id_column = _table_column(getattr(model, attr_name + "_id", None))
+      if type_column is not None and id_column is not None:
+        return _PolymorphicStubAttr(type_column, id_column)
+    raise NotCompilable("python attribute {}".format(attr_name))
+
+  def _compile_relationship(self, prop):
+    """Get the compiled publisher of a relationship attribute."""
+    if prop.uselist and prop.direction == ONETOMANY:
+      return _CollectionAttr(prop)
+    if prop.uselist or prop.direction != MANYTOONE:
+      raise NotCompilable("relationship {}".format(prop.key))
+    id_column = _table_column(
+        getattr(self.model, list(prop.local_columns)[0].key))
+    if id_column is None:
+      raise NotCompilable("relationship key of {}".format(prop.key))
+    type_names = _polymorphic_type_names(prop.mapper)
+    if type_names is None:
+      return _StubAttr(_stub_type(prop.mapper), id_column)
+    return _PolymorphicStubAttr(
+        _polymorphic_type_column(prop.mapper, id_column), id_column,
+        type_names)
+
+  def publish(self, ids, attribute_whitelist=None):
+    """Get JSON representations of objects with the given ids.
+
+    Returns:
+      dict of ids and JSON representations with unrendered stubs, the
+      representations must be passed to publish_representation.
+    """
+    if not ids:
+      return {}
+    attrs = [(name, attr) for name, attr in self.attrs.iteritems()
+             if not attribute_whitelist or name in attribute_whitelist]
+    columns = [self.model.id]
+    for _, attr in attrs:
+      columns.extend(attr.columns)
+    rows = db.session.query(*columns).filter(self.model.id.in_(ids))
+    collections = {
+        name: collection.load(ids)
+        for name, collection in self.collections.iteritems()
+        if not attribute_whitelist or name in attribute_whitelist
+    }
+    type_name = self.model.__name__
+    resources = {}
+    for row in rows:
+      id_ = row[0]
+      json_obj = {}
+      self_url = url_for(type_name, id=id_)
+      if self_url:
+        json_obj["selfLink"] = self_url
+      view_url = view_url_for(type_name, id=id_)
+      if view_url:
+        json_obj["viewLink"] = view_url
+      index = 1
+      for name, attr in attrs:
+        values = row[index:index + len(attr.columns)]
+        index += len(attr.columns)
+        json_obj[name] = attr.publish(values)
+      for name, stubs in collections.iteritems():
+        json_obj[name] = list(stubs.get(id_, []))
+      resources[id_] = json_obj
+    return resources
+
+
+def get_compiled_publisher(model):
+  """Get compiled publisher for the model or None if it can't be compiled."""
+  if model not in _PUBLISHERS:
+    try:
+      _PUBLISHERS[model] = CompiledPublisher(model)
+    except NotCompilable as error:
+      logger.debug("Publisher of %s is not compiled: %s",
+                   model.__name__, error)
+      _PUBLISHERS[model] = None
+  return _PUBLISHERS[model]
@@ -80,6 +80,25 @@ def publish(obj, inclusions=(), inclusion_filter=None,
   return obj
 
 
+def compile_publish_plans(models):
+  """Compile publish plans and updaters of models ahead of the first use."""
+  # pylint: disable=protected-access
+  for model in models:
+    builder = get_json_builder(model)
+    for attr_name in builder._publish_attrs:
+      try:
+        builder.get_publish_accessor(attr_name)
+      except AttributeError:
+        logger.warning("Unable to compile publishing of %s.%s",
+                       model.__name__, attr_name)
+    for attr_name in set(builder._update_attrs + builder._create_attrs):
+      try:
+        UpdateAttrHandler.get_updater(model, attr_name)
+      except AttributeError:
+        logger.warning("Unable to compile update of %s.%s",
+                       model.__name__, attr_name)
+
+
 def update(obj, json_obj):
   """Translate the state represented by ``json_obj`` into update actions
   performed upon the model object ``obj``. After performing the update ``obj``
@@ -109,50 +128,101 @@ class UpdateAttrHandler(object):
   """
   # some attr handlers don't use every argument from the common interface
   # pylint: disable=unused-argument
+
+  # Compiled updaters for (model class, attr) pairs
+  _updaters = {}
+
   @classmethod
   def do_update_attr(cls, obj, json_obj, attr):
     """Perform the update to ``obj`` required to make the attribute attr
     equivalent in ``obj`` and ``json_obj``.
     """
-    class_attr = getattr(obj.__class__, attr)
-    update_raw = attr in AttributeInfo.gather_update_raw(obj.__class__)
+    cls.get_updater(obj.__class__, attr)(obj, json_obj)
+
+  @classmethod
+  def get_updater(cls, model, attr):
+    """Get the cached updater of the model attribute."""
+    key = (cls, model, attr)
+    if key not in cls._updaters:
+      cls._updaters[key] = cls.compile_updater(model, attr)
+    return cls._updaters[key]
+
+  @classmethod
+  def _get_value_handler(cls, class_attr):
+    """Resolve the handler translating the JSON value for ``class_attr``.
+
+    This resolves the dispatch done by InstrumentedAttribute and
+    ColumnProperty handlers once instead of on every update.
+    """
+    if class_attr.__class__.__name__ == "InstrumentedAttribute":
+      prop_handler_name = class_attr.property.__class__.__name__
+      if prop_handler_name == "ColumnProperty":
+        return getattr(
+            cls,
+            class_attr.property.expression.type.__class__.__name__,
+            cls.default_column_handler)
+      if hasattr(cls, prop_handler_name):
+        return getattr(cls, prop_handler_name)
+    return getattr(cls, class_attr.__class__.__name__)
+
+  @classmethod
+  def _compile_value_getter(cls, attr, class_attr, update_raw):
+    """Resolve the way the JSON value of the attribute is translated.
+
+    Returns:
+      tuple of the name of the updated attribute and a function of obj and
+      json_obj returning the new value.
+    """
     if update_raw:
       # The attribute has a special setter that can handle raw json fields
       # properly. This is used for special mappings such as custom attribute
       # values
-      attr_name = attr
-      value = json_obj.get(attr_name)
-    elif hasattr(attr, '__call__'):
+      return attr, lambda obj, json_obj: json_obj.get(attr)
+    if hasattr(attr, '__call__'):
       # The attribute has been decorated with a callable, grab the name and
       # invoke the callable to get the value
-      attr_name = attr.attr_name
-      value = attr(cls, obj, json_obj)
-    elif not hasattr(cls, class_attr.__class__.__name__):
+      return attr.attr_name, lambda obj, json_obj: attr(cls, obj, json_obj)
+    if not hasattr(cls, class_attr.__class__.__name__):
       # The attribute is a function on the obj like custom_attributes in
       # CustomAttributable mixin
-      attr_name = attr
-      value = class_attr(obj, json_obj)
-    else:
-      # Lookup the method to use to perform the update. Use reflection to
-      # key off of the type of the attribute and invoke the method of the
-      # same name.
-      attr_name = attr
-      method = getattr(cls, class_attr.__class__.__name__)
-      value = method(obj, json_obj, attr_name, class_attr)
-    if (isinstance(value, (set, list)) and
-        not update_raw and (
+      return attr, class_attr
+    # Lookup the method to use to perform the update. Use reflection to
+    # key off of the type of the attribute and invoke the method of the
+    # same name.
+    method = cls._get_value_handler(class_attr)
+    return attr, lambda obj, json_obj: method(obj, json_obj, attr, class_attr)
+
+  @classmethod
+  def compile_updater(cls, model, attr):
+    """Compile a function updating the attribute of objects of the model.
+
+    Returns:
+      function of obj and json_obj which performs the update of ``attr``.
+    """
+    class_attr = getattr(model, attr)
+    update_raw = attr in AttributeInfo.gather_update_raw(model)
+    attr_name, get_value = cls._compile_value_getter(
+        attr, class_attr, update_raw)
+
+    may_be_collection = not update_raw and (
         not hasattr(class_attr, 'property') or not
         hasattr(class_attr.property, 'columns') or not isinstance(
             class_attr.property.columns[0].type,
             JsonType)
-    )):
-      cls._do_update_collection(obj, value, attr_name)
-    else:
-      try:
-        setattr(obj, attr_name, value)
-      except AttributeError as error:
-        logger.error('Unable to set attribute %s: %s', attr_name, error)
-        raise
+    )
+
+    def update_attr(obj, json_obj):
+      """Update the attribute of obj with the value from json_obj."""
+      value = get_value(obj, json_obj)
+      if may_be_collection and isinstance(value, (set, list)):
+        cls._do_update_collection(obj, value, attr_name)
+      else:
+        try:
+          setattr(obj, attr_name, value)
+        except AttributeError as error:
+          logger.error('Unable to set attribute %s: %s', attr_name, error)
+          raise
+    return update_attr
 
   @classmethod
   def _do_update_collection(cls, obj, value, attr_name):
@@ -521,7 +591,18 @@ def publish_representation(resource):
 
 
 class Builder(AttributeInfo):
-  """JSON Dictionary builder for ggrc.models.* objects and their mixins."""
+  """JSON Dictionary builder for ggrc.models.* objects and their mixins.
+
+  Publishing of every attribute is resolved once per model class into an
+  accessor, the accessors of all published attributes form the publish plan
+  of the model.
+  """
+
+  def __init__(self, tgt_class):
+    super(Builder, self).__init__(tgt_class)
+    self.tgt_class = tgt_class
+    self._publish_accessors = {}
+    self._publish_plan = None
 
   def generate_link_object_for(
           self, obj, inclusions, include, inclusion_filter):
@@ -535,12 +616,13 @@ class Builder(AttributeInfo):
     result = {
         'id': obj.id, 'type': type(obj).__name__, 'href': url_for(obj),
         'context_id': obj.context_id}
+    builder = get_json_builder(obj)
     for path in inclusions:
       if not isinstance(path, basestring):
         attr_name, remaining_path = path[0], path[1:]
       else:
         attr_name, remaining_path = path, ()
-      result[attr_name] = self.publish_attr(
+      result[attr_name] = builder.publish_attr(
           obj, attr_name, remaining_path, include, inclusion_filter)
     return result
 
@@ -640,77 +722,137 @@ class Builder(AttributeInfo):
       else:
         return None
 
-  def _process_custom_publish(self, obj, attr_name):
-    """Processes _custom_publish logic and returns value if any or None."""
-    if attr_name in getattr(obj.__class__, '_custom_publish', {}):
+  def _get_custom_publish(self, attr_name):
+    """Get _custom_publish function of the attribute or None."""
+    custom_publish = getattr(self.tgt_class, '_custom_publish', {})
+    if attr_name in custom_publish:
       # The attribute has a custom publish logic.
-      return True, obj.__class__._custom_publish[attr_name](obj)
+      return custom_publish[attr_name]
 
-    for base in obj.__class__.__bases__:
+    for base in self.tgt_class.__bases__:
       # Inspect all mixins for custom publish logic.
       if attr_name in getattr(base, '_custom_publish', {}):
-        return True, base._custom_publish[attr_name](obj)
+        return base._custom_publish[attr_name]
+    return None
 
-    return False, None
+  def _compile_publish_accessor(self, attr_name):
+    """Resolve the way the attribute is published.
 
-  def publish_attr(
-          self, obj, attr_name, inclusions, include, inclusion_filter):
-    """Publish obj attr."""
-    value_exists, value = self._process_custom_publish(obj, attr_name)
-    if value_exists:
-      return value
+    Returns:
+      function of obj, inclusions, include and inclusion_filter returning the
+      published value of the attribute.
+    """
+    # pylint: disable=unused-argument
+    custom_publish = self._get_custom_publish(attr_name)
+    if custom_publish is not None:
+      return lambda obj, inclusions, include, inclusion_filter: (
+          custom_publish(obj))
 
-    class_attr = getattr(obj.__class__, attr_name)
-    result = None
+    class_attr = getattr(self.tgt_class, attr_name)
 
     if isinstance(class_attr, AssociationProxy):
-      if getattr(class_attr, 'publish_raw', False):
+      return self._compile_association_proxy_accessor(attr_name, class_attr)
+
+    if (isinstance(class_attr, InstrumentedAttribute) and
+            isinstance(class_attr.property, RelationshipProperty)):
+      def publish_relationship(obj, inclusions, include, inclusion_filter):
+        return self.publish_relationship(
+            obj, attr_name, class_attr, inclusions, include, inclusion_filter)
+      return publish_relationship
+
+    if class_attr.__class__.__name__ == 'property':
+      return self._compile_property_accessor(attr_name)
+
+    return lambda obj, inclusions, include, inclusion_filter: (
+        getattr(obj, attr_name))
+
+  def _compile_association_proxy_accessor(self, attr_name, class_attr):
+    """Get accessor publishing an association proxy."""
+    # pylint: disable=unused-argument
+    if getattr(class_attr, 'publish_raw', False):
+      def publish_raw(obj, inclusions, include, inclusion_filter):
         published_attr = getattr(obj, attr_name)
         if hasattr(published_attr, "copy"):
-          result = published_attr.copy()
-        else:
-          result = published_attr
-      else:
-        result = self.publish_association_proxy(
-            obj, attr_name, class_attr, inclusions, include, inclusion_filter)
-    elif (isinstance(class_attr, InstrumentedAttribute) and
-          isinstance(class_attr.property, RelationshipProperty)):
-      result = self.publish_relationship(
+          return published_attr.copy()
+        return published_attr
+      return publish_raw
+
+    def publish_association_proxy(obj, inclusions, include,
+                                  inclusion_filter):
+      return self.publish_association_proxy(
           obj, attr_name, class_attr, inclusions, include, inclusion_filter)
-    elif class_attr.__class__.__name__ == 'property':
+    return publish_association_proxy
+
+  def _compile_property_accessor(self, attr_name):
+    """Get accessor publishing a property backed by _id and _type columns."""
+    id_attr = '{0}_id'.format(attr_name)
+    type_attr = '{0}_type'.format(attr_name)
+
+    def publish_property(obj, inclusions, include, inclusion_filter):
       if not inclusions or include:
-        if getattr(obj, '{0}_id'.format(attr_name)):
-          result = LazyStubRepresentation(
-              getattr(obj, '{0}_type'.format(attr_name)),
-              getattr(obj, '{0}_id'.format(attr_name)))
-      else:
-        result = self.publish_link(
-            obj, attr_name, inclusions, include, inclusion_filter)
-    else:
-      result = getattr(obj, attr_name)
+        if getattr(obj, id_attr):
+          return LazyStubRepresentation(
+              getattr(obj, type_attr), getattr(obj, id_attr))
+        return None
+      return self.publish_link(
+          obj, attr_name, inclusions, include, inclusion_filter)
+    return publish_property
+
+  def get_publish_accessor(self, attr_name):
+    """Get the cached accessor publishing the attribute."""
+    accessor = self._publish_accessors.get(attr_name)
+    if accessor is None:
+      accessor = self._compile_publish_accessor(attr_name)
+      self._publish_accessors[attr_name] = accessor
+    return accessor
+
+  def get_publish_plan(self):
+    """Get the list of (attr_name, accessor) of all published attributes."""
+    if self._publish_plan is None:
+      self._publish_plan = [
+          (attr_name, self.get_publish_accessor(attr_name))
+          for attr_name in self._publish_attrs
+      ]
+    return self._publish_plan
 
-    return result
+  def publish_attr(
+          self, obj, attr_name, inclusions, include, inclusion_filter):
+    """Publish obj attr."""
+    return self.get_publish_accessor(attr_name)(
+        obj, inclusions, include, inclusion_filter)
+
+  @staticmethod
+  def _get_inclusions_map(inclusions):
+    """Get the first inclusion path of every attribute."""
+    inclusions_map = {}
+    for inclusion in inclusions or ():
+      inclusions_map.setdefault(inclusion[0], inclusion)
+    return inclusions_map
 
   def _publish_attrs_for(
           self, obj, attrs, json_obj, inclusions=None, inclusion_filter=None,
           attribute_whitelist=None):
     """Publis attrs for obj."""
-    if inclusions is None:
-      inclusions = []
+    plan = []
     for attr in attrs:
       if hasattr(attr, '__call__'):
         attr_name = attr.attr_name
       else:
         attr_name = attr
-      local_inclusion = ()
-      for inclusion in inclusions:
-        if inclusion[0] == attr_name:
-          local_inclusion = inclusion
-          break
+      plan.append((attr_name, self.get_publish_accessor(attr_name)))
+    self._publish_plan_for(obj, plan, json_obj, inclusions, inclusion_filter,
+                           attribute_whitelist)
+
+  def _publish_plan_for(self, obj, plan, json_obj, inclusions,
+                        inclusion_filter, attribute_whitelist):
+    """Publish attributes of obj with the accessors of the plan."""
+    inclusions_map = self._get_inclusions_map(inclusions)
+    for attr_name, accessor in plan:
       if attribute_whitelist and attr_name not in attribute_whitelist:
         continue
-      json_obj[attr_name] = self.publish_attr(
-          obj, attr_name, local_inclusion[1:], len(local_inclusion) > 0,
+      local_inclusion = inclusions_map.get(attr_name, ())
+      json_obj[attr_name] = accessor(
+          obj, local_inclusion[1:], len(local_inclusion) > 0,
           inclusion_filter)
 
   def publish_attrs(self, obj, json_obj, extra_inclusions, inclusion_filter,
@@ -732,8 +874,8 @@ class Builder(AttributeInfo):
     """
     inclusions = tuple((attr,) for attr in self._include_links)
     inclusions = tuple(set(inclusions).union(set(extra_inclusions)))
-    return self._publish_attrs_for(
-        obj, self._publish_attrs, json_obj, inclusions, inclusion_filter,
+    return self._publish_plan_for(
+        obj, self.get_publish_plan(), json_obj, inclusions, inclusion_filter,
         attribute_whitelist)
 
   @classmethod
@@ -5,4 +5,5 @@
 # members.
 from ggrc.cache.localcache import LocalCache  # Noqa
 from ggrc.cache.memcache import MemCache  # Noqa
+from ggrc.cache.rediscache import RedisCache  # Noqa
 from ggrc.cache.cachemanager import CacheManager  # Noqa
@@ -62,7 +62,8 @@ class CacheManager:
       filter: dictionary containing ids and optional attrs
 
     Returns:
-      JSON string representation
+      Mapping of ids found in cache to their JSON representation, ids that
+      are not cached are omitted
     """
     if not self.is_caching_supported(category, resource, filter,
                                      'get_collection'):
@@ -45,9 +45,9 @@ class LocalCache(Cache):
       filter: dictionary containing ids and optional attrs
 
     Returns:
-      All or None policy is applied by default
       None on any errors
-      Mapping of DTO formatted string, e.g. JSON string representation
+      Mapping of found ids to DTO formatted string, e.g. JSON string
+      representation
     """
     if not self.is_caching_supported(category, resource):
       return None
@@ -131,8 +131,7 @@ class LocalCache(Cache):
 
   def get_data(self, keys, cacheitems, attrs):
     """ Get data from cache for the given set of keys and attributes in cache
-        TODO(dan): all or none default policy is implemeted here, it should be
-        in cachemanager
+        Keys missing in cache are omitted from the result.
     Args:
       keys: set of keys to search from local cache
       cacheitems: cache entries
@@ -146,9 +145,7 @@ class LocalCache(Cache):
 
     for key in keys:
       if key not in cacheitems:
-        #  ALL or None Policy: if a key is not in cache, stop processing and
-        #  continue as before going to Data-ORM layer
-        return None
+        continue
       attrvalues = cacheitems.get(key)
       targetattrs = None
       if attrs is None and attrvalues is not None:
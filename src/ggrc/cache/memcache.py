@@ -3,7 +3,6 @@
 """Memcache implements the remote AppEngine Memcache mechanism."""
 
 from collections import OrderedDict
-from copy import deepcopy
 
 from google.appengine.api import memcache
 
@@ -30,53 +29,49 @@ class MemCache(cache.Cache):
   def get(self, category, resource, filter):
     """ get items from mem cache for specified filter
 
+    All requested ids are fetched with a single get_multi call.
+
     Args:
       category: collection or stub
       resource: regulation, controls, etc.
       filter: dictionary containing ids and optional attrs
 
     Returns:
-      All or None policy is applied by default
       None on any errors
-      otherwise returns JSON string representation
+      otherwise returns mapping of found ids to their cached JSON
+      representation; ids missing in cache are omitted from the result
     """
 
     if not self.is_caching_supported(category, resource):
       return None
-    # TODO(dan): use memcache.Client.get_multi() instead of gets()
-    #
-    data = OrderedDict()
     cache_key = self.get_key(category, resource)
     if cache_key is None:
       return None
     ids, attrs = self.parse_filter(filter)
-    if ids is None and attrs is None:
+    if ids is None:
       return None
-    else:
-      if ids is None:
-        return None
+    found = self.memcache_client.get_multi(
+        [str(id_) for id_ in ids], key_prefix=cache_key + ":")
+    data = OrderedDict()
     for id_ in ids:
-      attrvalues = self.memcache_client.gets(cache_key + ":" + str(id_))
-      if attrvalues is not None:
-        if attrs is None:
-          data[id_] = attrvalues
-        else:
-          attr_dict = OrderedDict()
-          for attr in attrs:
-            if attr in attrvalues:
-              attr_dict[attr] = deepcopy(attrvalues.get(attr))
-          data[id_] = attr_dict
+      attrvalues = found.get(str(id_))
+      if attrvalues is None:
+        continue
+      if attrs is None:
+        data[id_] = attrvalues
       else:
-        # All or None policy is enforced, if one of the objects
-        # is not available in cache, then we return empty
-        # TODO(dan): cannot distinguish network failures vs
-        # id not found in memcache, both scenarios return empty list
-        return None
+        data[id_] = OrderedDict(
+            (attr, attrvalues[attr]) for attr in attrs if attr in attrvalues
+        )
     return data
 
   def add(self, category, resource, data, expiration_time=0):
     """ add data to mem cache
 
+    New entries are added with a single add_multi call, entries that are
+    already present in cache (import scenarios) are overwritten with a
+    single set_multi call.
+
     Args:
       category: collection or stub
       resource: regulation, controls, etc.
@@ -84,45 +79,36 @@ class MemCache(cache.Cache):
 
     Returns:
       None on any errors
-      Mapping of DTO formatted string, e.g. JSON string representation
+      Mapping of stored ids to DTO formatted string, e.g. JSON string
+      representation
     """
     if not self.is_caching_supported(category, resource):
       return None
-    entries = {}
     cache_key = self.get_key(category, resource)
     if cache_key is None:
       return None
-    # TODO(dan): use memcache.Client.add_multi() instead of add()
-    for key in data.keys():
-      cache_key = cache_key + ":" + str(key)
-      cache_data = self.memcache_client.gets(cache_key)
-      if cache_data is None:
-        if self.memcache_client.add(cache_key,
-                                    data.get(key),
-                                    expiration_time) is False:
-          # We stop processing any further
-          # TODO(ggrcdev): Should we throw exceptions
-          # and/or log critical events
-          return None
-        else:
-          entries[key] = data
-      else:
-        # This could occur on import scenarios
-        #
-        if self.memcache_client.cas(cache_key,
-                                    data.get(key),
-                                    expiration_time) is False:
-          # We stop processing any further
-          # TODO(ggrcdev): Should we throw exceptions
-          # and/or log critical events
-          return None
-        else:
-          entries[key] = data
-    return entries
+    key_prefix = cache_key + ":"
+    mapping = {str(key): value for key, value in data.items()}
+    not_added = self.memcache_client.add_multi(
+        mapping, expiration_time, key_prefix=key_prefix)
+    if not_added:
+      not_set = self.memcache_client.set_multi(
+          {key: mapping[key] for key in not_added},
+          expiration_time,
+          key_prefix=key_prefix,
+      )
+    else:
+      not_set = []
+    failed = set(not_set)
+    return {key: value for key, value in data.items()
+            if str(key) not in failed}
 
   def update(self, category, resource, data, expiration_time):
     """ Update items from mem cache for specified data
 
+    Only the entries present in cache are updated, with a single get_multi
+    and a single cas_multi call.
+
     Args:
       category: collection or stub
       resource: regulation, controls, etc.
@@ -130,28 +116,28 @@ class MemCache(cache.Cache):
 
     Returns:
       None on any errors
-      Mapping of DTO formatted string, e.g. JSON string representation
+      Mapping of updated ids to DTO formatted string, e.g. JSON string
+      representation
     """
     if not self.is_caching_supported(category, resource):
       return None
-    entries = {}
     cache_key = self.get_key(category, resource)
     if cache_key is None:
       return None
-    # TODO(ggrcdev): use memcache.Client.cas_multi(),
-    # get_multi() instead of cas(), gets()
-    #
-    for key in data.keys():
-      id_ = cache_key + ":" + str(key)
-      if self.memcache_client.cas(id_,
-                                  data.get(key),
-                                  expiration_time) is False:
-        # RPC Error or value is not id is not found in cache.
-        # Cannot proceed further with update (All or None) policy
-        return None
-      else:
-        entries[key] = data
-    return entries
+    key_prefix = cache_key + ":"
+    mapping = {str(key): value for key, value in data.items()}
+    present = self.memcache_client.get_multi(
+        mapping.keys(), key_prefix=key_prefix, for_cas=True)
+    if not present:
+      return {}
+    not_updated = self.memcache_client.cas_multi(
+        {key: mapping[key] for key in present},
+        expiration_time,
+        key_prefix=key_prefix,
+    )
+    failed = set(not_updated or [])
+    return {key: value for key, value in data.items()
+            if str(key) in present and str(key) not in failed}
 
   def remove(self, category, resource, data, lockadd_seconds=0):
     """ delete items from mem cache for specified data
@@ -167,34 +153,17 @@ class MemCache(cache.Cache):
     """
     if not self.is_caching_supported(category, resource):
       return None
-    entries = {}
     cache_key = self.get_key(category, resource)
     if cache_key is None:
       return None
-    # TODO(dan): use memcache.Client.delete_multi(),
-    # get_multi() instead of delete(), gets()
-    #
-    for key in data.keys():
-      id_ = cache_key + ":" + str(key)
-      retvalue = self.memcache_client.delete(id_, lockadd_seconds)
-      # Log the event of delete failures
-      if retvalue == 0:
-        # retvalue of 0 indicates Network failure,
-        # Cannot proceed further with delete (All or None) policy
-        return None
-      elif retvalue == 2:
-        # retvalue of 2 indicates Success
-        entries[key] = data
-      elif retvalue == 1:
-        # retvalue of 1 indicates id_ is not present in memcache
-        # (could be expired), proceed with next entry
-        continue
-      else:
-        # Any other return value,
-        # Cannot proceed further with delete (All or None) policy
-        #
-        return None
-    return entries
+    if not self.memcache_client.delete_multi(
+        [str(key) for key in data.keys()],
+        lockadd_seconds,
+        key_prefix=cache_key + ":",
+    ):
+      # Network failure, the state of entries is unknown
+      return None
+    return data
 
   def add_multi(self, data, expiration_time=0):
     """ Add multiple entries to memcache
@@ -206,12 +175,14 @@ class MemCache(cache.Cache):
       data: dictionary containing ids and dictionary of attrs
 
     Returns:
-      memcache client API add_multi
+      list of keys that were not stored, as memcache client API add_multi
     """
-    # TODO(dan): import scenarios, add will return non-empty list,
-    # we should invoke update_multi for those items
-    #
-    return self.memcache_client.add_multi(data, expiration_time)
+    not_added = self.memcache_client.add_multi(data, expiration_time)
+    if not not_added:
+      return not_added
+    # Entries already present in cache (import scenarios) are overwritten
+    return self.memcache_client.set_multi(
+        {key: data[key] for key in not_added}, expiration_time)
 
   def get_multi(self, data):
     """ Get multiple entries from memcache
@@ -223,7 +194,8 @@ class MemCache(cache.Cache):
       data: dictionary containing ids
 
     Returns:
-      memcache client API get_multi
+      memcache client API get_multi: mapping of found keys to their values,
+      keys missing in cache are omitted
     """
     return self.memcache_client.get_multi(data, '', None, True)
 
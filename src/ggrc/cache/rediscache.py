@@ -0,0 +1,416 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""RedisCache implements the shared cache mechanism on a Redis server.
+
+It allows deployments outside of AppEngine to share collection and permission
+caches between processes. The client talks the Redis protocol (RESP) directly
+and exposes the subset of AppEngine memcache client API used by GGRC, so it
+can be used everywhere the memcache client is used. All multi-key operations
+are sent as a single pipeline.
+
+FakeRedisServer is an in-process replacement of the server for tests.
+"""
+
+import cPickle
+import logging
+import socket
+import threading
+import time
+import urlparse
+
+from ggrc import settings
+from ggrc.cache import cache
+from ggrc.cache.memcache import MemCache
+
+
+logger = logging.getLogger(__name__)
+
+PICKLE_MARK = "p:"
+
+# Return values of delete compatible with AppEngine memcache client
+DELETE_NETWORK_FAILURE = 0
+DELETE_ITEM_MISSING = 1
+DELETE_SUCCESSFUL = 2
+
+
+class RedisError(Exception):
+  """Error reply or connection failure of Redis server."""
+
+
+def _to_str(value):
+  """Convert command argument to a byte string."""
+  if isinstance(value, unicode):
+    return value.encode("utf-8")
+  return str(value)
+
+
+def encode_command(args):
+  """Encode command as RESP array of bulk strings."""
+  parts = ["*{}\r\n".format(len(args))]
+  for arg in args:
+    arg = _to_str(arg)
+    parts.append("${}\r\n{}\r\n".format(len(arg), arg))
+  return "".join(parts)
+
+
+class RedisConnection(object):
+  """Connection to Redis server executing pipelined commands."""
+
+  def __init__(self, host="localhost", port=6379, db=0, timeout=5):
+    self.host = host
+    self.port = port
+    self.db = db
+    self.timeout = timeout
+    self._socket = None
+    self._file = None
+
+  @classmethod
+  def from_url(cls, url):
+    """Create connection from redis://host:port/db url."""
+    parsed = urlparse.urlparse(url)
+    db = parsed.path.strip("/")
+    return cls(
+        host=parsed.hostname or "localhost",
+        port=parsed.port or 6379,
+        db=int(db) if db else 0,
+    )
+
+  def _connect(self):
+    """Open socket and select the database."""
+    self._socket = socket.create_connection((self.host, self.port),
+                                            self.timeout)
+    self._file = self._socket.makefile("rb")
+    if self.db:
+      self._socket.sendall(encode_command(["SELECT", self.db]))
+      reply = self._read_reply()
+      if isinstance(reply, RedisError):
+        raise reply
+
+  def close(self):
+    """Close connection to the server."""
+    if self._socket is not None:
+      self._file.close()
+      self._socket.close()
+    self._socket = None
+    self._file = None
+
+  def _read_reply(self):
+    """Read a single RESP reply."""
+    line = self._file.readline()
+    if not line.endswith("\r\n"):
+      raise RedisError("Connection closed by server")
+    prefix, rest = line[0], line[1:-2]
+    if prefix == "+":
+      return rest
+    if prefix == "-":
+      return RedisError(rest)
+    if prefix == ":":
+      return int(rest)
+    if prefix == "$":
+      length = int(rest)
+      if length == -1:
+        return None
+      return self._file.read(length + 2)[:-2]
+    if prefix == "*":
+      length = int(rest)
+      if length == -1:
+        return None
+      return [self._read_reply() for _ in range(length)]
+    raise RedisError("Invalid reply: {!r}".format(line))
+
+  def execute(self, commands):
+    """Send all commands at once and read their replies.
+
+    Args:
+      commands: list of commands, each command is a list of arguments.
+
+    Returns:
+      list of replies, error replies are returned as RedisError instances.
+    """
+    try:
+      if self._socket is None:
+        self._connect()
+      self._socket.sendall("".join(encode_command(cmd) for cmd in commands))
+      return [self._read_reply() for _ in commands]
+    except (socket.error, RedisError):
+      self.close()
+      raise RedisError("Connection to {}:{} failed".format(self.host,
+                                                           self.port))
+
+
+class FakeRedisServer(object):
+  """In-process server implementing commands used by RedisClient."""
+
+  def __init__(self):
+    self.data = {}
+    self._lock = threading.Lock()
+
+  def connection(self):
+    return FakeRedisConnection(self)
+
+  def _get(self, key):
+    """Get value of a key dropping it if it has expired."""
+    value, expires_at = self.data.get(key, (None, None))
+    if expires_at is not None and expires_at <= time.time():
+      del self.data[key]
+      return None
+    return value
+
+  def _set(self, key, value, expiry=None):
+    expires_at = time.time() + expiry if expiry else None
+    self.data[key] = (value, expires_at)
+
+  def cmd_get(self, key):
+    value = self._get(key)
+    return value if value is None else str(value)
+
+  def cmd_mget(self, *keys):
+    return [self.cmd_get(key) for key in keys]
+
+  def cmd_set(self, key, value, *options):
+    """SET key value [EX seconds] [NX|XX]"""
+    options = [_to_str(option).upper() for option in options]
+    exists = self._get(key) is not None
+    if "NX" in options and exists or "XX" in options and not exists:
+      return None
+    expiry = int(options[options.index("EX") + 1]) if "EX" in options else 0
+    self._set(key, value, expiry)
+    return "OK"
+
+  def cmd_del(self, *keys):
+    deleted = 0
+    for key in keys:
+      if self._get(key) is not None:
+        del self.data[key]
+        deleted += 1
+    return deleted
+
+  def cmd_incrby(self, key, amount):
+    """INCRBY key amount"""
+    value = self._get(key)
+    try:
+      value = int(value or 0) + int(amount)
+    except ValueError:
+      return RedisError("ERR value is not an integer or out of range")
+    expires_at = self.data.get(key, (None, None))[1]
+    self.data[key] = (str(value), expires_at)
+    return value
+
+  def cmd_flushdb(self):
+    self.data.clear()
+    return "OK"
+
+  def execute(self, command):
+    """Execute single command."""
+    name = _to_str(command[0]).lower()
+    args = [_to_str(arg) for arg in command[1:]]
+    handler = getattr(self, "cmd_" + name, None)
+    if handler is None:
+      return RedisError("ERR unknown command '{}'".format(name))
+    with self._lock:
+      return handler(*args)
+
+
+class FakeRedisConnection(object):
+  """Connection to FakeRedisServer with the same API as RedisConnection."""
+
+  def __init__(self, server):
+    self.server = server
+
+  def execute(self, commands):
+    return [self.server.execute(command) for command in commands]
+
+  def close(self):
+    pass
+
+
+def _dumps(value):
+  if isinstance(value, (int, long)) and not isinstance(value, bool):
+    # Integers are stored as is to allow atomic INCRBY on them
+    return str(value)
+  return PICKLE_MARK + cPickle.dumps(value, cPickle.HIGHEST_PROTOCOL)
+
+
+def _loads(raw):
+  if raw is None:
+    return None
+  if raw.startswith(PICKLE_MARK):
+    return cPickle.loads(raw[len(PICKLE_MARK):])
+  return int(raw)
+
+
+class RedisClient(object):
+  """Memcache compatible client for Redis protocol servers.
+
+  Network failures are logged and reported with the same return values as
+  AppEngine memcache client uses, so callers can treat the cache as
+  optional.
+  """
+
+  def __init__(self, connection):
+    self.connection = connection
+
+  def _execute(self, commands):
+    """Execute pipeline and return replies or None on failure."""
+    if not commands:
+      return []
+    try:
+      replies = self.connection.execute(commands)
+    except RedisError as error:
+      logger.warning("CACHE: Redis request failed: %s", error)
+      return None
+    for reply in replies:
+      if isinstance(reply, RedisError):
+        logger.warning("CACHE: Redis error reply: %s", reply)
+    return replies
+
+  @staticmethod
+  def _set_command(key, value, time_=0, mode=None):
+    command = ["SET", key, _dumps(value)]
+    if time_:
+      command.extend(["EX", int(time_)])
+    if mode:
+      command.append(mode)
+    return command
+
+  def get(self, key):
+    replies = self._execute([["GET", key]])
+    return _loads(replies[0]) if replies else None
+
+  gets = get
+
+  def get_multi(self, keys, key_prefix="", namespace=None, for_cas=False):
+    """Get all keys with a single MGET.
+
+    Returns:
+      dict of found keys (without prefix) and their values.
+    """
+    # pylint: disable=unused-argument
+    keys = list(keys)
+    if not keys:
+      return {}
+    replies = self._execute([["MGET"] + [key_prefix + key for key in keys]])
+    if not replies or isinstance(replies[0], RedisError):
+      return {}
+    return {
+        key: _loads(raw) for key, raw in zip(keys, replies[0])
+        if raw is not None
+    }
+
+  def _set_multi(self, mapping, time_, key_prefix, mode):
+    """Set all values in one pipeline, return keys that were not stored."""
+    keys = list(mapping)
+    commands = [
+        self._set_command(key_prefix + key, mapping[key], time_, mode)
+        for key in keys
+    ]
+    replies = self._execute(commands)
+    if replies is None:
+      return keys
+    return [key for key, reply in zip(keys, replies) if reply != "OK"]
+
+  def set(self, key, value, time=0):
+    # pylint: disable=redefined-outer-name
+    return not self._set_multi({key: value}, time, "", None)
+
+  def add(self, key, value, time=0):
+    # pylint: disable=redefined-outer-name
+    return not self._set_multi({key: value}, time, "", "NX")
+
+  def cas(self, key, value, time=0):
+    """Replace value only if the key exists."""
+    # pylint: disable=redefined-outer-name
+    return not self._set_multi({key: value}, time, "", "XX")
+
+  def set_multi(self, mapping, time=0, key_prefix=""):
+    # pylint: disable=redefined-outer-name
+    return self._set_multi(mapping, time, key_prefix, None)
+
+  def add_multi(self, mapping, time=0, key_prefix=""):
+    # pylint: disable=redefined-outer-name
+    return self._set_multi(mapping, time, key_prefix, "NX")
+
+  def cas_multi(self, mapping, time=0, key_prefix=""):
+    """Replace values of existing keys.
+
+    Redis has no compare-and-set tokens, so the value is replaced if the key
+    still exists, which matches the way GGRC uses cas_multi.
+    """
+    # pylint: disable=redefined-outer-name
+    return self._set_multi(mapping, time, key_prefix, "XX")
+
+  def delete(self, key, seconds=0):
+    # pylint: disable=unused-argument
+    replies = self._execute([["DEL", key]])
+    if replies is None or isinstance(replies[0], RedisError):
+      return DELETE_NETWORK_FAILURE
+    return DELETE_SUCCESSFUL if replies[0] else DELETE_ITEM_MISSING
+
+  def delete_multi(self, keys, seconds=0, key_prefix=""):
+    # pylint: disable=unused-argument
+    keys = [key_prefix + key for key in keys]
+    if not keys:
+      return True
+    replies = self._execute([["DEL"] + keys])
+    return replies is not None and not isinstance(replies[0], RedisError)
+
+  def offset_multi(self, mapping, key_prefix="", initial_value=0):
+    """Atomically increment counters, missing ones start at initial_value."""
+    keys = list(mapping)
+    commands = []
+    if initial_value:
+      commands.extend(
+          ["SET", key_prefix + key, initial_value, "NX"] for key in keys
+      )
+    commands.extend(
+        ["INCRBY", key_prefix + key, mapping[key]] for key in keys
+    )
+    replies = self._execute(commands)
+    if replies is None:
+      return {key: None for key in keys}
+    replies = replies[len(commands) - len(keys):]
+    return {
+        key: None if isinstance(reply, RedisError) else reply
+        for key, reply in zip(keys, replies)
+    }
+
+  def flush_all(self):
+    replies = self._execute([["FLUSHDB"]])
+    return replies is not None and replies[0] == "OK"
+
+
+_local = threading.local()
+
+
+def get_redis_client():
+  """Get Redis client for the server configured in settings.
+
+  Connections are reused by all requests handled by the same thread.
+  """
+  url = getattr(settings, "REDIS_URL", "redis://localhost:6379/0")
+  connections = getattr(_local, "connections", None)
+  if connections is None:
+    connections = _local.connections = {}
+  if url not in connections:
+    connections[url] = RedisConnection.from_url(url)
+  return RedisClient(connections[url])
+
+
+class RedisCache(MemCache):
+  """Collection cache stored on a Redis server.
+
+  Collection operations are inherited from MemCache as the client exposes
+  the same API.
+  """
+
+  # pylint: disable=super-init-not-called
+  def __init__(self, client=None):
+    cache.Cache.__init__(self)
+    self.name = 'redis'
+    self.client = None
+    self.memcache_client = client or get_redis_client()
+    self.supported_resources.update({
+        cache_entry.model_plural: cache_entry.class_name
+        for cache_entry in cache.all_cache_entries()
+        if cache_entry.cache_type == 'memcache'})
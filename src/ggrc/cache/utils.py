@@ -3,9 +3,14 @@
 
 """Common operations on cache managers."""
 
+import itertools
 import logging
+import time
 
 import flask
+import sqlalchemy as sa
+from sqlalchemy import event
+from sqlalchemy.orm.session import Session
 
 from ggrc import cache
 import ggrc.models
@@ -15,10 +20,17 @@ from ggrc import settings
 logger = logging.getLogger(__name__)
 
 
+def get_cache_backend():
+  """Returns shared cache backend configured in settings."""
+  if getattr(settings, "CACHE_BACKEND", "memcache") == "redis":
+    return cache.RedisCache()
+  return cache.MemCache()
+
+
 def get_cache_manager():
   """Returns an instance of CacheManager."""
   cache_manager = cache.CacheManager()
-  cache_manager.initialize(cache.MemCache())
+  cache_manager.initialize(get_cache_backend())
   return cache_manager
 
 
@@ -189,7 +201,6 @@ def update_memcache_after_commit(context):
     if delete_result is not True:
       logger.error("CACHE: Failed to remove status entries from cache")
 
-  clear_permission_cache()
   cache_manager.clear_cache()
 
 
@@ -208,26 +219,131 @@ def build_cache_status(data, key, expiry_timeout, status):
   data[key] = {'expiry': expiry_timeout, 'status': status}
 
 
+PERMISSIONS_GENERATION_KEY = 'permissions:generation'
+
+# Models whose changes affect permissions of the person they refer to
+PERSON_PERMISSION_MODELS = frozenset(["AccessControlList", "UserRole"])
+# Models whose changes can affect permissions of all users
+GLOBAL_PERMISSION_MODELS = frozenset(["AccessControlRole", "Role"])
+
+
+def _get_generation_keys(user_id):
+  """Returns keys of global and personal permission generation counters."""
+  return [
+      PERMISSIONS_GENERATION_KEY,
+      '{}:{}'.format(PERMISSIONS_GENERATION_KEY, user_id),
+  ]
+
+
+def _initial_generation():
+  """Returns starting value for generation counters.
+
+  A counter evicted from cache restarts from the current time, so it never
+  repeats a generation that was already used in a key of cached permissions.
+  """
+  return int(time.time() * 1000)
+
+
+def get_permission_cache_key(client, user_id):
+  """Returns key of cached permissions for the current generations.
+
+  Cached permissions are never deleted, bumping any of the generation
+  counters makes them unreachable instead. Reading the key doesn't write to
+  cache except for the first request after a counter is evicted.
+
+  Returns:
+    cache key string or None if generations are not available.
+  """
+  keys = _get_generation_keys(user_id)
+  generations = client.get_multi(keys)
+  missing = [key for key in keys if key not in generations]
+  if missing:
+    client.add_multi({key: _initial_generation() for key in missing})
+    # Another request could have created the counter first
+    generations.update(client.get_multi(missing))
+  if any(key not in generations for key in keys):
+    return None
+  return 'permissions:{}:{}:{}'.format(
+      user_id, generations[keys[0]], generations[keys[1]])
+
+
+def _bump_generations(keys):
+  """Increment generation counters, missing ones are created."""
+  client = get_cache_manager().cache_object.memcache_client
+  client.offset_multi({key: 1 for key in keys},
+                      initial_value=_initial_generation())
+
+
 def clear_permission_cache():
   """Drop cached permissions for all users."""
   if not getattr(settings, 'MEMCACHE_MECHANISM', False):
     return
-  client = get_cache_manager().cache_object.memcache_client
-  cached_keys_set = client.get('permissions:list') or set()
-  cached_keys_set.add('permissions:list')
-  # We delete all the cached user permissions as well as
-  # the permissions:list value itself
-  client.delete_multi(cached_keys_set)
+  _bump_generations([PERMISSIONS_GENERATION_KEY])
 
 
 def clear_users_permission_cache(user_ids):
   """ Drop cached permissions for a list of users. """
   if not getattr(settings, 'MEMCACHE_MECHANISM', False) or not user_ids:
     return
-  client = get_cache_manager().cache_object.memcache_client
-  cached_keys_set = client.get('permissions:list') or set()
-  for user_id in user_ids:
-    key = 'permissions:{}'.format(user_id)
-    if key in cached_keys_set:
-      cached_keys_set.remove(key)
-  client.set('permissions:list', cached_keys_set)
+  _bump_generations([_get_generation_keys(user_id)[1]
+                     for user_id in set(user_ids)])
+
+
+def _get_permission_changes():
+  """Returns changes affecting permissions in the current transaction."""
+  if not hasattr(flask.g, "permission_cache_changes"):
+    flask.g.permission_cache_changes = {"all": False, "user_ids": set()}
+  return flask.g.permission_cache_changes
+
+
+def mark_users_permission_changes(user_ids):
+  """Drop cached permissions of the users after the next commit.
+
+  Changes of permission models made by bulk deletes are not seen in flushes,
+  so the code doing them marks the affected users explicitly.
+  """
+  if not flask.has_app_context():
+    return
+  _get_permission_changes()["user_ids"].update(
+      user_id for user_id in user_ids if user_id is not None)
+
+
+def _collect_permission_changes(session, _):
+  """Collect users whose permissions are changed in the flush."""
+  if not flask.has_app_context():
+    return
+  changes = _get_permission_changes()
+  for obj in itertools.chain(session.new, session.dirty, session.deleted):
+    name = obj.__class__.__name__
+    if name in GLOBAL_PERMISSION_MODELS:
+      changes["all"] = True
+    elif name == "AccessControlList" and obj in session.new:
+      # New ACL entries are loaded into cached permissions as a delta
+      continue
+    elif name in PERSON_PERMISSION_MODELS:
+      history = sa.inspect(obj).attrs.person_id.history
+      changes["user_ids"].update(
+          user_id for user_id in itertools.chain(history.added,
+                                                 history.unchanged,
+                                                 history.deleted)
+          if user_id is not None
+      )
+
+
+def _invalidate_permission_changes(_):
+  """Bump permission generations of users affected by the commit."""
+  if not flask.has_app_context():
+    return
+  changes = _get_permission_changes()
+  if changes["all"]:
+    clear_permission_cache()
+  elif changes["user_ids"]:
+    clear_users_permission_cache(changes["user_ids"])
+  changes["all"] = False
+  changes["user_ids"] = set()
+
+
+def register_permission_cache_listeners():
+  """Register listeners invalidating cached permissions on role changes."""
+  event.listen(Session, "after_flush", _collect_permission_changes)
+  event.listen(Session, "after_commit", _invalidate_permission_changes)
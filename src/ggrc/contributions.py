@@ -3,6 +3,7 @@
 
 """Lists of ggrc contributions."""
 
+from ggrc.fulltext import outbox
 from ggrc.integrations import synchronization_jobs
 from ggrc.models import import_export
 from ggrc.notifications import common
@@ -25,6 +26,10 @@ HALF_HOUR_CRON_JOBS = [
     proposal.send_notification,
 ]
 
+FULLTEXT_OUTBOX_CRON_JOBS = [
+    outbox.drain_outbox_job,
+]
+
 NOTIFICATION_LISTENERS = [
     notification_handlers.register_handlers
 ]
@@ -14,6 +14,7 @@ from ggrc.utils import structures
 from ggrc.cache.memcache import MemCache
 from ggrc.converters import get_exportables
 from ggrc.converters import import_helper
+from ggrc.converters import import_lookup
 from ggrc.converters import base_block
 from ggrc.converters.snapshot_block import SnapshotBlockConverter
 from ggrc.converters.import_helper import extract_relevant_data
@@ -30,6 +31,7 @@ class BaseConverter(object):
     self.shared_state = {}
     self.response_data = []
     self.exportable = get_exportables()
+    self.lookup = import_lookup.ImportLookup()
 
   def get_info(self):
     raise NotImplementedError()
@@ -82,7 +84,13 @@ class ImportConverter(BaseConverter):
   def import_csv_data(self):
     revision_ids = []
 
-    for converter in self.initialize_block_converters():
+    block_converters = self.initialize_block_converters()
+    if self.dry_run:
+      block_converters = list(block_converters)
+      with benchmark("Build import lookup indexes"):
+        self.lookup.build(block_converters)
+
+    for converter in block_converters:
       if not converter.ignore:
         converter.import_csv_data()
         revision_ids.extend(converter.revision_ids)
@@ -115,11 +123,16 @@ class ExportConverter(BaseConverter):
   blocks and columns are handled in the correct order.
   """
 
+  # Number of written rows between progress reports
+  PROGRESS_STEP = 1000
+
   def __init__(self, ids_by_type):
     super(ExportConverter, self).__init__()
     self.dry_run = True  # TODO: fix ColumnHandler to not use it for exports
     self.block_converters = []
     self.ids_by_type = ids_by_type
+    # ExportPool rendering chunks of blocks, set by background exports
+    self.export_pool = None
 
   def get_object_names(self):
     return [c.name for c in self.block_converters]
@@ -162,26 +175,54 @@ class ExportConverter(BaseConverter):
     with benchmark("Build csv data."):
       return self.build_csv_from_row_data()
 
-  def build_csv_from_row_data(self):
-    """Export each block separated by empty lines."""
+  def export_csv_to(self, output, progress_callback=None):
+    """Write csv data to the output file object row by row.
+
+    Block converters must be initialized before.
+
+    Args:
+      output: file object the csv lines are written to.
+      progress_callback: function called with the number of written rows and
+        the total number of rows every PROGRESS_STEP rows and at the end.
+    """
+    with benchmark("Write csv data."):
+      csv_builder = CsvStringBuilder(self.get_table_width(), output)
+      self.write_csv_rows(csv_builder, progress_callback)
+
+  def get_table_width(self):
     table_width = max([converter.block_width
                        for converter in self.block_converters])
-    table_width += 1  # One line for 'Object line' column
+    return table_width + 1  # One line for 'Object line' column
+
+  def build_csv_from_row_data(self):
+    """Export each block separated by empty lines."""
+    csv_string_builder = CsvStringBuilder(self.get_table_width())
+    self.write_csv_rows(csv_string_builder)
+    return csv_string_builder.get_csv_string()
 
-    csv_string_builder = CsvStringBuilder(table_width)
+  def write_csv_rows(self, csv_builder, progress_callback=None):
+    """Write each block separated by empty lines to the csv builder."""
+    rows_total = sum(converter.rows_count
+                     for converter in self.block_converters)
+    rows_written = 0
     for block_converter in self.block_converters:
       csv_header = block_converter.generate_csv_header()
       csv_header[0].insert(0, "Object type")
       csv_header[1].insert(0, block_converter.name)
 
-      csv_string_builder.append_line(csv_header[0])
-      csv_string_builder.append_line(csv_header[1])
+      csv_builder.append_line(csv_header[0])
+      csv_builder.append_line(csv_header[1])
 
       for line in block_converter.generate_row_data():
+        if line:
+          rows_written += 1
         line.insert(0, "")
-        csv_string_builder.append_line(line)
+        csv_builder.append_line(line)
+        if progress_callback and rows_written % self.PROGRESS_STEP == 0:
+          progress_callback(rows_written, rows_total)
 
-      csv_string_builder.append_line([])
-      csv_string_builder.append_line([])
+      csv_builder.append_line([])
+      csv_builder.append_line([])
 
-    return csv_string_builder.get_csv_string()
+    if progress_callback:
+      progress_callback(rows_written, rows_total)
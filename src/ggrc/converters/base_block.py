@@ -19,6 +19,8 @@ from flask import _app_ctx_stack
 
 from ggrc import db
 from ggrc import models
+from ggrc import settings
+from ggrc.cache import utils as cache_utils
 from ggrc.rbac import permissions
 from ggrc.utils import benchmark
 from ggrc.utils import structures
@@ -30,6 +32,9 @@ from ggrc.converters.import_helper import get_column_order
 from ggrc.converters.import_helper import get_object_column_definitions
 from ggrc.models.mixins import issue_tracker as issue_tracker_mixins
 from ggrc.services import signals
+from ggrc.services.common import get_modified_objects
+from ggrc.services.common import update_snapshot_index
+from ggrc.utils.log_event import log_event
 from ggrc_workflows.models.cycle_task_group_object_task import \
     CycleTaskGroupObjectTask
 
@@ -77,6 +82,8 @@ class BlockConverter(object):
     # it, so it is expected to hold a lot of instance attributes.
     # The protected access is a false warning for inflector access.
     self._mapping_cache = None
+    # Ids of objects in the exported chunk, mapping cache is created for them
+    self._chunk_ids = None
     self._ticket_tracker_cache = None
     self._owners_cache = None
     self._ca_definitions_cache = None
@@ -129,12 +136,19 @@ class BlockConverter(object):
       self._ca_definitions_cache = self._create_ca_definitions_cache()
     return self._ca_definitions_cache
 
-  def _get_relationships(self):
-    """Get all relationships for any of the object in the current block."""
+  def _get_relationships(self, object_ids=None):
+    """Get all relationships for any of the object in the current block.
+
+    Args:
+      object_ids: ids of objects to get relationships for, all objects in
+        the block by default.
+    """
+    if object_ids is None:
+      object_ids = self.object_ids
     relationship = models.Relationship
     with benchmark("Fetch all block relationships"):
       relationships = []
-      if self.object_ids:
+      if object_ids:
         relationships = db.session.query(
             relationship.source_id,
             relationship.source_type,
@@ -143,11 +157,11 @@ class BlockConverter(object):
         ).filter(or_(
             and_(
                 relationship.source_type == self.object_class.__name__,
-                relationship.source_id.in_(self.object_ids),
+                relationship.source_id.in_(object_ids),
             ),
             and_(
                 relationship.destination_type == self.object_class.__name__,
-                relationship.destination_id.in_(self.object_ids),
+                relationship.destination_id.in_(object_ids),
             )
         )).all()
       return relationships
@@ -174,11 +188,16 @@ class BlockConverter(object):
       id_map[object_type] = dict(query)
     return id_map
 
-  def _create_mapping_cache(self):
-    """Create mapping cache for object in the current block."""
+  def _create_mapping_cache(self, object_ids=None):
+    """Create mapping cache for object in the current block.
+
+    Args:
+      object_ids: ids of objects to create the cache for, all objects in the
+        block by default.
+    """
 
     with benchmark("cache for: {}".format(self.object_class.__name__)):
-      relationships = self._get_relationships()
+      relationships = self._get_relationships(object_ids)
       id_map = self._get_identifier_mappings(relationships)
       with benchmark("building cache"):
         cache = defaultdict(lambda: defaultdict(list))
@@ -197,7 +216,7 @@ class BlockConverter(object):
   def get_mapping_cache(self):
     """Return mapping_cache attribute."""
     if self._mapping_cache is None:
-      self._mapping_cache = self._create_mapping_cache()
+      self._mapping_cache = self._create_mapping_cache(self._chunk_ids)
     return self._mapping_cache
 
   def _create_ticket_tracker_cache(self):
@@ -431,17 +450,110 @@ class ImportBlockConverter(BlockConverter):
         k for k in self.headers if k not in self.converter.priority_columns
     ]
 
+  @property
+  def batch_size(self):
+    """Number of rows committed in one transaction.
+
+    Audit rows create snapshots with their own revision event while being
+    flushed, so they are always committed one by one.
+    """
+    if self.converter.dry_run or self.object_class is models.Audit:
+      return 1
+    return max(getattr(settings, "IMPORT_BATCH_SIZE", 1), 1)
+
+  def _process_row(self, row, commit=True):
+    """Process a single row and clear the query cache."""
+    try:
+      row.process_row(commit=commit)
+    except Exception:  # pylint: disable=broad-except
+      row.add_error(errors.UNKNOWN_ERROR)
+      logger.exception("Unexpected error on import")
+    _app_ctx_stack.top.sqlalchemy_queries = []
+
+  def _import_rows(self):
+    """Import and commit rows one by one."""
+    for row in self.row_converters_from_csv():
+      self._process_row(row)
+      self._update_info(row)
+
+  def _import_rows_in_batches(self, batch_size):
+    """Import rows and commit them in batches of batch_size rows.
+
+    Rows are flushed and get the same signals as rows committed one by one,
+    but revisions, cache and snapshot index updates and the commit are done
+    once per batch.
+    """
+    batch = []
+    transaction = db.session.transaction
+    for row in self.row_converters_from_csv():
+      self._process_row(row, commit=False)
+      if db.session.transaction is not transaction:
+        # The row rolled back changes of the whole batch
+        self._fail_batch(batch)
+        batch = []
+        transaction = db.session.transaction
+      if row.ignore:
+        self._update_info(row)
+        continue
+      batch.append(row)
+      if len(batch) >= batch_size:
+        self._commit_batch(batch)
+        batch = []
+        transaction = db.session.transaction
+    if batch:
+      self._commit_batch(batch)
+
+  def _fail_batch(self, rows):
+    """Mark rows of a rolled back batch as failed.
+
+    Objects created by the rows are removed from new objects of the import,
+    so later rows can't map to the rolled back objects.
+    """
+    failed_objects = {id(row.obj) for row in rows
+                      if row.is_new and row.obj is not None}
+    for new_objects in self.converter.new_objects.itervalues():
+      for key, obj in new_objects.items():
+        if id(obj) in failed_objects:
+          del new_objects[key]
+    for row in rows:
+      row.add_error(errors.UNKNOWN_ERROR)
+      self._update_info(row)
+
+  def _commit_batch(self, rows):
+    """Commit rows flushed to the session with a single revision event."""
+    try:
+      modified_objects = get_modified_objects(db.session)
+      import_event = log_event(db.session, None)
+      cache_utils.update_memcache_before_commit(
+          self, modified_objects, self.CACHE_EXPIRY_IMPORT)
+      for row in rows:
+        row.validate_before_commit(import_event)
+      db.session.commit_hooks_enable_flag.disable()
+      db.session.commit()
+    except Exception as err:  # pylint: disable=broad-except
+      db.session.rollback()
+      logger.exception("Import failed with: %s", err.message)
+      self._fail_batch(rows)
+      return
+    try:
+      self._store_revision_ids(import_event)
+      cache_utils.update_memcache_after_commit(self)
+      update_snapshot_index(modified_objects)
+    except Exception:  # pylint: disable=broad-except
+      # Rows are already committed, so they are not reported as failed
+      logger.exception("Post-commit updates of imported rows failed")
+    for row in rows:
+      row.send_post_commit_signals(event=import_event)
+      self._update_info(row)
+
   def import_csv_data(self):
     """Perform import sequence for the block."""
     try:
-      for row in self.row_converters_from_csv():
-        try:
-          row.process_row()
-        except Exception:  # pylint: disable=broad-except
-          row.add_error(errors.UNKNOWN_ERROR)
-          logger.exception("Unexpected error on import")
-        self._update_info(row)
-        _app_ctx_stack.top.sqlalchemy_queries = []
+      batch_size = self.batch_size
+      if batch_size > 1:
+        self._import_rows_in_batches(batch_size)
+      else:
+        self._import_rows()
     except Exception:  # pylint: disable=broad-except
       logger.exception("Unexpected error on import")
     finally:
@@ -547,6 +659,13 @@ class ExportBlockConverter(BlockConverter):
     """Returns width of block (header length)."""
     return len(self.fields)
 
+  @property
+  def rows_count(self):
+    """Returns number of exported rows."""
+    if self.ignore or not self.object_ids:
+      return 0
+    return len(self.object_ids)
+
   def organize_fields(self, fields):
     """Setup fields property."""
     if fields == "all":
@@ -564,33 +683,47 @@ class ExportBlockConverter(BlockConverter):
       headers.append([description, display_name])
     return [list(header) for header in zip(*headers)]
 
-  def row_converters_from_ids(self):
-    """ Generate a row converter object for every csv row """
-    if self.ignore or not self.object_ids:
-      return
-    self.row_converters = []
-
-    for ids_pool in list_chunks(self.object_ids, self.ROW_CHUNK_SIZE):
-      # sqlalchemy caches all queries and it takes a lot of memory.
-      # This line clears query cache.
-      _app_ctx_stack.top.sqlalchemy_queries = []
+  def _load_chunk(self, ids):
+    """Load objects with the ids and the data needed by exported columns.
 
-      objects = self.object_class.eager_query().filter(
-          self.object_class.id.in_(ids_pool)
-      ).execution_options(stream_results=True)
-
-      for obj in objects:
-        yield base_row.ExportRowConverter(self, self.object_class, obj=obj,
-                                          headers=self.headers)
-
-      # Clear all objects from session (it helps to avoid memory leak)
-      for obj in db.session:
-        del obj
+    Access control lists with people and custom attribute values are loaded
+    by eager_query. Mappings are cached for the objects of the chunk only, so
+    memory used by a block does not grow with its size.
+    """
+    # sqlalchemy caches all queries and it takes a lot of memory.
+    # This line clears query cache.
+    _app_ctx_stack.top.sqlalchemy_queries = []
+    self._chunk_ids = ids
+    self._mapping_cache = None
+    return self.object_class.eager_query().filter(
+        self.object_class.id.in_(ids)
+    ).execution_options(stream_results=True)
+
+  def render_chunk(self, ids):
+    """Get row data of objects with the given ids."""
+    rows = []
+    for obj in self._load_chunk(ids):
+      row_converter = base_row.ExportRowConverter(
+          self, self.object_class, obj=obj, headers=self.headers)
+      row_converter.handle_obj_row_data()
+      rows.append(row_converter.to_array(self.fields))
+    return rows
 
   def generate_row_data(self):
-    """Get row data from all row converters while exporting."""
-    if self.ignore:
+    """Get row data from all row converters while exporting.
+
+    Objects are rendered in chunks of ROW_CHUNK_SIZE, if the converter has
+    an export pool the chunks are rendered by its worker processes and merged
+    in the order of the chunks.
+    """
+    if self.ignore or not self.object_ids:
       return
-    for row_converter in self.row_converters_from_ids():
-      row_converter.handle_obj_row_data()
-      yield row_converter.to_array(self.fields)
+    chunks = list(list_chunks(self.object_ids, self.ROW_CHUNK_SIZE))
+    pool = self.converter.export_pool
+    if pool is not None and len(chunks) > 1:
+      rendered_chunks = pool.render_chunks(self, chunks)
+    else:
+      rendered_chunks = (self.render_chunk(ids) for ids in chunks)
+    for rows in rendered_chunks:
+      for row in rows:
+        yield row
@@ -165,6 +165,9 @@ class ImportRowConverter(RowConverter):
                      column_names=", ".join(missing))
 
   def find_by_key(self, key, value):
+    if key == "slug":
+      lookup = self.block_converter.converter.lookup
+      return lookup.find_by_slug(self.object_class, value)
     return self.object_class.query.filter_by(**{key: value}).first()
 
   def get_value(self, key):
@@ -234,8 +237,13 @@ class ImportRowConverter(RowConverter):
       logger.exception("Import failed with: %s", err.message)
       self.add_error(errors.UNKNOWN_ERROR)
 
-  def process_row(self):
-    """Parse, set, validate and commit data specified in self.row."""
+  def process_row(self, commit=True):
+    """Parse, set, validate and commit data specified in self.row.
+
+    Args:
+      commit: commit the row, rows imported in batches are committed by the
+        block converter.
+    """
     self.handle_raw_data()
     self.check_mandatory_fields()
     if self.ignore:
@@ -252,7 +260,8 @@ class ImportRowConverter(RowConverter):
       return
     self.flush_object()
     self.setup_secondary_objects()
-    self.commit_object()
+    if commit:
+      self.commit_object()
 
   def check_object(self):
     """Check object if it has any pre commit checks.
@@ -308,13 +317,7 @@ class ImportRowConverter(RowConverter):
           modified_objects,
           self.block_converter.CACHE_EXPIRY_IMPORT,
       )
-      try:
-        self.send_before_commit_signals(import_event)
-      except StatusValidationError as exp:
-        status_alias = self.headers.get("status", {}).get("display_name")
-        self.add_error(errors.VALIDATION_ERROR,
-                       column_name=status_alias,
-                       message=exp.message)
+      self.validate_before_commit(import_event)
       db.session.commit_hooks_enable_flag.disable()
       db.session.commit()
       self.block_converter._store_revision_ids(import_event)
@@ -328,6 +331,16 @@ class ImportRowConverter(RowConverter):
     else:
       self.send_post_commit_signals(event=import_event)
 
+  def validate_before_commit(self, event=None):
+    """Send before commit signals and store validation errors."""
+    try:
+      self.send_before_commit_signals(event)
+    except StatusValidationError as exp:
+      status_alias = self.headers.get("status", {}).get("display_name")
+      self.add_error(errors.VALIDATION_ERROR,
+                     column_name=status_alias,
+                     message=exp.message)
+
   def setup_object(self):
     """ Set the object values or relate object values
 
@@ -0,0 +1,63 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Rendering of export chunks in a pool of worker processes.
+
+Workers are forked once per export after block converters are initialized
+and inherit the export converter with headers and caches of all blocks, so
+only block indexes and ids of chunks are sent to the workers and only
+rendered rows are sent back.
+"""
+
+import multiprocessing
+
+from ggrc import db
+
+
+# Export converter rendered by forked workers
+_CONVERTER = None
+
+
+def _render_chunk_in_worker(task):
+  block_index, ids = task
+  try:
+    return _CONVERTER.block_converters[block_index].render_chunk(ids)
+  finally:
+    # Objects of the rendered chunk are not needed anymore
+    db.session.rollback()
+
+
+class ExportPool(object):
+  """Pool of worker processes rendering chunks of export blocks.
+
+  The workers are forked when the pool is created, database connections of
+  the current process must be released before that.
+  """
+
+  def __init__(self, converter, processes):
+    global _CONVERTER  # pylint: disable=global-statement
+    _CONVERTER = converter
+    self.converter = converter
+    self.pool = multiprocessing.Pool(processes)
+
+  def render_chunks(self, block_converter, chunks):
+    """Render row data of chunks of the block converter in workers.
+
+    Args:
+      block_converter: ExportBlockConverter of the pool converter.
+      chunks: list of lists of object ids.
+
+    Returns:
+      iterator over lists of rows of every chunk in the order of chunks.
+    """
+    block_index = self.converter.block_converters.index(block_converter)
+    return self.pool.imap(_render_chunk_in_worker,
+                          [(block_index, ids) for ids in chunks])
+
+  def close(self):
+    """Stop the workers."""
+    global _CONVERTER  # pylint: disable=global-statement
+    self.pool.terminate()
+    self.pool.join()
+    self.converter.export_pool = None
+    _CONVERTER = None
@@ -13,10 +13,10 @@ class AccessControlRoleColumnHandler(handlers.UsersColumnHandler):
   def __init__(self, row_converter, key, **options):
     super(AccessControlRoleColumnHandler, self).__init__(
         row_converter, key, **options)
-    self.role = models.AccessControlRole.query.filter_by(
-        name=(options.get("attr_name") or self.display_name),
-        object_type=self.row_converter.obj.type
-    ).one()
+    self.role = self.lookup.get_ac_role(
+        options.get("attr_name") or self.display_name,
+        self.row_converter.obj.type,
+    )
 
   def _add_people(self, people_list):
     """Add people to AC list with the current role."""
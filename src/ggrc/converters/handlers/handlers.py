@@ -9,9 +9,9 @@ from datetime import datetime
 from dateutil.parser import parse
 
 from sqlalchemy import and_
-from sqlalchemy import or_
 
 from ggrc import db
+from ggrc.cache import utils as cache_utils
 from ggrc.converters import errors
 from ggrc.converters import get_exportables
 from ggrc.login import get_current_user
@@ -51,6 +51,7 @@ class ColumnHandler(object):
     self.display_name = options.get("display_name", "")
     self.dry_run = row_converter.block_converter.converter.dry_run
     self.new_objects = self.row_converter.block_converter.converter.new_objects
+    self.lookup = self.row_converter.block_converter.converter.lookup
     self.unique = options.get("unique", False)
     if options.get("parse"):
       self.set_value()
@@ -243,6 +244,9 @@ class UserColumnHandler(ColumnHandler):
   def get_person(self, email):
     from ggrc.utils import user_generator
     new_objects = self.row_converter.block_converter.converter.new_objects
+    if email not in new_objects[all_models.Person] and \
+       self.lookup.has_person(email):
+      new_objects[all_models.Person][email] = self.lookup.get_person(email)
     if email not in new_objects[all_models.Person]:
       try:
         new_objects[all_models.Person][email] = user_generator.find_user(email)
@@ -465,7 +469,7 @@ class MappingColumnHandler(ColumnHandler):
     slugs = set([slug.lower() for slug in lines if slug.strip()])
     objects = []
     for slug in slugs:
-      obj = class_.query.filter_by(slug=slug).first()
+      obj = self.lookup.find_by_slug(class_, slug)
       if obj:
         if permissions.is_allowed_update_for(obj):
           objects.append(obj)
@@ -573,14 +577,7 @@ class OptionColumnHandler(ColumnHandler):
     prefixed_key = "{}_{}".format(
         self.row_converter.object_class._inflector.table_singular, self.key
     )
-    item = all_models.Option.query.filter(
-        and_(
-            all_models.Option.title == self.raw_value,
-            or_(all_models.Option.role == self.key,
-                all_models.Option.role == prefixed_key)
-        )
-    ).first()
-    return item
+    return self.lookup.find_option(self.raw_value, [self.key, prefixed_key])
 
   def get_value(self):
     option = getattr(self.row_converter.obj, self.key, None)
@@ -605,7 +602,7 @@ class ParentColumnHandler(ColumnHandler):
     slug = self.raw_value
     obj = self.new_objects.get(self.parent, {}).get(slug)
     if obj is None:
-      obj = self.parent.query.filter(self.parent.slug == slug).first()
+      obj = self.lookup.find_by_slug(self.parent, slug)
     if obj is None:
       self.add_error(
           errors.UNKNOWN_OBJECT,
@@ -813,6 +810,7 @@ class PersonUnmappingColumnHandler(ObjectPersonColumnHandler):
         # from ``ggrc_basic_permissions``. But it is the only way I found to
         # fix the issue, without massive refactoring.
         user_role.query.filter_by(person=person, context=context).delete()
+        cache_utils.mark_users_permission_changes([person.id])
     self.dry_run = True
 
 
@@ -244,13 +244,17 @@ def calculate_computed_attributes(revision_ids, user_id):
 
 
 class CsvStringBuilder(object):
-  """CSV string builder."""
+  """CSV string builder.
 
-  def __init__(self, table_width):
+  Lines are written to the output file object if it is given, otherwise they
+  are kept in a buffer that can be read with get_csv_string.
+  """
+
+  def __init__(self, table_width, output=None):
     """Basic initialization."""
     self.table_width = table_width
 
-    self.output_buffer = StringIO()
+    self.output_buffer = StringIO() if output is None else output
     self.csv_writer = csv.writer(self.output_buffer)
 
   @staticmethod
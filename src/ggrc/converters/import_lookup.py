@@ -0,0 +1,160 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Lookup indexes of objects referenced by imported csv data.
+
+Column handlers resolve people by email, objects by slug, access control roles
+and options one cell at a time. During a dry run the rows of all blocks are
+scanned before they are processed, every kind of referenced value is resolved
+with one query per model and handlers find the objects in dicts. Values that
+were not scanned are still resolved with individual queries.
+"""
+
+from collections import defaultdict
+
+from sqlalchemy import orm
+
+from ggrc import db
+from ggrc import settings
+from ggrc.converters import get_exportables
+from ggrc.converters.handlers import handlers
+from ggrc.models import all_models
+from ggrc.utils import benchmark
+from ggrc.utils import list_chunks
+from ggrc.utils import user_generator
+
+
+# Number of values resolved with one query
+CHUNK_SIZE = 1000
+
+
+def _split_lines(values):
+  """Get set of non empty lowercase lines of all values."""
+  lines = set()
+  for value in values:
+    for line in value.splitlines():
+      line = line.strip().lower()
+      if line:
+        lines.add(line)
+  return lines
+
+
+def _get_slug_model(block_converter, key, header):
+  """Get model of objects referenced by slugs in the column or None."""
+  handler = header["handler"]
+  if key == "slug":
+    return block_converter.object_class
+  if issubclass(handler, handlers.ParentColumnHandler):
+    return handler.parent
+  if issubclass(handler, handlers.MappingColumnHandler):
+    return get_exportables().get(header.get("attr_name", ""))
+  return None
+
+
+class ImportLookup(object):
+  """Indexes of people, objects, roles and options used by handlers."""
+
+  def __init__(self):
+    self.enabled = False
+    # Lowercase email: Person or None if there is no such person
+    self.people = {}
+    # (model, lowercase slug): object or None if there is no such object
+    self.objects = {}
+    self._ac_roles = None
+    self._options = None
+
+  def build(self, block_converters):
+    """Scan rows of the blocks and resolve all referenced values."""
+    emails = set()
+    slugs = defaultdict(set)
+    for block_converter in block_converters:
+      if block_converter.ignore or not block_converter.object_class:
+        continue
+      headers = block_converter.headers.iteritems()
+      for idx, (key, header) in enumerate(headers):
+        values = [row[idx] for row in block_converter.rows if idx < len(row)]
+        model = _get_slug_model(block_converter, key, header)
+        if issubclass(header["handler"], handlers.UserColumnHandler):
+          emails |= _split_lines(values)
+        elif model is not None and hasattr(model, "slug"):
+          slugs[model] |= _split_lines(values)
+    with benchmark("Import lookup: resolve references"):
+      self._resolve_people(emails)
+      for model, model_slugs in slugs.iteritems():
+        self._resolve_objects(model, model_slugs)
+    self.enabled = True
+
+  def _resolve_people(self, emails):
+    """Load people with the emails.
+
+    People are resolved only if user_generator.find_user would just query
+    them, otherwise it can create users or query an external service.
+    """
+    if settings.INTEGRATION_SERVICE_URL:
+      return
+    emails = {email for email in emails
+              if not user_generator.is_external_app_user_email(email)}
+    self.people.update((email, None) for email in emails)
+    for emails_chunk in list_chunks(list(emails), CHUNK_SIZE):
+      query = all_models.Person.query.filter(
+          all_models.Person.email.in_(emails_chunk)
+      ).options(orm.undefer_group("Person_complete"))
+      for person in query:
+        self.people[person.email.lower()] = person
+
+  def _resolve_objects(self, model, slugs):
+    """Load objects of the model with the slugs."""
+    self.objects.update(((model, slug), None) for slug in slugs)
+    for slugs_chunk in list_chunks(list(slugs), CHUNK_SIZE):
+      for obj in model.query.filter(model.slug.in_(slugs_chunk)):
+        self.objects[(model, obj.slug.lower())] = obj
+
+  def has_person(self, email):
+    return self.enabled and email.lower() in self.people
+
+  def get_person(self, email):
+    return self.people.get(email.lower())
+
+  def find_by_slug(self, model, slug):
+    """Get object of the model with the slug or None."""
+    key = (model, slug.lower())
+    if self.enabled and key in self.objects:
+      obj = self.objects[key]
+      # Objects of ignored rows are expunged and must be loaded again
+      if obj is None or obj in db.session:
+        return obj
+    obj = model.query.filter(model.slug == slug).first()
+    if self.enabled:
+      self.objects[key] = obj
+    return obj
+
+  def get_ac_role(self, name, object_type):
+    """Get access control role of the object type with the name."""
+    role_model = all_models.AccessControlRole
+    if self.enabled:
+      if self._ac_roles is None:
+        self._ac_roles = {
+            (role.name.lower(), role.object_type): role
+            for role in role_model.query
+        }
+      role = self._ac_roles.get((name.lower(), object_type))
+      if role is not None:
+        return role
+    return role_model.query.filter_by(name=name, object_type=object_type).one()
+
+  def find_option(self, title, roles):
+    """Get option with the title and one of the roles or None."""
+    option_model = all_models.Option
+    if self.enabled:
+      if self._options is None:
+        self._options = {}
+        for option in option_model.query.order_by(option_model.id.desc()):
+          self._options[(option.role, option.title.lower())] = option
+      for role in roles:
+        option = self._options.get((role, title.lower()))
+        if option is not None:
+          return option
+    return option_model.query.filter(
+        option_model.title == title,
+        option_model.role.in_(roles),
+    ).first()
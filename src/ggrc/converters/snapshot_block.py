@@ -364,3 +364,8 @@ class SnapshotBlockConverter(object):
   def block_width(self):
     """Returns width of block (header length)."""
     return len(self._attribute_name_map.values() + self._cad_name_map.values())
+
+  @property
+  def rows_count(self):
+    """Returns number of exported rows."""
+    return len(self.ids)
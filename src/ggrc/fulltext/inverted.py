@@ -0,0 +1,69 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Full text index engine using MySQL FULLTEXT inverted index.
+
+The default MysqlIndexer matches terms with LIKE '%term%' which always scans
+the whole fulltext_record_properties table. This indexer looks up candidate
+records in the FULLTEXT index on the content column and checks only those
+records with LIKE.
+
+Enable it with FULLTEXT_INDEXER = "ggrc.fulltext.inverted.InvertedIndexer".
+With the default word parser terms match words starting with every term
+token (prefix matching). If the index is created WITH PARSER ngram (MySQL
+5.7+), set FULLTEXT_INVERTED_PARSER = "ngram" and terms are matched as n-gram
+phrases, which finds terms in the middle of words as well.
+"""
+
+import re
+
+import sqlalchemy as sa
+
+from ggrc import settings
+from ggrc.fulltext.mysql import MysqlIndexer
+
+
+# Characters with special meaning in boolean mode full-text search
+TOKEN_SEPARATORS = re.compile(r"[\s+\-<>()~*\"@']+", re.UNICODE)
+
+
+class InvertedIndexer(MysqlIndexer):
+  """Indexer searching records in MySQL FULLTEXT index."""
+
+  def __init__(self, settings_):
+    super(InvertedIndexer, self).__init__(settings_)
+    self.parser = getattr(settings, "FULLTEXT_INVERTED_PARSER", "word")
+    self.min_token_size = getattr(settings, "FULLTEXT_MIN_TOKEN_SIZE", 3)
+
+  def get_match_query(self, terms):
+    """Get boolean mode search string for terms or None if not indexable.
+
+    Tokens shorter than the minimal indexed token size are not stored in the
+    index, such terms can't be searched in the index.
+    """
+    tokens = [token for token in TOKEN_SEPARATORS.split(terms) if token]
+    if self.parser == "ngram":
+      if not tokens or len(u"".join(tokens)) < self.min_token_size:
+        return None
+      return u'"{}"'.format(u" ".join(tokens))
+    tokens = [token for token in tokens if len(token) >= self.min_token_size]
+    if not tokens:
+      return None
+    return u" ".join(u"+{}*".format(token) for token in tokens)
+
+  def content_filter(self, terms, ilike=False):
+    """Filter records with content containing terms."""
+    like = super(InvertedIndexer, self).content_filter(terms, ilike)
+    match_query = self.get_match_query(terms)
+    if match_query is None:
+      return like
+    match = sa.text(
+        "MATCH ({}.content) AGAINST (:fulltext_terms IN BOOLEAN MODE)".format(
+            self.record_type.__tablename__)
+    ).bindparams(sa.bindparam("fulltext_terms", match_query, unique=True))
+    # LIKE is evaluated only for records found in the index and keeps the
+    # results of multi token terms in the order of the search terms.
+    return sa.and_(match, like)
+
+
+Indexer = InvertedIndexer
@@ -14,6 +14,7 @@ from ggrc import fulltext
 from ggrc import utils
 from ggrc.models import all_models, get_model
 from ggrc.fulltext import mixin
+from ggrc.fulltext import outbox
 from ggrc.utils import benchmark, helpers
 
 ACTIONS = ['after_insert', 'after_delete', 'after_update']
@@ -54,6 +55,11 @@ class ReindexSet(threading.local):
     """Function that clear and push new full text records in DB."""
     with benchmark("push ft records into DB"):
       self.warmup()
+      if outbox.is_enabled():
+        # Records are updated later by the outbox cron job
+        outbox.enqueue(self.model_ids_to_reindex)
+        self.model_ids_to_reindex.clear()
+        return
       for obj in db.session:
         if not isinstance(obj, mixin.Indexed):
           continue
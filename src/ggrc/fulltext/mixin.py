@@ -4,9 +4,12 @@
 import itertools
 from collections import namedtuple
 
+import sqlalchemy as sa
 from sqlalchemy import orm
 
 from ggrc import db
+from ggrc import settings
+from ggrc.query import result_cache
 
 from ggrc import fulltext
 
@@ -62,13 +65,90 @@ class Indexed(object):
     )
 
   @classmethod
-  def bulk_record_update_for(cls, ids):
-    """Bulky update index records for current class"""
+  def bulk_record_update_for(cls, ids, diff=None):
+    """Bulky update index records for current class
+
+    Args:
+      ids: ids of objects to reindex.
+      diff: compare new records with existing ones and write only changed
+        rows. Defaults to FULLTEXT_DIFF_UPDATES setting.
+
+    Returns:
+      number of inserted, updated and deleted records.
+    """
+    if diff is None:
+      diff = getattr(settings, "FULLTEXT_DIFF_UPDATES", False)
+    # Record tables are not models, so results of queries filtering by
+    # record content are invalidated by the types of indexed objects.
+    result_cache.mark_modified([cls.__name__])
+    if diff:
+      return cls._diff_record_update_for(ids)
+    touched = 0
     delete_query = cls.get_delete_query_for(ids)
     insert_query = cls.get_insert_query_for(ids)
     for query in [delete_query, insert_query]:
       if query is not None:
-        db.session.execute(query)
+        touched += db.session.execute(query).rowcount
+    return touched
+
+  @classmethod
+  def _diff_record_update_for(cls, ids):
+    """Update only index records that differ from the existing ones.
+
+    Records are matched by (key, type, property, subproperty) primary key.
+
+    Returns:
+      number of inserted, updated and deleted records.
+    """
+    if not ids:
+      return 0
+    indexer = fulltext.get_indexer()
+    record = indexer.record_type
+    table = record.__table__
+    instances = cls.indexed_query().filter(cls.id.in_(ids))
+    new_records = {
+        (row["key"], row["type"], row["property"], row["subproperty"]): row
+        for row in itertools.chain(*[indexer.records_generator(i)
+                                     for i in instances])
+    }
+    types = {cls.__name__}
+    types.update(pk[1] for pk in new_records)
+    existing = {
+        (row.key, row.type, row.property, row.subproperty): row
+        for row in db.session.query(
+            record.key, record.type, record.property, record.subproperty,
+            record.tags, record.content,
+        ).filter(record.type.in_(types), record.key.in_(ids))
+    }
+    to_delete = [pk for pk in existing if pk not in new_records]
+    to_insert = [row for pk, row in new_records.iteritems()
+                 if pk not in existing]
+    to_update = [
+        row for pk, row in new_records.iteritems()
+        if pk in existing and (existing[pk].content != row["content"] or
+                               existing[pk].tags != row["tags"])
+    ]
+    if to_delete:
+      db.session.execute(table.delete().where(sa.tuple_(
+          table.c.key, table.c.type, table.c.property, table.c.subproperty,
+      ).in_(to_delete)))
+    if to_update:
+      db.session.execute(
+          table.update().where(sa.and_(
+              table.c.key == sa.bindparam("_key"),
+              table.c.type == sa.bindparam("_type"),
+              table.c.property == sa.bindparam("_property"),
+              table.c.subproperty == sa.bindparam("_subproperty"),
+          )).values(
+              tags=sa.bindparam("_tags"),
+              content=sa.bindparam("_content"),
+          ),
+          [{"_" + name: value for name, value in row.iteritems()}
+           for row in to_update],
+      )
+    if to_insert:
+      db.session.execute(table.insert(), to_insert)
+    return len(to_delete) + len(to_update) + len(to_insert)
 
   @classmethod
   def indexed_query(cls):
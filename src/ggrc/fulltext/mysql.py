@@ -34,6 +34,10 @@ class MysqlRecordProperty(db.Model):
         db.Index('ix_{}_tags'.format(cls.__tablename__), 'tags'),
         db.Index('ix_{}_key'.format(cls.__tablename__), 'key'),
         db.Index('ix_{}_type'.format(cls.__tablename__), 'type'),
+        # FULLTEXT index used by ggrc.fulltext.inverted.InvertedIndexer, the
+        # FULLTEXT prefix is added by the migration as SQLAlchemy can't
+        # declare it and reflects such indexes as plain ones.
+        db.Index('ft_{}_content'.format(cls.__tablename__), 'content'),
     )
 
 
@@ -41,15 +45,25 @@ class MysqlIndexer(SqlIndexer):
   """MysqlIndexer class"""
   record_type = MysqlRecordProperty
 
-  @staticmethod
-  def _get_filter_query(terms):
+  def content_filter(self, terms, ilike=False):
+    """Filter records with content containing terms.
+
+    Args:
+      terms: string that must be contained in record content.
+      ilike: compare lowercased content and terms.
+    """
+    if ilike:
+      return self.record_type.content.ilike(u"%{}%".format(terms))
+    return self.record_type.content.contains(terms)
+
+  def _get_filter_query(self, terms):
     """Get the whitelist of fields to filter in full text table."""
     whitelist = MysqlRecordProperty.property.in_(
         ['title', 'name', 'email', 'notes', 'description', 'slug'])
 
     if not terms:
       return whitelist
-    return sa.and_(whitelist, MysqlRecordProperty.content.contains(terms))
+    return sa.and_(whitelist, self.content_filter(terms))
 
   @staticmethod
   def get_permissions_query(model_names, permission_type='read'):
@@ -78,7 +92,9 @@ class MysqlIndexer(SqlIndexer):
       elif resources:
         type_queries.append(sa.and_(
             MysqlRecordProperty.type == model_name,
-            MysqlRecordProperty.key.in_(resources),
+            permissions.get_resources_filter(
+                MysqlRecordProperty.key, model_name, permission_type,
+                resources),
         ))
 
     if not type_queries:
@@ -216,6 +232,68 @@ class MysqlIndexer(SqlIndexer):
       query = query.union(extra_q)
     return query.all()
 
+  def _get_search_parts(self, types, permission_type, contact_id,
+                        extra_params, extra_columns):
+    """Get filtered record queries labeled with their counts keys."""
+    columns = (
+        self.record_type.key.label('key'),
+        self.record_type.type.label('type'),
+        self.record_type.property.label('property'),
+        self.record_type.content.label('content'),
+    )
+    model_names = self._get_grouped_types(types, extra_params)
+    query = db.session.query(sa.literal("").label('label'), *columns)
+    query = query.filter(self.get_permissions_query(
+        model_names, permission_type))
+    parts = [self.search_get_owner_query(query, types, contact_id)]
+    all_extra_columns = dict(extra_columns.items() +
+                             [(p, p) for p in extra_params
+                              if p not in extra_columns])
+    for key, value in all_extra_columns.iteritems():
+      extra_q = db.session.query(sa.literal(key).label('label'), *columns)
+      extra_q = extra_q.filter(
+          self.get_permissions_query([value], permission_type))
+      extra_q = self.search_get_owner_query(extra_q, [value], contact_id)
+      extra_q = self._add_extra_params_query(extra_q,
+                                             value,
+                                             extra_params.get(key, None))
+      parts.append(extra_q)
+    return parts
+
+  def search_with_counts(self, terms, types=None, permission_type='read',
+                         contact_id=None, extra_params=None,
+                         extra_columns=None):
+    """Get search results and counts with a single query.
+
+    Records matching the terms are read once and grouped by object, results
+    are ordered the same way as in search.
+
+    Returns:
+      list of (label, type, key) rows where label is "" for objects of the
+      requested types and the extra columns key for objects of extra
+      params and extra columns.
+    """
+    extra_params = extra_params or {}
+    extra_columns = extra_columns or {}
+    parts = [part.filter(self._get_filter_query(terms))
+             for part in self._get_search_parts(types, permission_type,
+                                                contact_id, extra_params,
+                                                extra_columns)]
+    records = sa.union_all(*parts).alias("records")
+    title_content = sa.func.min(sa.case(
+        [(records.c.property == 'title', records.c.content)], else_=None))
+    query = select([
+        records.c.label,
+        records.c.type,
+        records.c.key,
+    ]).group_by(
+        records.c.label, records.c.type, records.c.key,
+    ).order_by(
+        sa.func.min(sa.case([(records.c.property == 'title', 0)], else_=1)),
+        sa.func.coalesce(title_content, sa.func.min(records.c.content)),
+    )
+    return db.session.execute(query).fetchall()
+
 
 Indexer = MysqlIndexer
 
@@ -0,0 +1,154 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Outbox of objects waiting for asynchronous fulltext reindex.
+
+In async indexing mode commits only store (type, id) pairs of objects that
+need to be reindexed in the fulltext_outbox table within the same
+transaction. The outbox is drained by a cron job in large batches, so
+repeated edits of the same object are indexed only once.
+"""
+
+import datetime
+import logging
+from collections import defaultdict
+
+import sqlalchemy as sa
+
+from ggrc import db
+from ggrc import settings
+from ggrc import utils
+from ggrc.models import get_model
+from ggrc.utils import benchmark
+
+
+logger = logging.getLogger(__name__)
+
+# Number of outbox entries processed in one transaction
+BATCH_SIZE = 5000
+# Number of objects reindexed with one delete and insert query
+REINDEX_CHUNK_SIZE = 200
+
+
+class FulltextOutbox(db.Model):
+  """Object waiting for fulltext reindex."""
+  # pylint: disable=too-few-public-methods
+  __tablename__ = "fulltext_outbox"
+
+  id = db.Column(db.Integer, primary_key=True)
+  type = db.Column(db.String(64), nullable=False)
+  key = db.Column(db.Integer, nullable=False)
+  created_at = db.Column(db.DateTime, nullable=False)
+
+
+def is_enabled():
+  """Check if fulltext records are updated asynchronously."""
+  return getattr(settings, "FULLTEXT_INDEXING_MODE", "sync") == "async"
+
+
+def enqueue(model_ids):
+  """Add objects to the outbox with a single insert.
+
+  Args:
+    model_ids: dict of model names and sets of ids to reindex.
+  """
+  now = datetime.datetime.utcnow()
+  rows = [
+      {"type": model_name, "key": id_, "created_at": now}
+      for model_name, ids in model_ids.iteritems()
+      for id_ in ids
+  ]
+  if rows:
+    db.session.execute(FulltextOutbox.__table__.insert(), rows)
+
+
+def _reindex(model_ids):
+  """Update fulltext records of the given objects.
+
+  Returns:
+    number of written fulltext records.
+  """
+  touched = 0
+  for model_name, ids in model_ids.iteritems():
+    model = get_model(model_name)
+    if model is None:
+      logger.warning("Skipping reindex of unknown model %s", model_name)
+      continue
+    for ids_chunk in utils.list_chunks(sorted(ids), REINDEX_CHUNK_SIZE):
+      touched += model.bulk_record_update_for(ids_chunk)
+  return touched
+
+
+def drain_batch(batch_size=BATCH_SIZE):
+  """Reindex objects of the oldest outbox entries and remove the entries.
+
+  Returns:
+    number of removed outbox entries.
+  """
+  outbox = FulltextOutbox.__table__
+  with benchmark("Fulltext outbox: fetch batch"):
+    entries = db.session.execute(
+        sa.select([outbox.c.id, outbox.c.type, outbox.c.key])
+        .order_by(outbox.c.id)
+        .limit(batch_size)
+    ).fetchall()
+  if not entries:
+    return 0
+  model_ids = defaultdict(set)
+  for _, type_, key in entries:
+    model_ids[type_].add(key)
+  objects_count = sum(len(ids) for ids in model_ids.itervalues())
+  with benchmark("Fulltext outbox: reindex {} objects".format(objects_count)):
+    touched = _reindex(model_ids)
+  logger.info("Fulltext outbox: reindexed %s objects, wrote %s records",
+              objects_count, touched)
+  db.session.execute(
+      outbox.delete().where(outbox.c.id.in_([entry.id for entry in entries]))
+  )
+  db.session.plain_commit()
+  return len(entries)
+
+
+def drain(batch_size=BATCH_SIZE, max_batches=None):
+  """Process outbox entries until the outbox is empty.
+
+  Args:
+    batch_size: number of entries processed in one transaction.
+    max_batches: maximal number of batches to process or None for no limit.
+
+  Returns:
+    number of processed outbox entries.
+  """
+  processed = 0
+  batches = 0
+  while max_batches is None or batches < max_batches:
+    drained = drain_batch(batch_size)
+    if not drained:
+      break
+    processed += drained
+    batches += 1
+  logger.info("Fulltext outbox: processed %s entries", processed)
+  return processed
+
+
+def get_status():
+  """Get number of waiting outbox entries and the indexing lag."""
+  pending, oldest = db.session.query(
+      sa.func.count(FulltextOutbox.id),
+      sa.func.min(FulltextOutbox.created_at),
+  ).one()
+  lag = 0
+  if oldest is not None:
+    lag = (datetime.datetime.utcnow() - oldest).total_seconds()
+  return {
+      "mode": getattr(settings, "FULLTEXT_INDEXING_MODE", "sync"),
+      "pending": pending,
+      "oldest": oldest.isoformat() if oldest else None,
+      "lag_seconds": lag,
+  }
+
+
+def drain_outbox_job():
+  """Cron job draining the fulltext outbox."""
+  if is_enabled():
+    drain()
@@ -0,0 +1,266 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Parallel and resumable full reindex of fulltext records.
+
+Every indexed model is split into partitions by id ranges aligned to
+PARTITION_SIZE, snapshots are reindexed by snapshotter.indexer.reindex as a
+single partition. Partitions are reindexed in a process pool or in the
+current process, and every finished partition is stored as a checkpoint, so
+an interrupted reindex can be resumed without reindexing finished partitions
+again.
+"""
+
+import collections
+import datetime
+import logging
+import multiprocessing
+import time
+
+from ggrc import db
+from ggrc import fulltext
+from ggrc import utils
+from ggrc.fulltext import mixin
+from ggrc.models import all_models
+from ggrc.snapshotter import indexer as snapshot_indexer
+from ggrc.utils import benchmark
+
+
+logger = logging.getLogger(__name__)
+
+# Number of ids in one partition
+PARTITION_SIZE = 5000
+# Number of objects reindexed with one delete and insert query
+CHUNK_SIZE = 100
+
+SNAPSHOT = "Snapshot"
+# Id range of the partition containing all snapshots
+SNAPSHOT_PARTITION_RANGE = (0, 0)
+
+
+class Partition(collections.namedtuple("Partition",
+                                       ["model", "min_id", "max_id"])):
+  """Range of ids of a model reindexed as one unit."""
+  __slots__ = ()
+
+
+class ReindexCheckpoint(db.Model):
+  """Partition that was already reindexed."""
+  # pylint: disable=too-few-public-methods
+  __tablename__ = "fulltext_reindex_checkpoints"
+
+  id = db.Column(db.Integer, primary_key=True)
+  model = db.Column(db.String(64), nullable=False)
+  min_id = db.Column(db.Integer, nullable=False)
+  max_id = db.Column(db.Integer, nullable=False)
+  objects = db.Column(db.Integer, nullable=False)
+  seconds = db.Column(db.Float, nullable=False)
+  created_at = db.Column(db.DateTime, nullable=False)
+
+  __table_args__ = (
+      db.UniqueConstraint("model", "min_id", "max_id",
+                          name="uq_fulltext_reindex_checkpoints"),
+  )
+
+
+def get_indexed_models():
+  """Get models that are reindexed by a full reindex."""
+  return {
+      model.__name__: model for model in all_models.all_models
+      if issubclass(model, mixin.Indexed) and model.REQUIRED_GLOBAL_REINDEX
+  }
+
+
+def plan_partitions(model_names, partition_size=PARTITION_SIZE):
+  """Split models into partitions by id ranges.
+
+  Ranges are aligned to partition_size, so plans of the same models are
+  equal even if objects were created after the first plan was made.
+  """
+  partitions = []
+  indexed_models = get_indexed_models()
+  for model_name in model_names:
+    if model_name == SNAPSHOT:
+      partitions.append(Partition(SNAPSHOT, *SNAPSHOT_PARTITION_RANGE))
+      continue
+    model = indexed_models[model_name]
+    min_id, max_id = db.session.query(
+        db.func.min(model.id), db.func.max(model.id)
+    ).one()
+    if min_id is None:
+      continue
+    for start in range(min_id // partition_size * partition_size,
+                       max_id + 1, partition_size):
+      partitions.append(
+          Partition(model_name, start, start + partition_size - 1))
+  return partitions
+
+
+def get_finished_partitions():
+  """Get partitions stored in checkpoints."""
+  checkpoint = ReindexCheckpoint
+  return {
+      Partition(*row) for row in db.session.query(
+          checkpoint.model, checkpoint.min_id, checkpoint.max_id)
+  }
+
+
+def clear_checkpoints():
+  ReindexCheckpoint.query.delete()
+  db.session.commit()
+
+
+def warmup_indexer_cache():
+  """Load people and roles used in records of all objects."""
+  indexer = fulltext.get_indexer()
+  people_query = db.session.query(all_models.Person.id,
+                                  all_models.Person.name,
+                                  all_models.Person.email)
+  indexer.cache["people_map"] = {p.id: (p.name, p.email) for p in people_query}
+  indexer.cache["ac_role_map"] = dict(db.session.query(
+      all_models.AccessControlRole.id,
+      all_models.AccessControlRole.name,
+  ))
+
+
+def reindex_partition(partition, processes=1):
+  """Reindex all objects of the partition and store its checkpoint.
+
+  Args:
+    partition: Partition to reindex.
+    processes: number of worker processes building snapshot records.
+
+  Returns:
+    tuple of partition, number of reindexed objects and spent seconds.
+  """
+  start = time.time()
+  if partition.model == SNAPSHOT:
+    objects = snapshot_indexer.reindex(processes=processes)
+  else:
+    model = get_indexed_models()[partition.model]
+    ids = [id_ for id_, in db.session.query(model.id).filter(
+        model.id.between(partition.min_id, partition.max_id))]
+    objects = len(ids)
+    for ids_chunk in utils.list_chunks(ids, chunk_size=CHUNK_SIZE):
+      model.bulk_record_update_for(ids_chunk)
+      db.session.commit()
+  seconds = time.time() - start
+  db.session.add(ReindexCheckpoint(
+      model=partition.model,
+      min_id=partition.min_id,
+      max_id=partition.max_id,
+      objects=objects,
+      seconds=seconds,
+      created_at=datetime.datetime.utcnow(),
+  ))
+  db.session.commit()
+  return partition, objects, seconds
+
+
+def _init_worker():
+  """Prepare forked worker process for reindexing."""
+  from ggrc.app import app
+  app.app_context().push()
+  warmup_indexer_cache()
+
+
+def _reindex_partition_in_worker(partition):
+  try:
+    return reindex_partition(partition)
+  finally:
+    db.session.remove()
+
+
+class ThroughputReport(object):
+  """Collect number of reindexed objects and spent time per model."""
+
+  def __init__(self):
+    self.objects = collections.defaultdict(int)
+    self.seconds = collections.defaultdict(float)
+    self.started_at = time.time()
+
+  def add(self, partition, objects, seconds):
+    self.objects[partition.model] += objects
+    self.seconds[partition.model] += seconds
+    logger.info("%s %s-%s: %s objects in %.1fs", partition.model,
+                partition.min_id, partition.max_id, objects, seconds)
+
+  def as_dict(self):
+    """Get throughput of every model and total wall time."""
+    models = {
+        model: {
+            "objects": self.objects[model],
+            "seconds": self.seconds[model],
+            "objects_per_second": (self.objects[model] / self.seconds[model]
+                                   if self.seconds[model] else 0),
+        }
+        for model in self.objects
+    }
+    return {"models": models, "seconds": time.time() - self.started_at}
+
+  def log(self):
+    for model, stats in sorted(self.as_dict()["models"].iteritems()):
+      logger.info("%s: %s objects, %.1f objects/s", model, stats["objects"],
+                  stats["objects_per_second"])
+
+
+def run(model_names=None, with_snapshots=False, processes=1, resume=False,
+        partition_size=PARTITION_SIZE):
+  """Reindex fulltext records of the given models.
+
+  Args:
+    model_names: names of models to reindex, all indexed models by default.
+    with_snapshots: reindex snapshots as well.
+    processes: number of worker processes, partitions are reindexed in the
+      current process if it is 1.
+    resume: skip partitions finished by the previous run.
+    partition_size: number of ids in one partition.
+
+  Returns:
+    throughput report dict.
+  """
+  if model_names is None:
+    model_names = sorted(get_indexed_models())
+  model_names = list(model_names)
+  if with_snapshots:
+    model_names.append(SNAPSHOT)
+  if not resume:
+    clear_checkpoints()
+
+  with benchmark("Plan reindex partitions"):
+    finished = get_finished_partitions()
+    partitions = [partition
+                  for partition in plan_partitions(model_names, partition_size)
+                  if partition not in finished]
+  logger.info("Reindexing %s partitions, %s were already finished",
+              len(partitions), len(finished))
+
+  report = ThroughputReport()
+  if processes > 1:
+    # Snapshots use their own pool, workers can't start child processes
+    snapshot_partitions = [partition for partition in partitions
+                           if partition.model == SNAPSHOT]
+    partitions = [partition for partition in partitions
+                  if partition.model != SNAPSHOT]
+    # Checkpoints must be visible to workers and forked workers must not
+    # share pooled connections with this process.
+    db.session.commit()
+    db.session.remove()
+    db.engine.dispose()
+    pool = multiprocessing.Pool(processes, initializer=_init_worker)
+    try:
+      for result in pool.imap_unordered(_reindex_partition_in_worker,
+                                        partitions):
+        report.add(*result)
+    finally:
+      pool.close()
+      pool.join()
+    for partition in snapshot_partitions:
+      report.add(*reindex_partition(partition, processes))
+  else:
+    warmup_indexer_cache()
+    for partition in partitions:
+      report.add(*reindex_partition(partition))
+  fulltext.get_indexer().invalidate_cache()
+  report.log()
+  return report.as_dict()
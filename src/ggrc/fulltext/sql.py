@@ -6,6 +6,7 @@
 from collections import defaultdict
 
 from ggrc import db
+from ggrc.query import result_cache
 
 
 class SqlIndexer(object):
@@ -55,6 +56,7 @@ class SqlIndexer(object):
     """Create records in db."""
     for db_record in self.records_generator(instance):
       db.session.add(self.record_type(**db_record))
+    result_cache.mark_modified([instance.type])
     if commit:
       db.session.commit()
 
@@ -68,6 +70,7 @@ class SqlIndexer(object):
     ).delete(
         synchronize_session="fetch"
     )
+    result_cache.mark_modified([type])
     if commit:
       db.session.commit()
 
@@ -83,6 +86,7 @@ class SqlIndexer(object):
     ).delete(
         synchronize_session="fetch"
     )
+    result_cache.mark_modified([type])
     if commit:
       db.session.commit()
 
@@ -96,5 +100,6 @@ class SqlIndexer(object):
     """Delete values from index table for selected type."""
     db.session.query(self.record_type).filter(
         self.record_type.type == type).delete()
+    result_cache.mark_modified([type])
     if commit:
       db.session.commit()
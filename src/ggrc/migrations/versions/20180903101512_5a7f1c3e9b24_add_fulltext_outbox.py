@@ -0,0 +1,35 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Add fulltext outbox table
+
+Create Date: 2018-09-03 10:15:12.482913
+"""
+# disable Invalid constant name pylint warning for mandatory Alembic variables.
+# pylint: disable=invalid-name
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '5a7f1c3e9b24'
+down_revision = 'b46bdb31d869'
+
+
+def upgrade():
+  """Upgrade database schema and/or data, creating a new revision."""
+  op.create_table(
+      'fulltext_outbox',
+      sa.Column('id', sa.Integer(), nullable=False),
+      sa.Column('type', sa.String(length=64), nullable=False),
+      sa.Column('key', sa.Integer(), nullable=False),
+      sa.Column('created_at', sa.DateTime(), nullable=False),
+      sa.PrimaryKeyConstraint('id'),
+  )
+
+
+def downgrade():
+  """Downgrade database schema and/or data back to the previous revision."""
+  op.drop_table('fulltext_outbox')
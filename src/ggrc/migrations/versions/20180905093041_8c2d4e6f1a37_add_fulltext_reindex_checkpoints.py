@@ -0,0 +1,40 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Add fulltext reindex checkpoints table
+
+Create Date: 2018-09-05 09:30:41.173520
+"""
+# disable Invalid constant name pylint warning for mandatory Alembic variables.
+# pylint: disable=invalid-name
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '8c2d4e6f1a37'
+down_revision = '5a7f1c3e9b24'
+
+
+def upgrade():
+  """Upgrade database schema and/or data, creating a new revision."""
+  op.create_table(
+      'fulltext_reindex_checkpoints',
+      sa.Column('id', sa.Integer(), nullable=False),
+      sa.Column('model', sa.String(length=64), nullable=False),
+      sa.Column('min_id', sa.Integer(), nullable=False),
+      sa.Column('max_id', sa.Integer(), nullable=False),
+      sa.Column('objects', sa.Integer(), nullable=False),
+      sa.Column('seconds', sa.Float(), nullable=False),
+      sa.Column('created_at', sa.DateTime(), nullable=False),
+      sa.PrimaryKeyConstraint('id'),
+      sa.UniqueConstraint('model', 'min_id', 'max_id',
+                          name='uq_fulltext_reindex_checkpoints'),
+  )
+
+
+def downgrade():
+  """Downgrade database schema and/or data back to the previous revision."""
+  op.drop_table('fulltext_reindex_checkpoints')
@@ -0,0 +1,36 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Add FULLTEXT index on fulltext record content
+
+The index is declared by MysqlRecordProperty and is created regardless of
+FULLTEXT_INDEXER so the inverted indexer can be enabled without a schema
+change. Creating the first FULLTEXT index rebuilds the table once. Later
+writes add tokens to the InnoDB full-text cache, which is synced to the index
+in the background, so the default indexer only pays for the extra storage.
+
+Create Date: 2018-09-07 14:22:10.604218
+"""
+# disable Invalid constant name pylint warning for mandatory Alembic variables.
+# pylint: disable=invalid-name
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '3d9e0b5c7f18'
+down_revision = '8c2d4e6f1a37'
+
+
+def upgrade():
+  """Upgrade database schema and/or data, creating a new revision."""
+  op.execute("""
+      ALTER TABLE fulltext_record_properties
+      ADD FULLTEXT INDEX ft_fulltext_record_properties_content (content)
+  """)
+
+
+def downgrade():
+  """Downgrade database schema and/or data back to the previous revision."""
+  op.drop_index('ft_fulltext_record_properties_content',
+                'fulltext_record_properties')
@@ -0,0 +1,35 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Add blob storage key and export progress to import_exports
+
+Create Date: 2018-09-11 10:35:14.218406
+"""
+# disable Invalid constant name pylint warning for mandatory Alembic variables.
+# pylint: disable=invalid-name
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '6e1b7d2a9c40'
+down_revision = '3d9e0b5c7f18'
+
+
+def upgrade():
+  """Upgrade database schema and/or data, creating a new revision."""
+  op.add_column('import_exports',
+                sa.Column('storage_key', sa.String(length=250), nullable=True))
+  op.add_column('import_exports',
+                sa.Column('rows_written', sa.Integer(), nullable=True))
+  op.add_column('import_exports',
+                sa.Column('rows_total', sa.Integer(), nullable=True))
+
+
+def downgrade():
+  """Downgrade database schema and/or data back to the previous revision."""
+  op.drop_column('import_exports', 'rows_total')
+  op.drop_column('import_exports', 'rows_written')
+  op.drop_column('import_exports', 'storage_key')
@@ -0,0 +1,37 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Add snapshot_watermarks table
+
+Create Date: 2018-09-13 09:45:12.506718
+"""
+# disable Invalid constant name pylint warning for mandatory Alembic variables.
+# pylint: disable=invalid-name
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '5b8f2c1d7e63'
+down_revision = '6e1b7d2a9c40'
+
+
+def upgrade():
+  """Upgrade database schema and/or data, creating a new revision."""
+  op.create_table(
+      'snapshot_watermarks',
+      sa.Column('id', sa.Integer(), nullable=False),
+      sa.Column('parent_type', sa.String(length=250), nullable=False),
+      sa.Column('parent_id', sa.Integer(), nullable=False),
+      sa.Column('revision_id', sa.Integer(), nullable=False),
+      sa.PrimaryKeyConstraint('id'),
+      sa.UniqueConstraint('parent_type', 'parent_id',
+                          name='uq_snapshot_watermarks_parent'),
+  )
+
+
+def downgrade():
+  """Downgrade database schema and/or data back to the previous revision."""
+  op.drop_table('snapshot_watermarks')
@@ -70,6 +70,7 @@ from ggrc.models.revision import Revision
 from ggrc.models.risk import Risk
 from ggrc.models.risk_assessment import RiskAssessment
 from ggrc.models.snapshot import Snapshot
+from ggrc.models.snapshot_watermark import SnapshotWatermark
 from ggrc.models.system import Process
 from ggrc.models.system import System
 from ggrc.models.system import SystemOrProcess
@@ -145,6 +146,7 @@ all_models = [  # pylint: disable=invalid-name
     Risk,
     RiskAssessment,
     Snapshot,
+    SnapshotWatermark,
     Standard,
     System,
     SystemOrProcess,
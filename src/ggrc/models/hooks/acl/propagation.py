@@ -16,6 +16,7 @@ import sqlalchemy as sa
 from ggrc import db
 from ggrc import login
 from ggrc import utils
+from ggrc.cache import utils as cache_utils
 from ggrc.utils import helpers
 from ggrc.access_control import utils as acl_utils
 from ggrc.models import all_models
@@ -292,6 +293,20 @@ def _propagate_relationships(relationship_ids, new_acl_ids):
   _propagate(child_ids)
 
 
+def _mark_acl_people(condition):
+  """Drop cached permissions of people with ACL entries deleted by condition.
+
+  Propagated entries belong to the same person as their parent entry, so
+  entries removed by the cascade don't change the set of affected people.
+  """
+  acl_table = all_models.AccessControlList.__table__
+  cache_utils.mark_users_permission_changes(
+      person_id for person_id, in db.session.execute(
+          sa.select([acl_table.c.person_id]).where(condition).distinct()
+      )
+  )
+
+
 def _delete_orphan_acl_entries(deleted_objects):
   """Delete ACL entries for deleted objects.
 
@@ -304,17 +319,14 @@ def _delete_orphan_acl_entries(deleted_objects):
     return
 
   acl_table = all_models.AccessControlList.__table__
-  db.session.execute(
-      acl_table.delete().where(
-          sa.tuple_(
-              acl_table.c.object_type,
-              acl_table.c.object_id
-          ).in_(
-              deleted_objects
-          )
-
-      )
+  condition = sa.tuple_(
+      acl_table.c.object_type,
+      acl_table.c.object_id
+  ).in_(
+      deleted_objects
   )
+  _mark_acl_people(condition)
+  db.session.execute(acl_table.delete().where(condition))
   db.session.plain_commit()
 
 
@@ -327,6 +339,7 @@ def _delete_propagated_acls(acl_ids):
   """
   acl_table = all_models.AccessControlList.__table__
 
+  _mark_acl_people(acl_table.c.id.in_(acl_ids))
   db.session.execute(
       acl_table.delete().where(
           acl_table.c.parent_id.in_(acl_ids),
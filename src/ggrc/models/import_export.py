@@ -43,6 +43,7 @@ class ImportExport(Identifiable, db.Model):
   ]
 
   DEFAULT_COLUMNS = ['id', 'title', 'created_at', 'status']
+  HIDDEN_COLUMNS = ('content', 'gdrive_metadata', 'storage_key')
 
   job_type = db.Column(db.Enum(IMPORT_JOB_TYPE, EXPORT_JOB_TYPE),
                        nullable=False)
@@ -61,6 +62,10 @@ class ImportExport(Identifiable, db.Model):
   title = db.Column(db.Text)
   content = db.Column(mysql.LONGTEXT)
   gdrive_metadata = db.Column('gdrive_metadata', db.Text)
+  # Key of the content in the blob store, content column is not used if set
+  storage_key = db.Column(db.String(250))
+  rows_written = db.Column(db.Integer)
+  rows_total = db.Column(db.Integer)
 
   def log_json(self, is_default=False):
     """JSON representation"""
@@ -68,7 +73,7 @@ class ImportExport(Identifiable, db.Model):
       columns = self.DEFAULT_COLUMNS
     else:
       columns = (column.name for column in self.__table__.columns
-                 if column.name not in ('content', 'gdrive_metadata'))
+                 if column.name not in self.HIDDEN_COLUMNS)
 
     res = {}
     for column in columns:
@@ -0,0 +1,25 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Snapshot watermark model."""
+
+from ggrc import db
+from ggrc.models.mixins.base import Identifiable
+
+
+class SnapshotWatermark(Identifiable, db.Model):
+  """Highest revision id considered by the last update of parent snapshots.
+
+  Watermarks are maintained by ggrc.snapshotter.watermarks.
+  """
+  # pylint: disable=too-few-public-methods
+  __tablename__ = "snapshot_watermarks"
+
+  parent_type = db.Column(db.String, nullable=False)
+  parent_id = db.Column(db.Integer, nullable=False)
+  revision_id = db.Column(db.Integer, nullable=False)
+
+  _extra_table_args = [
+      db.UniqueConstraint("parent_type", "parent_id",
+                          name="uq_snapshot_watermarks_parent"),
+  ]
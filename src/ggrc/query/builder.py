@@ -10,8 +10,6 @@ This class is used to build SqlAlchemy queries and fetch the result ids.
 import collections
 import datetime
 
-import sqlalchemy as sa
-
 from ggrc import db
 from ggrc import models
 from ggrc.models import inflector
@@ -19,6 +17,7 @@ from ggrc.utils import benchmark
 from ggrc.rbac import permissions
 from ggrc.query import custom_operators
 from ggrc.query import pagination
+from ggrc.query import result_cache
 from ggrc.query.exceptions import BadQueryException
 
 
@@ -43,6 +42,12 @@ class QueryHelper(object):
         }
       ]
       limit: [from, to] - limit the result list to a slice result[from, to]
+      cursor: optional; if present, keyset pagination is used instead of
+              OFFSET: the page of size (to - from) starts right after the
+              position encoded in the cursor. Use an empty cursor to get the
+              first page and "next_cursor" of the result for the next ones.
+      count_total: optional; if False, "total" is not calculated; defaults
+                   to False for cursor queries and to True otherwise.
       filters: {
         relevant_filters:
           these filters will return all ids of the "search class name" object
@@ -72,6 +77,9 @@ class QueryHelper(object):
       object_name: search class name,
       (all other object query fields)
       ids: [ list of filtered objects ids ]
+      total: the number of objects filtered, before "limit" is applied
+      next_cursor: the cursor for the next page or None for the last page
+                   (present only for cursor queries)
     }
   ]
 
@@ -82,6 +90,8 @@ class QueryHelper(object):
 
   def __init__(self, query):
     self.query = self._clean_query(query)
+    # permission filters are shared by all object queries for the same model
+    self._type_queries = {}
 
   def _get_snapshot_child_type(self, object_query):
     """Return child_type for snapshot from a query"""
@@ -227,7 +237,15 @@ class QueryHelper(object):
     if contexts is None:
       return None
 
-    return model.id.in_(resources) if resources else sa.sql.false()
+    return permissions.get_resources_filter(
+        model.id, model.__name__, permission_type, resources)
+
+  def _get_cached_type_query(self, model, permission_type):
+    """Get permission filter for the model computed once per helper."""
+    key = (model.__name__, permission_type)
+    if key not in self._type_queries:
+      self._type_queries[key] = self._get_type_query(model, permission_type)
+    return self._type_queries[key]
 
   def _get_objects(self, object_query):
     """Get a set of objects described in the filters."""
@@ -251,13 +269,48 @@ class QueryHelper(object):
     return objects
 
   def _get_ids(self, object_query):
-    """Get a set of ids of objects described in the filters."""
+    """Get a set of ids of objects described in the filters.
+
+    Results are taken from the query result cache if it is enabled.
+    """
+    if object_query.get("filters", {}).get("expression") is None:
+      return set()
+    cache = result_cache.get_result_cache()
+    if cache is None:
+      return self._query_ids(object_query)
+
+    child_type = None
+    if object_query["object_name"] == "Snapshot":
+      child_type = self._get_snapshot_child_type(object_query)
+    with benchmark("Get cached ids: _get_ids > get_cache_key"):
+      dependencies = result_cache.get_dependencies(object_query, self.query,
+                                                   child_type)
+      key = result_cache.get_cache_key(
+          object_query,
+          self.query,
+          cache.get_generations(dependencies),
+      )
+      cached = cache.get(key)
+    if cached is not None:
+      object_query.update(cached["fields"])
+      return cached["ids"]
+
+    ids = self._query_ids(object_query)
+    cache.set(key, {
+        "ids": ids,
+        "fields": {
+            field: object_query[field]
+            for field in ("total", "next_cursor") if field in object_query
+        },
+    })
+    return ids
+
+  def _query_ids(self, object_query):
+    """Get a set of ids of objects described in the filters from the db."""
 
     object_name = object_query["object_name"]
     expression = object_query.get("filters", {}).get("expression")
 
-    if expression is None:
-      return set()
     object_class = inflector.get_model(object_name)
     query = db.session.query(object_class.id)
 
@@ -268,7 +321,8 @@ class QueryHelper(object):
 
     requested_permissions = object_query.get("permissions", "read")
     with benchmark("Get permissions: _get_ids > _get_type_query"):
-      type_query = self._get_type_query(object_class, requested_permissions)
+      type_query = self._get_cached_type_query(object_class,
+                                               requested_permissions)
       if type_query is not None:
         query = query.filter(type_query)
     with benchmark("Parse filter query: _get_ids > _build_expression"):
@@ -280,6 +334,9 @@ class QueryHelper(object):
       )
       if filter_expression is not None:
         query = query.filter(filter_expression)
+    if "cursor" in object_query:
+      return self._get_keyset_page_ids(object_query, query, object_class,
+                                       tgt_class)
     if object_query.get("order_by"):
       with benchmark("Sorting: _get_ids > order_by"):
         query = pagination.apply_order_by(
@@ -292,13 +349,33 @@ class QueryHelper(object):
       limit = object_query.get("limit")
       if limit:
         limit_query = pagination.apply_limit(query, limit)
-        total = pagination.get_total_count(query)
         ids = [obj.id for obj in limit_query]
+        if object_query.get("count_total", True):
+          object_query["total"] = pagination.get_total_count(query)
       else:
         ids = [obj.id for obj in query]
-        total = len(ids)
-      object_query["total"] = total
+        object_query["total"] = len(ids)
+
+    return ids
 
+  @staticmethod
+  def _get_keyset_page_ids(object_query, query, object_class, tgt_class):
+    """Get ids of objects on a page defined by the query cursor."""
+    limit = object_query.get("limit")
+    if not limit:
+      raise BadQueryException("Cursor pagination requires limit.")
+    if object_query.get("count_total", False):
+      object_query["total"] = pagination.get_total_count(query)
+    with benchmark("Apply keyset: _get_ids > apply_keyset"):
+      ids, next_cursor = pagination.apply_keyset(
+          object_class,
+          query,
+          object_query.get("order_by"),
+          tgt_class,
+          limit,
+          object_query["cursor"],
+      )
+    object_query["next_cursor"] = next_cursor
     return ids
 
   @staticmethod
@@ -14,6 +14,7 @@ from sqlalchemy.orm import load_only
 from ggrc import db
 from ggrc.models import all_models
 from ggrc.access_control.list import AccessControlList
+from ggrc.fulltext import get_indexer
 from ggrc.fulltext.mysql import MysqlRecordProperty as Record
 from ggrc.models import inflector
 from ggrc.models import relationship_helper
@@ -199,7 +200,7 @@ def text_search(exp, object_class, target_class, query):
       db.session.query(Record.key).filter(
           Record.type == object_class.__name__,
           Record.subproperty != '__sort__',
-          Record.content.ilike(u"%{}%".format(exp['text'])),
+          get_indexer().content_filter(exp['text'], ilike=True),
       ),
   )
 
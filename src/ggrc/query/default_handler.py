@@ -3,6 +3,8 @@
 
 """This module contains special query helper class for query API."""
 
+import collections
+
 from ggrc.builder import json
 from ggrc.query.builder import QueryHelper
 from ggrc.models import inflector
@@ -40,42 +42,86 @@ class DefaultHandler(QueryHelper):
     Updates self.query items with their results. The type of results required
     is read from "type" parameter of every object_query in self.query.
 
+    Ids of all object queries are resolved first. Then objects for all
+    "values" queries with the same object_name are loaded and published in
+    one batch and each query gets its own slice of them.
+
     Returns:
       list of dicts: same query as the input with requested results that match
                      the filter.
     """
+    values_ids = []
     for object_query in self.query:
       query_type = object_query.get("type", "values")
       if query_type not in {"values", "ids", "count"}:
         raise NotImplementedError("Only 'values', 'ids' and 'count' queries "
                                   "are supported now")
-      model = inflector.get_model(object_query["object_name"])
+      with benchmark("Get result set: get_results -> _get_ids"):
+        ids = self._get_ids(object_query)
+      object_query["count"] = len(ids)
       if query_type == "values":
-        with benchmark("Get result set: get_results > _get_objects"):
-          objects = self._get_objects(object_query)
-        object_query["count"] = len(objects)
-        with benchmark("get_results > _get_last_modified"):
-          object_query["last_modified"] = self._get_last_modified(model,
-                                                                  objects)
-        with benchmark("serialization: get_results > _transform_to_json"):
-          object_query["values"] = self._transform_to_json(
-              objects,
-              object_query.get("fields"),
-          )
+        values_ids.append((object_query, ids))
       else:
-        with benchmark("Get result set: get_results -> _get_ids"):
-          ids = self._get_ids(object_query)
-        object_query["count"] = len(ids)
         object_query["last_modified"] = None  # synonymous to now()
         if query_type == "ids":
           object_query["ids"] = ids
+
+    with benchmark("Get result set: get_results > _get_published_objects"):
+      published = self._get_published_objects(values_ids)
+    for object_query, ids in values_ids:
+      object_name = object_query["object_name"]
+      model = inflector.get_model(object_name)
+      objects, objects_json = [], []
+      for id_ in ids:
+        if id_ in published[object_name]:
+          obj, obj_json = published[object_name][id_]
+          objects.append(obj)
+          objects_json.append(obj_json)
+      object_query["count"] = len(objects)
+      with benchmark("get_results > _get_last_modified"):
+        object_query["last_modified"] = self._get_last_modified(model,
+                                                                objects)
+      with benchmark("serialization: get_results > _filter_fields"):
+        object_query["values"] = self._filter_fields(
+            objects_json,
+            object_query.get("fields"),
+        )
     return self.query
 
   @staticmethod
-  def _transform_to_json(objects, fields=None):
-    """Make a JSON representation of objects from the list."""
-    objects_json = [json.publish(obj) for obj in objects]
-    objects_json = json.publish_representation(objects_json)
+  def _get_published_objects(values_ids):
+    """Load and publish objects requested by all "values" queries.
+
+    Args:
+      values_ids: list of (object_query, ids) pairs.
+
+    Returns:
+      dict {object_name: {id: (object, published object)}} with every
+      object loaded with one eager query per object_name.
+    """
+    ids_by_name = collections.defaultdict(set)
+    for object_query, ids in values_ids:
+      ids_by_name[object_query["object_name"]].update(ids)
+
+    published = collections.defaultdict(dict)
+    for object_name, ids in ids_by_name.iteritems():
+      if not ids:
+        continue
+      model = inflector.get_model(object_name)
+      with benchmark("Get objects by ids: _get_published_objects"):
+        objects = model.eager_query().filter(model.id.in_(ids)).all()
+      with benchmark("serialization: _get_published_objects > publish"):
+        objects_json = [json.publish(obj) for obj in objects]
+        objects_json = json.publish_representation(objects_json)
+      published[object_name] = {
+          obj.id: (obj, obj_json)
+          for obj, obj_json in zip(objects, objects_json)
+      }
+    return published
+
+  @staticmethod
+  def _filter_fields(objects_json, fields=None):
+    """Leave only requested fields in published objects."""
     if fields:
       objects_json = [{f: o.get(f) for f in fields}
                       for o in objects_json]
@@ -3,6 +3,10 @@
 
 """Pagination helpers module for query generation."""
 
+import base64
+import datetime
+import json
+
 import sqlalchemy as sa
 
 from ggrc import models
@@ -13,6 +17,10 @@ from ggrc.query.exceptions import BadQueryException
 from ggrc.utils import benchmark
 
 
+_CURSOR_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+_CURSOR_DATE_FORMAT = "%Y-%m-%d"
+
+
 def _get_limit(limit):
   """Get limit parameters for sqlalchemy."""
   try:
@@ -70,9 +78,10 @@ def _joins_and_order(counter, clause, model, tgt_class):
 
   Returns:
     ([joins], order) - a tuple of joins required for this ordering to work
-                        and ordering clause itself; join is None if no join
-                        required or [(aliased entity, relationship field)]
-                        if joins required.
+                        and ordered column itself (without direction); join
+                        is None if no join required or
+                        [(aliased entity, relationship field)] if joins
+                        required.
   """
 
   def by_fulltext():
@@ -116,12 +125,28 @@ def _joins_and_order(counter, clause, model, tgt_class):
     # Snapshot or non object attributes are treated as custom attributes
     joins, order = by_fulltext()
 
-  if clause.get("desc", False):
-    order = order.desc()
-
   return joins, order
 
 
+def _apply_order_joins(model, query, order_by, tgt_class):
+  """Add joins needed for ordering to a query.
+
+  Returns:
+    (query, [(column, desc)]) - the query with joins required for sorting and
+                                list of ordered columns with their directions.
+  """
+  join_pairs = [
+      _joins_and_order(counter, clause, model, tgt_class)
+      for counter, clause in enumerate(order_by)
+  ]
+  join_lists, columns = zip(*join_pairs)
+  join_lists = [join_list for join_list in join_lists if join_list is not None]
+  for join_list in join_lists:
+    query = query.outerjoin(*join_list)
+  directions = [bool(clause.get("desc", False)) for clause in order_by]
+  return query, list(zip(columns, directions))
+
+
 def apply_order_by(model, query, order_by, tgt_class):
   """Add ordering parameters to a query for objects.
 
@@ -146,13 +171,132 @@ def apply_order_by(model, query, order_by, tgt_class):
     the query with sorting parameters.
   """
 
-  join_pairs = [
-      _joins_and_order(counter, clause, model, tgt_class)
-      for counter, clause in enumerate(order_by)
-  ]
-  join_lists, orders = zip(*join_pairs)
-  join_lists = [join_list for join_list in join_lists if join_list is not None]
-  for join_list in join_lists:
-    query = query.outerjoin(*join_list)
+  query, orders = _apply_order_joins(model, query, order_by, tgt_class)
+  return query.order_by(*[
+      column.desc() if desc else column for column, desc in orders
+  ])
+
+
+def encode_cursor(values):
+  """Encode values of the last row of a page into an opaque cursor."""
+  def encode_value(value):
+    """Tag date values to restore their type on decoding."""
+    if isinstance(value, datetime.datetime):
+      return {"datetime": value.strftime(_CURSOR_DATETIME_FORMAT)}
+    if isinstance(value, datetime.date):
+      return {"date": value.strftime(_CURSOR_DATE_FORMAT)}
+    return value
+
+  data = json.dumps([encode_value(value) for value in values])
+  return base64.urlsafe_b64encode(data)
+
+
+def decode_cursor(cursor):
+  """Decode values of the last row of a page from an opaque cursor."""
+  def decode_value(value):
+    """Restore tagged date values."""
+    if isinstance(value, dict):
+      if "datetime" in value:
+        return datetime.datetime.strptime(value["datetime"],
+                                          _CURSOR_DATETIME_FORMAT)
+      if "date" in value:
+        return datetime.datetime.strptime(value["date"],
+                                          _CURSOR_DATE_FORMAT).date()
+    return value
+
+  try:
+    values = json.loads(base64.urlsafe_b64decode(str(cursor)))
+  except (TypeError, ValueError):
+    raise BadQueryException("Invalid cursor.")
+  if not isinstance(values, list):
+    raise BadQueryException("Invalid cursor.")
+  return [decode_value(value) for value in values]
+
+
+def _after_clause(column, value, desc):
+  """Get condition for rows placed strictly after value in given order.
+
+  MySQL places NULL values before any other value in ascending order and
+  after them in descending order.
+  """
+  if desc:
+    if value is None:
+      return sa.sql.false()
+    return sa.or_(column < value, column.is_(None))
+  if value is None:
+    return column.isnot(None)
+  return column > value
+
+
+def _equal_clause(column, value):
+  """Get NULL-safe equality condition."""
+  if value is None:
+    return column.is_(None)
+  return column == value
+
+
+def _get_seek_clause(orders, values):
+  """Get condition selecting rows after the row with the given values.
 
-  return query.order_by(*orders)
+  For ordering (a, b, id) and last row values (x, y, z) the condition is
+  a > x OR (a = x AND b > y) OR (a = x AND b = y AND id > z) with
+  comparison directions taken from the ordering.
+  """
+  alternatives = []
+  equalities = []
+  for (column, desc), value in zip(orders, values):
+    alternatives.append(
+        sa.and_(*(equalities + [_after_clause(column, value, desc)]))
+    )
+    equalities.append(_equal_clause(column, value))
+  return sa.or_(*alternatives)
+
+
+def apply_keyset(model, query, order_by, tgt_class, limit, cursor=None):
+  """Apply ordering and keyset (seek) pagination to a query.
+
+  Instead of skipping rows with OFFSET the page is selected with a condition
+  on the values of ordered columns of the last row of the previous page, so
+  the cost of getting a page does not depend on its position. Object id is
+  always added as the last ordered column to make the ordering total.
+
+  Args:
+    model: the model instances of which are requested in query;
+    query: a query to get object ids from the db;
+    order_by: a list of dicts with keys "name" and "desc" (optional);
+    tgt_class: the snapshotted model if `model` is Snapshot else `model`;
+    limit: a tuple of indexes in format (from, to); only the page size
+           (to - from) is used, the page position is defined by cursor;
+    cursor: an opaque token returned for the previous page or None to get
+            the first page.
+
+  Returns:
+    (ids, next_cursor) - a list of object ids on the page and a cursor for
+                         the next page or None if this page is the last one.
+  """
+  page_size, _ = _get_limit(limit)
+  orders = []
+  if order_by:
+    query, orders = _apply_order_joins(model, query, order_by, tgt_class)
+  orders.append((model.id, False))
+  columns = [column for column, _desc in orders]
+  query = query.add_columns(*columns[:-1]).order_by(*[
+      column.desc() if desc else column for column, desc in orders
+  ])
+
+  if cursor:
+    values = decode_cursor(cursor)
+    if len(values) != len(orders):
+      raise BadQueryException("Cursor does not match order_by.")
+    query = query.filter(_get_seek_clause(orders, values))
+
+  with benchmark("Apply limit: apply_keyset > query_limit"):
+    # One extra row shows whether the next page exists.
+    rows = query.limit(page_size + 1).all()
+
+  next_cursor = None
+  if len(rows) > page_size:
+    rows = rows[:page_size]
+    last_row = rows[-1]
+    next_cursor = encode_cursor(list(last_row[1:]) + [last_row[0]])
+  return [row[0] for row in rows], next_cursor
@@ -0,0 +1,311 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Per-user cache for ids returned by object queries of the query API.
+
+Cached results are keyed by a hash of the normalized object query, the
+current user and generation counters of all models the query depends on.
+Every commit bumps generation counters of the models changed in it, which
+makes all cached results that depend on those models unreachable without
+scanning the cache. Models are collected from ORM flushes and from target
+tables of Core and text INSERT, UPDATE and DELETE statements, code writing
+fulltext records marks the indexed models explicitly. Stale entries are
+evicted by LRU policy (local backend) or by memcache itself.
+"""
+
+import collections
+import hashlib
+import itertools
+import json
+import re
+import threading
+import time
+
+import flask
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.expression import TextClause
+from sqlalchemy.sql.expression import UpdateBase
+
+from ggrc import settings
+from ggrc.login import get_current_user_id
+
+
+# Models that can change the result of any object query: mappings,
+# permissions and custom attribute values.
+ALWAYS_DEPENDS_ON = frozenset([
+    "AccessControlList",
+    "AccessControlRole",
+    "CustomAttributeValue",
+    "Relationship",
+    "UserRole",
+])
+
+KEY_PREFIX = "query_result:"
+GENERATION_PREFIX = "query_result_generation:"
+
+# Target table of INSERT, UPDATE and DELETE statements written as text.
+WRITE_STATEMENT_RE = re.compile(
+    r"^\s*(?:INSERT\s+(?:IGNORE\s+)?INTO|UPDATE(?:\s+IGNORE)?|DELETE\s+FROM)"
+    r"\s+`?(\w+)`?",
+    re.IGNORECASE,
+)
+
+
+class LocalResultCache(object):
+  """In-process LRU cache for query results.
+
+  Attributes:
+    max_entries: number of results kept in the cache.
+    expiry: lifetime of a cached result in seconds.
+  """
+
+  def __init__(self, max_entries, expiry):
+    self.max_entries = max_entries
+    self.expiry = expiry
+    self._entries = collections.OrderedDict()
+    self._generations = collections.defaultdict(int)
+    self._lock = threading.Lock()
+
+  def get_generations(self, names):
+    with self._lock:
+      return {name: self._generations[name] for name in names}
+
+  def bump_generations(self, names):
+    with self._lock:
+      for name in names:
+        self._generations[name] += 1
+
+  def get(self, key):
+    """Get cached value and mark it as the most recently used one."""
+    with self._lock:
+      entry = self._entries.pop(key, None)
+      if entry is None:
+        return None
+      expires_at, value = entry
+      if expires_at < time.time():
+        return None
+      self._entries[key] = entry
+      return value
+
+  def set(self, key, value):
+    """Store value evicting the least recently used ones over the limit."""
+    with self._lock:
+      self._entries.pop(key, None)
+      self._entries[key] = (time.time() + self.expiry, value)
+      while len(self._entries) > self.max_entries:
+        self._entries.popitem(last=False)
+
+  def clear(self):
+    with self._lock:
+      self._entries.clear()
+      self._generations.clear()
+
+
+class MemcacheResultCache(object):
+  """Query result cache shared between instances through the shared cache.
+
+  Memory limits and LRU eviction are handled by the configured cache backend
+  (memcache or redis).
+  """
+
+  def __init__(self, expiry):
+    # Imported here to keep this module importable from models and fulltext
+    from ggrc.cache import utils as cache_utils
+    self.expiry = expiry
+    self.memcache_client = cache_utils.get_cache_backend().memcache_client
+
+  def get_generations(self, names):
+    generations = self.memcache_client.get_multi(
+        list(names), key_prefix=GENERATION_PREFIX)
+    return {name: generations.get(name, 0) for name in names}
+
+  def bump_generations(self, names):
+    self.memcache_client.offset_multi(
+        {name: 1 for name in names},
+        key_prefix=GENERATION_PREFIX,
+        initial_value=0,
+    )
+
+  def get(self, key):
+    return self.memcache_client.get(key)
+
+  def set(self, key, value):
+    self.memcache_client.set(key, value, time=self.expiry)
+
+  def clear(self):
+    pass
+
+
+_local_cache = None
+
+
+def get_result_cache():
+  """Get query result cache backend configured in settings.
+
+  Returns:
+    cache backend instance or None if query result caching is disabled.
+  """
+  global _local_cache  # pylint: disable=global-statement,invalid-name
+  backend = getattr(settings, "QUERY_RESULT_CACHE", None)
+  expiry = getattr(settings, "QUERY_RESULT_CACHE_EXPIRY", 60)
+  if backend == "memcache":
+    return MemcacheResultCache(expiry)
+  if backend == "local":
+    if _local_cache is None:
+      _local_cache = LocalResultCache(
+          getattr(settings, "QUERY_RESULT_CACHE_SIZE", 1000), expiry)
+    return _local_cache
+  return None
+
+
+def _get_expression_models(expression):
+  """Get names of all objects referenced in a filter expression."""
+  if not isinstance(expression, dict):
+    return set()
+  names = set()
+  object_name = expression.get("object_name")
+  if isinstance(object_name, basestring):
+    names.add(object_name)
+  names.update(_get_expression_models(expression.get("left")))
+  names.update(_get_expression_models(expression.get("right")))
+  return names
+
+
+def _get_batch_dependency(object_query, query):
+  """Get queries the object query can refer to with __previous__ filters."""
+  expression = object_query.get("filters", {}).get("expression")
+  if "__previous__" not in _get_expression_models(expression):
+    return []
+  return [
+      (other.get("object_name"), other.get("filters"))
+      for other in query
+      if other is not object_query
+  ]
+
+
+def get_dependencies(object_query, query, child_type=None):
+  """Get names of models whose changes can affect the object query result.
+
+  Args:
+    object_query: the object query dict.
+    query: the list of all object queries of the request.
+    child_type: child type for Snapshot queries.
+  """
+  dependencies = set(ALWAYS_DEPENDS_ON)
+  dependencies.add(object_query["object_name"])
+  if child_type:
+    dependencies.add(child_type)
+  dependencies.update(_get_expression_models(
+      object_query.get("filters", {}).get("expression")))
+  for object_name, filters in _get_batch_dependency(object_query, query):
+    dependencies.add(object_name)
+    dependencies.update(_get_expression_models(
+        (filters or {}).get("expression")))
+  dependencies.discard("__previous__")
+  return sorted(dependencies)
+
+
+def get_cache_key(object_query, query, generations):
+  """Get canonical hash of the object query for the current user."""
+  data = {
+      "user_id": get_current_user_id(),
+      "object_name": object_query["object_name"],
+      "filters": object_query.get("filters"),
+      "permissions": object_query.get("permissions", "read"),
+      "order_by": object_query.get("order_by"),
+      "limit": object_query.get("limit"),
+      "cursor": object_query.get("cursor"),
+      "count_total": object_query.get("count_total"),
+      "batch": _get_batch_dependency(object_query, query),
+      "generations": generations,
+  }
+  canonical = json.dumps(data, sort_keys=True, default=str)
+  return KEY_PREFIX + hashlib.sha1(canonical).hexdigest()
+
+
+def _get_modified_models():
+  """Get set of model names modified in current transaction."""
+  if not hasattr(flask.g, "query_cache_modified_models"):
+    flask.g.query_cache_modified_models = set()
+  return flask.g.query_cache_modified_models
+
+
+def mark_modified(names):
+  """Invalidate results depending on the models after the next commit.
+
+  Args:
+    names: names of models changed outside of ORM flushes and table writes,
+      e.g. models of written fulltext records.
+  """
+  if flask.has_app_context():
+    _get_modified_models().update(names)
+
+
+_table_models = None
+
+
+def _get_table_models():
+  """Get dict of table names and sets of names of models stored in them."""
+  global _table_models  # pylint: disable=global-statement,invalid-name
+  if _table_models is None:
+    from ggrc.models import all_models
+    _table_models = collections.defaultdict(set)
+    for model in all_models.all_models:
+      tablename = getattr(model, "__tablename__", None)
+      if tablename:
+        _table_models[tablename].add(model.__name__)
+  return _table_models
+
+
+def get_written_table(statement):
+  """Get name of the table changed by the statement or None."""
+  if isinstance(statement, UpdateBase):
+    return getattr(statement.table, "name", None)
+  if isinstance(statement, TextClause):
+    statement = statement.text
+  if not isinstance(statement, basestring):
+    return None
+  match = WRITE_STATEMENT_RE.match(statement)
+  return match.group(1) if match else None
+
+
+def after_execute(conn, statement, *_):
+  """Collect names of models stored in the table changed by the statement."""
+  del conn  # Unused
+  table = get_written_table(statement)
+  if table is None or not flask.has_app_context():
+    return
+  models = _get_table_models().get(table)
+  if models:
+    _get_modified_models().update(models)
+
+
+def after_flush(session, _):
+  """Collect names of models modified in the flush."""
+  if not flask.has_app_context():
+    return
+  modified = _get_modified_models()
+  for obj in itertools.chain(session.new, session.dirty, session.deleted):
+    modified.add(obj.__class__.__name__)
+
+
+def after_commit(_):
+  """Invalidate cached results depending on models modified in commit."""
+  if not flask.has_app_context():
+    return
+  modified = _get_modified_models()
+  if not modified:
+    return
+  cache = get_result_cache()
+  if cache is not None:
+    cache.bump_generations(modified)
+  modified.clear()
+
+
+def register_result_cache_listeners():
+  """Register session listeners invalidating cached query results."""
+  event.listen(Session, "after_flush", after_flush)
+  event.listen(Session, "after_commit", after_commit)
+  event.listen(Engine, "after_execute", after_execute)
@@ -5,7 +5,9 @@
 
 from flask import g
 from flask.ext.login import current_user
+import sqlalchemy as sa
 
+from ggrc import db
 from ggrc import login
 from ggrc.extensions import get_extension_instance
 from ggrc.rbac import SystemWideRoles
@@ -179,3 +181,87 @@ def get_context_resource(model_name, permission_type='read'):
   resources = permissions_map[permission_type][1](model_name)
 
   return contexts, resources
+
+
+# Resource lists longer than this are filtered with a subquery so the size of
+# the SQL statement doesn't depend on the number of resources.
+RESOURCES_IN_LIST_LIMIT = 1000
+
+
+def _get_resources_query(model_name, permission_type):
+  """Get query selecting ids of resources the user has permission for.
+
+  Returns:
+    query or None if the permissions provider can't select resources with
+    a query.
+  """
+  user_permissions = permissions_for(get_user())
+  resources_query_for = getattr(user_permissions, "resources_query_for", None)
+  if resources_query_for is None:
+    return None
+  return resources_query_for(permission_type, model_name)
+
+
+# Key of session info with the transaction and the number of temporary
+# resource tables used in it.
+TMP_RESOURCES_KEY = "tmp_resources"
+
+
+def _get_tmp_resources_table():
+  """Get temporary table not used yet in the current transaction.
+
+  MySQL can't refer to a temporary table twice in one statement, so every
+  materialized resources list of a transaction gets its own table. Tables
+  are numbered from zero in every transaction, so a connection keeps only
+  as many tables as a single transaction has used.
+  """
+  session = db.session()
+  used = session.info.get(TMP_RESOURCES_KEY)
+  if used is None or used[0] is not session.transaction:
+    used = [session.transaction, 0]
+    session.info[TMP_RESOURCES_KEY] = used
+  index = used[1]
+  used[1] += 1
+  return sa.Table(
+      "tmp_resources_{}".format(index),
+      sa.MetaData(),
+      sa.Column("id", sa.Integer, primary_key=True),
+      prefixes=["TEMPORARY"],
+  )
+
+
+def _materialize_resources(resources):
+  """Store resource ids in a temporary table of the current connection.
+
+  The table is reused by subsequent transactions handled with the same
+  connection, so it is emptied before it is filled.
+  """
+  table = _get_tmp_resources_table()
+  connection = db.session.connection()
+  table.create(connection, checkfirst=True)
+  connection.execute(table.delete())
+  connection.execute(table.insert(), [{"id": id_} for id_ in set(resources)])
+  return sa.select([table.c.id])
+
+
+def get_resources_filter(column, model_name, permission_type, resources):
+  """Get filter of column values by resources the user has permission for.
+
+  Short lists of resources are rendered inline. Longer ones are replaced
+  with a semi-join against the access control list of the current user or,
+  if the permissions provider doesn't support that, with a temporary table.
+
+  Args:
+    column: column containing resource ids.
+    model_name: name of the resource model.
+    permission_type: read, update or delete.
+    resources: ids of the resources the user has permission for.
+  """
+  if not resources:
+    return sa.false()
+  if len(resources) <= RESOURCES_IN_LIST_LIMIT:
+    return column.in_(resources)
+  query = _get_resources_query(model_name, permission_type)
+  if query is None:
+    return column.in_(_materialize_resources(resources))
+  return column.in_(query.subquery())
@@ -29,6 +29,7 @@ from werkzeug.exceptions import BadRequest, Forbidden
 
 import ggrc.builder.json
 import ggrc.models
+from ggrc.builder import compiled as compiled_builder
 from ggrc import db
 from ggrc import gdrive
 from ggrc import utils
@@ -81,7 +82,9 @@ def inclusion_filter(obj):
 
 
 def get_modified_objects(session):
+  from ggrc import automapper
   session.flush()
+  automapper.automap(session)
   cache = Cache.get_cache()
   if cache:
     return cache.copy()
@@ -245,10 +248,8 @@ class ModelView(View):
       contexts = permissions.read_contexts_for(self.model.__name__)
       resources = permissions.read_resources_for(self.model.__name__)
       if contexts is not None:
-        if resources:
-          query = query.filter(self.model.id.in_(resources))
-        else:
-          query = query.filter(sa.false())
+        query = query.filter(permissions.get_resources_filter(
+            self.model.id, self.model.__name__, "read", resources))
 
       for j in joinlist:
         j_class = j.property.mapper.class_
@@ -414,6 +415,10 @@ class Resource(ModelView):
   By default will only support the `application/json` content-type.
   """
 
+  # Number of collection members fetched and encoded at once for streamed
+  # collection responses.
+  STREAM_CHUNK_SIZE = 500
+
   def dispatch_request(self, *args, **kwargs):  # noqa
     with benchmark("Dispatch request"):
       with benchmark("dispatch_request > Check Headers"):
@@ -696,6 +701,9 @@ class Resource(ModelView):
   def has_cache():
     return getattr(settings, 'MEMCACHE_MECHANISM', False)
 
+  def has_collection_cache(self):
+    return self.has_cache() and getattr(settings, 'COLLECTION_CACHE', False)
+
   def apply_paging(self, matches_query):
     page_size = min(
         int(request.args.get('__page_size', self.DEFAULT_PAGE_SIZE)),
@@ -723,7 +731,7 @@ class Resource(ModelView):
 
   def get_matched_resources(self, matches):
     cache_objs = {}
-    if self.has_cache():
+    if self.has_collection_cache():
       self.request.cache_manager = cache_utils.get_cache_manager()
       with benchmark("Query cache for resources"):
         cache_objs = self.get_resources_from_cache(matches)
@@ -733,8 +741,8 @@ class Resource(ModelView):
 
     database_objs = {}
     if database_matches:
-      database_objs = self.get_resources_from_database(matches)
-      if self.has_cache():
+      database_objs = self.get_resources_from_database(database_matches)
+      if self.has_collection_cache():
         with benchmark("Add resources to cache"):
           self.add_resources_to_cache(database_objs)
     return cache_objs, database_objs
@@ -760,6 +768,9 @@ class Resource(ModelView):
       )
       matches_query = self.get_collection_matches(
           self.model, filter_by_contexts)
+    if self.use_streaming():
+      with benchmark("dispatch_request > collection_get > Stream response"):
+        return self.stream_collection_response(matches_query)
     with benchmark("dispatch_request > collection_get > Query Data"):
       if '__page' in request.args or '__page_only' in request.args:
         with benchmark("Query matches with paging"):
@@ -769,33 +780,8 @@ class Resource(ModelView):
           matches = matches_query.all()
           extras = {}
     with benchmark("dispatch_request > collection_get > Matched resources"):
-      cache_op = None
-      if '__stubs_only' in request.args:
-        objs = [{
-            'id': m[0],
-            'type': m[1],
-            'href': utils.url_for(m[1], id=m[0]),
-            'context_id': m[2]
-        } for m in matches]
-
-      else:
-        cache_objs, database_objs = self.get_matched_resources(matches)
-        objs = {}
-        objs.update(cache_objs)
-        objs.update(database_objs)
-
-        objs = [objs[m] for m in matches if m in objs]
-        with benchmark("Filter resources based on permissions"):
-          objs = filter_resource(objs)
-
-        cache_op = 'Hit' if cache_objs else 'Miss'
+      objs, cache_op = self.get_collection_objects(matches)
     with benchmark("dispatch_request > collection_get > Create Response"):
-      # Return custom fields specified via `__fields=id,title,description` etc.
-      # TODO this can be optimized by filter_resource() not retrieving
-      # the other fields to being with
-      if '__fields' in request.args:
-        custom_fields = request.args['__fields'].split(',')
-        objs = [{f: o[f] for f in custom_fields if f in o} for o in objs]
       with benchmark("Serialize collection"):
         collection = self.build_collection_representation(
             objs, extras=extras)
@@ -809,6 +795,116 @@ class Resource(ModelView):
         return self.json_success_response(
             collection, self.collection_last_modified(), cache_op=cache_op)
 
+  def get_collection_objects(self, matches):
+    """Get readable JSON representations for collection matches.
+
+    Args:
+      matches: list of (id, type, context_id, ...) rows of collection query.
+
+    Returns:
+      tuple of the list of filtered objects in matches order and the cache
+      operation result ('Hit', 'Miss' or None if the cache was not used).
+    """
+    cache_op = None
+    if '__stubs_only' in request.args:
+      objs = [{
+          'id': m[0],
+          'type': m[1],
+          'href': utils.url_for(m[1], id=m[0]),
+          'context_id': m[2]
+      } for m in matches]
+
+    else:
+      cache_objs, database_objs = self.get_matched_resources(matches)
+      objs = {}
+      objs.update(cache_objs)
+      objs.update(database_objs)
+
+      objs = [objs[m] for m in matches if m in objs]
+      with benchmark("Filter resources based on permissions"):
+        objs = filter_resource(objs)
+
+      cache_op = 'Hit' if cache_objs else 'Miss'
+    # Return custom fields specified via `__fields=id,title,description` etc.
+    # TODO this can be optimized by filter_resource() not retrieving
+    # the other fields to being with
+    if '__fields' in request.args:
+      custom_fields = request.args['__fields'].split(',')
+      objs = [{f: o[f] for f in custom_fields if f in o} for o in objs]
+    return objs, cache_op
+
+  def use_streaming(self):
+    """Check if the collection should be sent as a streamed response.
+
+    Streaming is requested with `__stream` argument and it is not compatible
+    with paging, `__limit` and `__sort` arguments, as the whole filtered
+    collection is sent in chunks ordered by id.
+    """
+    return (
+        '__stream' in request.args and
+        not any(arg in request.args
+                for arg in ('__page', '__page_only', '__limit', '__sort'))
+    )
+
+  def generate_match_chunks(self, matches_query):
+    """Generate collection matches in chunks using keyset pagination.
+
+    Each chunk is fetched with `id > last_seen_id` condition instead of an
+    OFFSET, so the cost of a chunk does not depend on its position in the
+    collection.
+    """
+    pk_column = self.model._sa_class_manager.mapper.primary_key[0]
+    query = matches_query.order_by(None).order_by(pk_column)
+    last_id = None
+    while True:
+      chunk_query = query
+      if last_id is not None:
+        chunk_query = chunk_query.filter(pk_column > last_id)
+      matches = chunk_query.limit(self.STREAM_CHUNK_SIZE).all()
+      if not matches:
+        return
+      yield matches
+      if len(matches) < self.STREAM_CHUNK_SIZE:
+        return
+      last_id = matches[-1][0]
+
+  def stream_collection_response(self, matches_query):
+    """Make chunked response with collection encoded incrementally.
+
+    The response has the same structure as the one created with
+    `build_collection_representation` but the objects are fetched, published
+    and encoded chunk by chunk, so the memory used by the request does not
+    depend on the size of the collection.
+    """
+    table_plural = self.model._inflector.table_plural
+    collection_name = '{0}_collection'.format(table_plural)
+    prefix = '{{{0}: {{{1}: {2}, {3}: ['.format(
+        self.as_json(collection_name),
+        self.as_json('selfLink'),
+        self.as_json(self.url_for_preserving_querystring()),
+        self.as_json(table_plural),
+    )
+    suffix = ']}}'
+
+    def generate():
+      """Yield encoded collection parts."""
+      yield prefix
+      separator = ''
+      for matches in self.generate_match_chunks(matches_query):
+        with benchmark("Stream collection chunk"):
+          objs, _ = self.get_collection_objects(matches)
+          if objs:
+            yield separator + ','.join(self.as_json(obj) for obj in objs)
+            separator = ','
+      yield suffix
+
+    headers = [('Content-Type', 'application/json')]
+    last_modified = self.collection_last_modified()
+    if last_modified:
+      headers.append(('Last-Modified', self.http_timestamp(last_modified)))
+    return current_app.response_class(
+        flask.stream_with_context(generate()), 200, headers)
+
   def get_resources_from_cache(self, matches):
     """Get resources from cache for specified matches"""
     resources = {}
@@ -819,9 +915,13 @@ class Resource(ModelView):
       return resources
     # Skip right to memcache
     memcache_client = self.request.cache_manager.cache_object.memcache_client
-    for match in matches:
-      key = cache_utils.get_cache_key(None, id_=match[0], type_=match[1])
-      val = memcache_client.get(key)
+    keys = {
+        match: cache_utils.get_cache_key(None, id_=match[0], type_=match[1])
+        for match in matches
+    }
+    values = memcache_client.get_multi(keys.values())
+    for match, key in keys.items():
+      val = values.get(key)
       if val:
         val = json.loads(val)
       else:
@@ -831,15 +931,28 @@ class Resource(ModelView):
     return resources
 
   def add_resources_to_cache(self, match_obj_pairs):
-    """Add resources to cache if they are not blocked by DeleteOp entries"""
+    """Add resources to cache if they are not blocked by DeleteOp entries.
+
+    Entries expire after CACHE_EXPIRY_COLLECTION seconds, so an entry added
+    by a read that raced with an invalidating commit is not served longer.
+    """
     # Skip right to memcache
     cache_manager = self.request.cache_manager
     memcache_client = cache_manager.cache_object.memcache_client
-    for match, obj in match_obj_pairs.items():
-      if obj.__class__.__name__ in cache_manager.supported_classes:
-        memcache_client.add(
-            cache_utils.get_cache_key(None, id_=match[0], type_=match[1]),
-            as_json(obj))
+    objs = {
+        cache_utils.get_cache_key(None, id_=match[0], type_=match[1]): obj
+        for match, obj in match_obj_pairs.items()
+        if match[1] in cache_manager.supported_classes
+    }
+    if not objs:
+      return
+    pending_deletes = memcache_client.get_multi(objs.keys(),
+                                                key_prefix='DeleteOp:')
+    memcache_client.add_multi({
+        key: as_json(obj)
+        for key, obj in objs.iteritems()
+        if key not in pending_deletes
+    }, time=CACHE_EXPIRY_COLLECTION)
 
   def invalidate_cache_to(self, obj):
     """Invalidate api cache for sent object."""
@@ -1250,13 +1363,23 @@ class Resource(ModelView):
     # FIXME: This is cheating -- `matches` should be allowed to be any model
     model = self.model
     ids = {m[0]: m for m in matches}
+    includes = self.get_properties_to_include(request.args.get('__include'))
+    publisher = None
+    if getattr(settings, "COMPILED_PUBLISHERS", False) and not includes:
+      publisher = compiled_builder.get_compiled_publisher(model)
+    if publisher is not None:
+      with benchmark("Publish compiled objects"):
+        resources = {ids[id_]: json_obj for id_, json_obj
+                     in publisher.publish(ids.keys()).iteritems()}
+      with benchmark("Publish representation"):
+        ggrc.builder.json.publish_representation(resources)
+      return resources
     with benchmark("Query database for matches"):
       query = model.eager_query()
       # We force the query here so that we can benchmark it
       objs = query.filter(model.id.in_(ids.keys())).all()
     with benchmark("Publish objects"):
       resources = {}
-      includes = self.get_properties_to_include(request.args.get('__include'))
       for obj in objs:
         resources[ids[obj.id]] = ggrc.builder.json.publish(obj, includes)
     with benchmark("Publish representation"):
@@ -1,6 +1,7 @@
 # Copyright (C) 2018 Google Inc.
 # Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
 
+import collections
 import json
 
 from flask import request, current_app
@@ -24,6 +25,8 @@ def search():
   should_group_by_type = should_group_by_type.lower() == 'true'
   should_just_count = request.args.get('counts_only', '')
   should_just_count = should_just_count.lower() == 'true'
+  should_count_and_search = request.args.get('counts_and_results', '')
+  should_count_and_search = should_count_and_search.lower() == 'true'
 
   types = request.args.get('types', '')
   types = [t.strip() for t in types.split(',') if len(t.strip()) > 0]
@@ -58,6 +61,16 @@ def search():
     relevant_objects = [tuple(obj.split(':'))
                         for obj in relevant_objects.split(',')]
 
+  if should_count_and_search:
+    limit = request.args.get('limit')
+    if limit and not limit.isdigit():
+      raise BadRequest('Query parameter "limit" must be a non-negative '
+                       'integer.')
+    return do_counts_and_search(
+        terms, types, permission_type, contact_id, extra_params,
+        extra_columns, relevant_objects,
+        limit=int(limit) if limit else None,
+    )
   if should_just_count:
     return do_counts(terms, types, contact_id, extra_params, extra_columns)
   if should_group_by_type:
@@ -96,6 +109,56 @@ def do_counts(terms, types=None, contact_id=None,
   ))
 
 
+def do_counts_and_search(terms, types=None, permission_type='read',
+                         contact_id=None, extra_params=None,
+                         extra_columns=None, relevant_objects=None,
+                         limit=None):
+  """Get counts and first results of every type with a single search query.
+
+  Counts are the same as returned by do_counts and entries are the same as
+  returned by group_by_type_search limited to the first `limit` entries of
+  every type.
+  """
+  extra_params = extra_params or {}
+  indexer = get_indexer()
+  with benchmark("Counts and search"):
+    rows = indexer.search_with_counts(
+        terms, types=types, permission_type=permission_type,
+        contact_id=contact_id, extra_params=extra_params,
+        extra_columns=extra_columns,
+    )
+
+  related_filter = _build_relevant_filter(types, relevant_objects)
+  counts = collections.defaultdict(int)
+  entries = {}
+  for label, model_type, id_ in rows:
+    counts[label or model_type] += 1
+    if label and label not in extra_params:
+      continue
+    if types is not None and model_type not in types:
+      continue
+    entries_list = entries.setdefault(model_type, [])
+    if limit is not None and len(entries_list) >= limit:
+      continue
+    if related_filter((model_type, id_)):
+      entries_list.append({
+          'id': id_,
+          'type': model_type,
+          'href': url_for(model_type, id=id_),
+      })
+  return current_app.make_response((
+      json.dumps({
+          'results': {
+              'selfLink': request.url,
+              'counts': counts,
+              'entries': entries,
+          }
+      }, cls=GrcEncoder),
+      200,
+      [('Content-Type', 'application/json')],
+  ))
+
+
 def _build_relevant_filter(types, relevant_objects):
   if relevant_objects is None:
     relevant_objects = []
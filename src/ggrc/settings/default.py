@@ -88,6 +88,65 @@ SQLALCHEMY_DATABASE_URI = os.environ.get('GGRC_DATABASE_URI', '')
 SECRET_KEY = os.environ.get('GGRC_SECRET_KEY', 'Replace-with-something-secret')
 
 MEMCACHE_MECHANISM = True
+# Seconds after which ACL entries are passed by the version of cached
+# permissions, must be longer than any transaction creating ACL entries.
+PERMISSION_ACL_VERSION_LAG = int(
+    os.environ.get("GGRC_PERMISSION_ACL_VERSION_LAG", 600))
+
+# Backend of the shared cache used for collections and permissions:
+# "memcache" (AppEngine memcache) or "redis" (server at REDIS_URL).
+CACHE_BACKEND = os.environ.get("GGRC_CACHE_BACKEND", "memcache")
+REDIS_URL = os.environ.get("GGRC_REDIS_URL", "redis://localhost:6379/0")
+# Published objects of collection GET responses are kept in the shared cache
+# and reused by following requests.
+COLLECTION_CACHE = bool(os.environ.get("GGRC_COLLECTION_CACHE"))
+
+# Backend of the per-user cache for /query results: "memcache", "local" or
+# empty to disable caching. Local cache keeps at most QUERY_RESULT_CACHE_SIZE
+# results per instance.
+QUERY_RESULT_CACHE = os.environ.get("GGRC_QUERY_RESULT_CACHE", "")
+QUERY_RESULT_CACHE_SIZE = int(
+    os.environ.get("GGRC_QUERY_RESULT_CACHE_SIZE", "1000"))
+QUERY_RESULT_CACHE_EXPIRY = 60
+
+# Fulltext records are updated at commit ("sync") or stored in an outbox and
+# updated by a cron job ("async").
+FULLTEXT_INDEXING_MODE = os.environ.get("GGRC_FULLTEXT_INDEXING_MODE", "sync")
+# Reindex rewrites only changed fulltext records instead of replacing all
+# records of reindexed objects.
+FULLTEXT_DIFF_UPDATES = bool(os.environ.get("GGRC_FULLTEXT_DIFF_UPDATES"))
+# Number of worker processes used by the full reindex, 1 reindexes all models
+# in the request process.
+REINDEX_PROCESSES = int(os.environ.get("GGRC_REINDEX_PROCESSES", 1))
+# Parser of the FULLTEXT index used by ggrc.fulltext.inverted.InvertedIndexer,
+# "word" for the built-in parser or "ngram" for indexes WITH PARSER ngram.
+FULLTEXT_INVERTED_PARSER = os.environ.get("GGRC_FULLTEXT_INVERTED_PARSER",
+                                          "word")
+# Must be equal to innodb_ft_min_token_size (or ngram_token_size for ngram).
+FULLTEXT_MIN_TOKEN_SIZE = int(os.environ.get("GGRC_FULLTEXT_MIN_TOKEN_SIZE",
+                                             3))
+
+# Collections of models with stub only references are published from column
+# queries without loading ORM objects.
+COMPILED_PUBLISHERS = bool(os.environ.get("GGRC_COMPILED_PUBLISHERS"))
+
+# Directory of files written by background jobs (exports). If empty, the
+# files are kept in the database.
+BLOB_STORAGE_PATH = os.environ.get("GGRC_BLOB_STORAGE_PATH", "")
+# Number of worker processes rendering rows of background exports, 1 renders
+# rows in the exporting process.
+EXPORT_PROCESSES = int(os.environ.get("GGRC_EXPORT_PROCESSES", 1))
+# Number of imported rows committed in one transaction with one revision
+# event, 1 commits every row separately.
+IMPORT_BATCH_SIZE = int(os.environ.get("GGRC_IMPORT_BATCH_SIZE", 1))
+# Snapshot updates of audits with a revision watermark only check objects
+# with newer revisions and reindex only snapshots with changed content.
+SNAPSHOT_CHANGE_TRACKING = bool(
+    os.environ.get("GGRC_SNAPSHOT_CHANGE_TRACKING"))
+# Seconds after which revisions are passed by snapshot watermarks, must be
+# longer than any transaction creating revisions.
+SNAPSHOT_WATERMARK_LAG = int(os.environ.get("GGRC_SNAPSHOT_WATERMARK_LAG",
+                                            600))
 
 # AppEngine Email
 APPENGINE_EMAIL = os.environ.get('APPENGINE_EMAIL', '')
@@ -21,12 +21,14 @@ from ggrc.login import get_current_user_id
 from ggrc.models import all_models
 from ggrc.utils import benchmark
 
+from ggrc.snapshotter import watermarks
 from ggrc.snapshotter.datastructures import Attr
 from ggrc.snapshotter.datastructures import Pair
 from ggrc.snapshotter.datastructures import Stub
 from ggrc.snapshotter.datastructures import OperationResponse
 from ggrc.snapshotter.helpers import create_snapshot_dict
 from ggrc.snapshotter.helpers import create_snapshot_revision_dict
+from ggrc.snapshotter.helpers import get_content_hashes
 from ggrc.snapshotter.helpers import get_revisions
 from ggrc.snapshotter.helpers import get_snapshots
 from ggrc.snapshotter.indexer import reindex_pairs
@@ -141,15 +143,68 @@ class SnapshotGenerator(object):
   def update(self, event, revisions, _filter=None):
     """Update parent object's snapshots."""
     _, for_update = self.analyze()
+    next_watermark = watermarks.get_max_revision_id()
+    watermark = self._get_watermark()
+    if watermark is not None:
+      for_update = self._filter_changed(for_update, watermark, revisions)
     result = self._update(for_update=for_update, event=event,
                           revisions=revisions, _filter=_filter)
-    updated = result.response
     if not self.dry_run:
-      reindex_pairs(updated)
-      self._copy_snapshot_relationships()
-      self._create_audit_relationships()
+      reindex_pairs(self._get_reindex_pairs(result, watermark))
+      self._copy_snapshot_relationships(since=watermark)
+      if watermark is None:
+        self._create_audit_relationships()
+      self._save_watermark(next_watermark, revisions, _filter)
     return result
 
+  def _get_watermark(self):
+    """Get watermark of parents if updates skip unchanged children."""
+    if not watermarks.is_enabled():
+      return None
+    return watermarks.get_watermark(self.parents)
+
+  @staticmethod
+  def _filter_changed(pairs, watermark, revisions):
+    """Get pairs whose children changed after the watermark.
+
+    Pairs with explicitly selected revisions are always kept.
+    """
+    changed = watermarks.get_changed_children(
+        {pair.child for pair in pairs}, watermark)
+    return {pair for pair in pairs
+            if pair.child in changed or pair in revisions}
+
+  @staticmethod
+  def _get_reindex_pairs(result, watermark):
+    """Get pairs of updated snapshots that need to be reindexed.
+
+    Without a watermark all pairs in update scope are reindexed, otherwise
+    only snapshots whose revision content changed.
+    """
+    if result is None:
+      return set()
+    if watermark is None:
+      return result.response
+    old = result.data["revisions"]["old"]
+    new = result.data["revisions"]["new"]
+    modified = {pair for pair in result.response
+                if pair in new and old.get(pair) != new[pair]}
+    hashes = get_content_hashes({old.get(pair) for pair in modified} |
+                                {new[pair] for pair in modified})
+    return {pair for pair in modified
+            if hashes.get(old.get(pair)) != hashes.get(new[pair])}
+
+  def _save_watermark(self, watermark, revisions, _filter):
+    """Store watermark of parents after all their snapshots were updated.
+
+    Snapshots updated to selected revisions or only partially updated don't
+    point to the latest revisions, so the watermark is removed.
+    """
+    if revisions or _filter:
+      watermarks.clear_watermark(self.parents)
+    else:
+      watermarks.set_watermark(self.parents, watermark)
+
   def _update(self, for_update, event, revisions, _filter):
     """Update (or create) parent objects' snapshots and create revisions for
     them.
@@ -292,25 +347,32 @@ class SnapshotGenerator(object):
       OperationResponse
     """
     for_create, for_update = self.analyze()
+    next_watermark = watermarks.get_max_revision_id()
+    watermark = self._get_watermark()
+    if watermark is not None:
+      for_update = self._filter_changed(for_update, watermark, revisions)
     create, update = None, None
-    created, updated = set(), set()
+    created = set()
 
     if for_update:
       update = self._update(
           for_update=for_update, event=event, revisions=revisions,
           _filter=_filter)
-      updated = update.response
     if for_create:
       create = self._create(for_create=for_create, event=event,
                             revisions=revisions, _filter=_filter)
       created = create.response
 
-    to_reindex = updated | created
     if not self.dry_run:
-      reindex_pairs(to_reindex)
-      self._remove_lost_snapshot_mappings()
-      self._copy_snapshot_relationships()
-      self._create_audit_relationships()
+      reindex_pairs(self._get_reindex_pairs(update, watermark) | created)
+      # New snapshots need all relationships of their children
+      since = watermark if not created else None
+      if since is None or watermarks.has_deleted_relationships(since):
+        self._remove_lost_snapshot_mappings()
+      self._copy_snapshot_relationships(since=since)
+      if since is None:
+        self._create_audit_relationships()
+      self._save_watermark(next_watermark, revisions, _filter)
     return OperationResponse("upsert", True, {
         "create": create,
         "update": update
@@ -341,6 +403,8 @@ class SnapshotGenerator(object):
       reindex_pairs(created)
       self._copy_snapshot_relationships()
       self._create_audit_relationships()
+      if revisions:
+        watermarks.clear_watermark(self.parents)
     return result
 
   def _create(self, for_create, event, revisions, _filter):
@@ -415,13 +479,25 @@ class SnapshotGenerator(object):
         self._execute(models.Revision.__table__.insert(), revision_payload)
       return OperationResponse("create", True, for_create, response_data)
 
-  def _copy_snapshot_relationships(self):
+  def _copy_snapshot_relationships(self, since=None):
     """Add relationships between snapshotted objects.
 
     Create relationships between individual snapshots if a relationship exists
     between a pair of object that was snapshotted. These relationships get
     created for all objects inside a single parent scope.
+
+    Args:
+      since: If set, only relationships with revisions newer than this
+        revision id are copied.
     """
+    changed_filter = ""
+    if since is not None:
+      changed_filter = """
+          AND rel.id IN (
+              SELECT resource_id FROM revisions
+              WHERE resource_type = "Relationship" AND id > :since
+          )
+          """
     for parent in self.parents:
       query = """
           INSERT IGNORE INTO relationships (
@@ -453,10 +529,11 @@ class SnapshotGenerator(object):
           WHERE
               snap_1.parent_id = :parent_id AND
               snap_2.parent_id = :parent_id
-          """
+          """ + changed_filter
       db.session.execute(query, {
           "user_id": get_current_user_id(),
-          "parent_id": parent.id
+          "parent_id": parent.id,
+          "since": since,
       })
 
   @classmethod
@@ -97,6 +97,26 @@ def get_revisions(pairs, revisions, filters=None):
     return revision_id_cache
 
 
+def get_content_hashes(revision_ids):
+  """Get hashes of revision contents computed by the database.
+
+  Args:
+    revision_ids: set of revision ids
+  Returns:
+    dict of revision ids and md5 hashes of their content
+  """
+  if not revision_ids:
+    return {}
+  revisions = models.Revision.__table__
+  query = db.session.query(
+      revisions.c.id,
+      func.md5(revisions.c.content),
+  ).filter(
+      revisions.c.id.in_(revision_ids)
+  )
+  return dict(query)
+
+
 def get_snapshots(objects=None, ids=None):
   with benchmark("snapshotter.helpers.get_snapshots"):
     if objects and ids:
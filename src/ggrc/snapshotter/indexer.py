@@ -3,13 +3,16 @@
 
 """Manage indexing for snapshotter service"""
 
+import json
 import logging
+import multiprocessing
 from collections import defaultdict
+from collections import namedtuple
 from functools import partial
 import itertools
 
+import sqlalchemy as sa
 from sqlalchemy.sql.expression import tuple_
-from sqlalchemy import orm
 
 from ggrc import db
 from ggrc import models
@@ -17,7 +20,9 @@ from ggrc.models import all_models
 from ggrc.fulltext.mysql import MysqlRecordProperty as Record
 from ggrc.fulltext import get_indexer
 from ggrc.models.reflection import AttributeInfo
-from ggrc.utils import generate_query_chunks, helpers
+from ggrc.query import result_cache
+from ggrc.utils import helpers
+from ggrc.utils import query_chunks
 
 from ggrc.snapshotter.rules import Types
 from ggrc.snapshotter.datastructures import Pair
@@ -26,6 +31,17 @@ from ggrc.fulltext.attributes import FullTextAttr
 
 logger = logging.getLogger(__name__)
 
+# Number of snapshots reindexed with one delete and insert query
+REINDEX_CHUNK_SIZE = 1000
+
+SnapshotRow = namedtuple("SnapshotRow", [
+    "id", "parent_type", "parent_id", "child_type", "child_id",
+    "revision_id", "resource_type", "resource_id", "content",
+])
+
+# Options and custom attribute definitions used by forked workers
+_WORKER_CONTEXT = None
+
 
 def _get_class_properties():
   """Get indexable properties for all models
@@ -127,23 +143,154 @@ def get_options():
   return options_dict
 
 
-@helpers.without_sqlalchemy_cache
-def reindex():
-  """Reindex all snapshots."""
-  columns = db.session.query(
-      models.Snapshot.parent_type,
-      models.Snapshot.parent_id,
-      models.Snapshot.child_type,
-      models.Snapshot.child_id,
+def _get_snapshot_rows_query():
+  """Get query of snapshots with undecoded content of their revisions."""
+  snapshot, revision = models.Snapshot, models.Revision
+  return db.session.query(
+      snapshot.id,
+      snapshot.parent_type,
+      snapshot.parent_id,
+      snapshot.child_type,
+      snapshot.child_id,
+      revision.id,
+      revision.resource_type,
+      revision.resource_id,
+      # pylint: disable=protected-access
+      sa.type_coerce(revision._content, sa.Text),
+  ).join(
+      revision, revision.id == snapshot.revision_id,
   )
-  all_count = columns.count()
+
+
+def _iter_snapshot_rows(chunk_size):
+  """Yield lists of rows of all snapshots ordered by id."""
+  chunks = query_chunks.iter_chunks(_get_snapshot_rows_query(),
+                                    [models.Snapshot.id], chunk_size)
+  for rows in chunks:
+    yield [SnapshotRow(*row) for row in rows]
+
+
+def _get_revision(row):
+  """Get transient revision with decoded content of the snapshot row."""
+  revision = models.Revision.__mapper__.class_manager.new_instance()
+  revision.id = row.revision_id
+  revision.resource_type = row.resource_type
+  revision.resource_id = row.resource_id
+  revision.content = json.loads(row.content)
+  return revision
+
+
+def _build_records(rows, options, cad_dict):
+  """Build fulltext records of snapshots.
+
+  Args:
+    rows: list of SnapshotRow tuples.
+    options: dict of option titles.
+    cad_dict: dict of custom attribute definitions of snapshottable models.
+  Returns:
+    list of record dicts.
+  """
+  search_payload = []
+  for row in rows:
+    snapshot = row._asdict()
+    snapshot["revision"] = get_searchable_attributes(
+        CLASS_PROPERTIES[row.resource_type],
+        cad_dict[row.resource_type],
+        _get_revision(row).content)
+    for prop, val in get_properties(snapshot).items():
+      search_payload.extend(
+          get_record_value(
+              prop,
+              val,
+              {
+                  "key": row.id,
+                  "type": "Snapshot",
+                  "tags": TAG_TMPL.format(**snapshot),
+                  "subproperty": "",
+              },
+              options
+          )
+      )
+  return search_payload
+
+
+def _init_worker():
+  """Prepare forked worker process for building records."""
+  global _WORKER_CONTEXT  # pylint: disable=global-statement
+  from ggrc.app import app
+  from ggrc.fulltext import reindex as fulltext_reindex
+  app.app_context().push()
+  fulltext_reindex.warmup_indexer_cache()
+  _WORKER_CONTEXT = (get_options(), _get_custom_attribute_dict())
+
+
+def _build_records_in_worker(rows):
+  try:
+    return [row.id for row in rows], _build_records(rows, *_WORKER_CONTEXT)
+  finally:
+    db.session.rollback()
+
+
+def _iter_records_in_pool(chunks, processes):
+  """Build records of chunks in a pool of worker processes.
+
+  Rows are read and records are written by the current process, a batch of
+  chunks is read and written while workers build records of the previous
+  batch.
+
+  Yields:
+    tuples of snapshot ids and records of every chunk.
+  """
+  # Forked workers must not share database connections with this process
+  db.session.commit()
+  db.session.remove()
+  db.engine.dispose()
+  pool = multiprocessing.Pool(processes, initializer=_init_worker)
+  try:
+    pending = None
+    while True:
+      batch = list(itertools.islice(chunks, processes))
+      result = pool.map_async(_build_records_in_worker, batch)
+      if pending is not None:
+        for records in pending.get():
+          yield records
+      if not batch:
+        break
+      pending = result
+    pool.close()
+  finally:
+    pool.terminate()
+    pool.join()
+
+
+@helpers.without_sqlalchemy_cache
+def reindex(processes=1):
+  """Reindex all snapshots.
+
+  Args:
+    processes: number of worker processes decoding revisions and building
+      records, records are built in the current process if it is 1.
+  Returns:
+    number of reindexed snapshots.
+  """
+  all_count = models.Snapshot.query.count()
+  chunks = _iter_snapshot_rows(REINDEX_CHUNK_SIZE)
+  if processes > 1:
+    results = _iter_records_in_pool(chunks, processes)
+  else:
+    options, cad_dict = get_options(), _get_custom_attribute_dict()
+    results = (([row.id for row in rows],
+                _build_records(rows, options, cad_dict))
+               for rows in chunks)
   handled = 0
-  for query_chunk in generate_query_chunks(columns):
-    handled += query_chunk.count()
-    logger.info("Snapshot: %s/%s", handled, all_count)
-    pairs = {Pair.from_4tuple(p) for p in query_chunk}
-    reindex_pairs(pairs)
+  progress = query_chunks.ProgressLog("Snapshot", all_count, unit="pairs")
+  for snapshot_ids, search_payload in results:
+    delete_records(snapshot_ids)
+    insert_records(search_payload)
     db.session.commit()
+    handled += len(snapshot_ids)
+    progress(handled)
+  return handled
 
 
 def reindex_snapshots(snapshot_ids):
@@ -151,13 +298,14 @@ def reindex_snapshots(snapshot_ids):
   if not snapshot_ids:
     return
   columns = db.session.query(
+      models.Snapshot.id,
       models.Snapshot.parent_type,
       models.Snapshot.parent_id,
       models.Snapshot.child_type,
       models.Snapshot.child_id,
   ).filter(models.Snapshot.id.in_(snapshot_ids))
-  for query_chunk in generate_query_chunks(columns):
-    pairs = {Pair.from_4tuple(p) for p in query_chunk}
+  for rows in query_chunks.iter_chunks(columns, [models.Snapshot.id]):
+    pairs = {Pair.from_4tuple(row[1:]) for row in rows}
     reindex_pairs(pairs)
     db.session.commit()
 
@@ -172,6 +320,7 @@ def delete_records(snapshot_ids):
       Record.type == "Snapshot",
       Record.key.in_(snapshot_ids)
   ).delete(synchronize_session=False)
+  result_cache.mark_modified([models.Snapshot.__name__])
   db.session.commit()
 
 
@@ -183,6 +332,7 @@ def insert_records(payload):
   """
   engine = db.engine
   engine.execute(Record.__table__.insert(), payload)
+  result_cache.mark_modified([models.Snapshot.__name__])
   db.session.commit()
 
 
@@ -356,9 +506,7 @@ def reindex_pairs(pairs):
   """
   if not pairs:
     return
-  snapshots = dict()
-  options = get_options()
-  snapshot_query = models.Snapshot.query.filter(
+  rows = [SnapshotRow(*row) for row in _get_snapshot_rows_query().filter(
       tuple_(
           models.Snapshot.parent_type,
           models.Snapshot.parent_id,
@@ -367,51 +515,8 @@ def reindex_pairs(pairs):
       ).in_(
           {pair.to_4tuple() for pair in pairs}
       )
-  ).options(
-      orm.subqueryload("revision").load_only(
-          "id",
-          "resource_type",
-          "resource_id",
-          "_content",
-      ),
-      orm.load_only(
-          "id",
-          "parent_type",
-          "parent_id",
-          "child_type",
-          "child_id",
-          "revision_id",
-      )
-  )
-  cad_dict = _get_custom_attribute_dict()
-  for snapshot in snapshot_query:
-    revision = snapshot.revision
-    snapshots[snapshot.id] = {
-        "id": snapshot.id,
-        "parent_type": snapshot.parent_type,
-        "parent_id": snapshot.parent_id,
-        "child_type": snapshot.child_type,
-        "child_id": snapshot.child_id,
-        "revision": get_searchable_attributes(
-            CLASS_PROPERTIES[revision.resource_type],
-            cad_dict[revision.resource_type],
-            revision.content)
-    }
-  search_payload = []
-  for snapshot in snapshots.values():
-    for prop, val in get_properties(snapshot).items():
-      search_payload.extend(
-          get_record_value(
-              prop,
-              val,
-              {
-                  "key": snapshot["id"],
-                  "type": "Snapshot",
-                  "tags": TAG_TMPL.format(**snapshot),
-                  "subproperty": "",
-              },
-              options
-          )
-      )
-  delete_records(snapshots.keys())
+  )]
+  search_payload = _build_records(rows, get_options(),
+                                  _get_custom_attribute_dict())
+  delete_records([row.id for row in rows])
   insert_records(search_payload)
@@ -0,0 +1,117 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Watermarks of revisions already considered by snapshot updates.
+
+Watermark of a parent object is a revision id such that every snapshot of the
+parent points to the latest revision of its child object with an id lower or
+equal to the watermark. An update of the parent only has to check children
+that got newer revisions. Operations that set snapshots to specific revisions
+remove the watermark, so the next update checks all snapshots again.
+"""
+
+import datetime
+
+import sqlalchemy as sa
+
+from ggrc import db
+from ggrc import settings
+from ggrc.models import all_models
+from ggrc.snapshotter.datastructures import Stub
+
+
+def is_enabled():
+  """Check if snapshot updates should skip unchanged children."""
+  return getattr(settings, "SNAPSHOT_CHANGE_TRACKING", False)
+
+
+def get_max_revision_id():
+  """Get the highest revision id that could be used for a new watermark.
+
+  Revision ids are allocated on insert but revisions become visible on commit
+  of their transaction, so a concurrent transaction can still commit
+  revisions with lower ids than the highest visible one. Only revisions
+  created SNAPSHOT_WATERMARK_LAG seconds ago or earlier are passed by the
+  watermark, newer revisions are checked again by the next update.
+  """
+  revision = all_models.Revision
+  lag = datetime.timedelta(
+      seconds=getattr(settings, "SNAPSHOT_WATERMARK_LAG", 600))
+  # The primary key is scanned backwards through recent revisions only
+  revision_id = db.session.query(revision.id).filter(
+      revision.created_at <= datetime.datetime.utcnow() - lag,
+  ).order_by(revision.id.desc()).limit(1).scalar()
+  return revision_id or 0
+
+
+def get_watermark(parents):
+  """Get the lowest watermark of the parents.
+
+  Returns:
+    revision id or None if any of the parents has no watermark.
+  """
+  if not parents:
+    return None
+  watermark = all_models.SnapshotWatermark
+  query = db.session.query(
+      watermark.parent_type,
+      watermark.parent_id,
+      watermark.revision_id,
+  ).filter(
+      sa.tuple_(watermark.parent_type, watermark.parent_id).in_(parents)
+  )
+  revision_ids = {Stub(type_, id_): revision_id
+                  for type_, id_, revision_id in query}
+  if set(revision_ids) != set(parents):
+    return None
+  return min(revision_ids.values())
+
+
+def set_watermark(parents, revision_id):
+  """Set watermark of the parents."""
+  if not parents:
+    return
+  clear_watermark(parents)
+  db.session.execute(all_models.SnapshotWatermark.__table__.insert(), [
+      {"parent_type": parent.type,
+       "parent_id": parent.id,
+       "revision_id": revision_id}
+      for parent in parents
+  ])
+
+
+def clear_watermark(parents):
+  """Remove watermark of the parents."""
+  if not parents:
+    return
+  table = all_models.SnapshotWatermark.__table__
+  db.session.execute(table.delete().where(
+      sa.tuple_(table.c.parent_type, table.c.parent_id).in_(parents)
+  ))
+
+
+def get_changed_children(children, revision_id):
+  """Get children with created or modified revisions after revision_id."""
+  if not children:
+    return set()
+  revision = all_models.Revision
+  query = db.session.query(
+      revision.resource_type,
+      revision.resource_id,
+  ).filter(
+      revision.id > revision_id,
+      revision.action.in_(["created", "modified"]),
+      sa.tuple_(revision.resource_type, revision.resource_id).in_(children),
+  ).distinct()
+  return {Stub(type_, id_) for type_, id_ in query}
+
+
+def has_deleted_relationships(revision_id):
+  """Check if any relationship was deleted after revision_id."""
+  revision = all_models.Revision
+  query = db.session.query(revision.id).filter(
+      revision.id > revision_id,
+      revision.resource_type == all_models.Relationship.__name__,
+      revision.action == "deleted",
+  )
+  return db.session.query(query.exists()).scalar()
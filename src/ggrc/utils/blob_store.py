@@ -0,0 +1,86 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Storage of large files produced by background jobs.
+
+Files are written and read as streams by key, so their content never has to
+be held in memory or stored in a database column.
+"""
+
+import contextlib
+import os
+
+from ggrc import settings
+
+
+# Number of bytes read from a stored file at once
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class BlobStore(object):
+  """Interface of a file or object store."""
+
+  def open_write(self, key):
+    """Get context manager with a file object writing the file of the key.
+
+    The file becomes readable only after the context manager exits without
+    errors.
+    """
+    raise NotImplementedError()
+
+  def iter_chunks(self, key, chunk_size=READ_CHUNK_SIZE):
+    """Iterate over content of the file of the key."""
+    raise NotImplementedError()
+
+  def delete(self, key):
+    """Remove the file of the key if it exists."""
+    raise NotImplementedError()
+
+
+class LocalFileStore(BlobStore):
+  """Store of files in a local directory."""
+
+  def __init__(self, root):
+    self.root = os.path.abspath(root)
+
+  def _get_path(self, key):
+    path = os.path.abspath(os.path.join(self.root, key))
+    if not path.startswith(self.root + os.sep):
+      raise ValueError("Invalid blob key {}".format(key))
+    return path
+
+  @contextlib.contextmanager
+  def open_write(self, key):
+    path = self._get_path(key)
+    partial_path = path + ".part"
+    directory = os.path.dirname(path)
+    if not os.path.isdir(directory):
+      os.makedirs(directory)
+    try:
+      with open(partial_path, "wb") as output:
+        yield output
+    except Exception:
+      os.remove(partial_path)
+      raise
+    os.rename(partial_path, path)
+
+  def iter_chunks(self, key, chunk_size=READ_CHUNK_SIZE):
+    with open(self._get_path(key), "rb") as input_:
+      while True:
+        chunk = input_.read(chunk_size)
+        if not chunk:
+          break
+        yield chunk
+
+  def delete(self, key):
+    path = self._get_path(key)
+    if os.path.exists(path):
+      os.remove(path)
+
+
+def get_blob_store():
+  """Get configured blob store or None if files are kept in the database."""
+  path = getattr(settings, "BLOB_STORAGE_PATH", None)
+  if not path:
+    return None
+  return LocalFileStore(path)
@@ -79,8 +79,10 @@ def log_event(session, obj=None, current_user_id=None, flush=True,
   Returns:
     Uncommitted models.Event instance
   """
+  from ggrc.automapper import automap
   if flush:
     session.flush()
+  automap(session)
   if current_user_id is None:
     current_user_id = get_current_user_id()
   revisions = _get_log_revisions(current_user_id, obj=obj, force_obj=force_obj)
@@ -0,0 +1,112 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Chunked iteration over large queries with keyset pagination.
+
+Every chunk is selected by the key of the last row of the previous chunk
+instead of OFFSET, so each chunk is read with an index range scan and the
+whole iteration is linear in the size of the table. Rows are ordered by a
+unique key that can consist of several columns.
+"""
+
+import itertools
+import logging
+import operator
+import time
+
+import sqlalchemy as sa
+
+from ggrc.utils import CHUNK_SIZE
+
+
+logger = logging.getLogger(__name__)
+
+
+def after_key(columns, key):
+  """Get filter of rows ordered after the key.
+
+  Row value comparison is expanded to a disjunction, which MySQL resolves
+  with a range scan of the index on the columns.
+
+  Args:
+    columns: list of key columns.
+    key: tuple of key values.
+  """
+  clauses = []
+  for idx, column in enumerate(columns):
+    equal = [col == value for col, value in zip(columns[:idx], key[:idx])]
+    clauses.append(sa.and_(*(equal + [column > key[idx]])))
+  return sa.or_(*clauses)
+
+
+def _keyset_chunks(query, columns, chunk_size, key):
+  """Yield chunks of rows with one query per chunk."""
+  rows = query.limit(chunk_size).all()
+  while rows:
+    yield rows
+    if len(rows) < chunk_size:
+      return
+    rows = query.filter(
+        after_key(columns, key(rows[-1]))
+    ).limit(chunk_size).all()
+
+
+def _stream_chunks(query, chunk_size):
+  """Yield chunks of rows read with a single query."""
+  rows = iter(query.yield_per(chunk_size))
+  while True:
+    chunk = list(itertools.islice(rows, chunk_size))
+    if not chunk:
+      return
+    yield chunk
+
+
+def iter_chunks(query, columns, chunk_size=CHUNK_SIZE, key=None,
+                stream=False, progress=None):
+  """Yield lists of rows of the query ordered by key columns.
+
+  Args:
+    query: query of rows, it must not be ordered or limited.
+    columns: list of columns of a unique key of rows.
+    chunk_size: number of rows in one chunk.
+    key: function getting the tuple of key values of a row. By default the
+      first len(columns) values of the row are its key.
+    stream: read all rows with a single query through a server side cursor.
+      The connection can't be used by other queries until all rows are read,
+      so chunks must not be processed in the same session.
+    progress: function called with the number of rows yielded so far after
+      every processed chunk.
+  """
+  query = query.order_by(*columns)
+  if stream:
+    chunks = _stream_chunks(query, chunk_size)
+  else:
+    if key is None:
+      key = operator.itemgetter(slice(None, len(columns)))
+    chunks = _keyset_chunks(query, columns, chunk_size, key)
+  handled = 0
+  for rows in chunks:
+    yield rows
+    handled += len(rows)
+    if progress:
+      progress(handled)
+
+
+class ProgressLog(object):
+  """Progress callback logging number of handled rows and throughput."""
+  # pylint: disable=too-few-public-methods
+
+  def __init__(self, name, total=None, unit="rows"):
+    self.name = name
+    self.total = total
+    self.unit = unit
+    self.started_at = time.time()
+
+  def __call__(self, handled):
+    seconds = time.time() - self.started_at
+    rate = handled / seconds if seconds else 0
+    if self.total is None:
+      logger.info("%s: %s, %.1f %s/s", self.name, handled, rate, self.unit)
+    else:
+      logger.info("%s: %s/%s, %.1f %s/s", self.name, handled, self.total,
+                  rate, self.unit)
@@ -5,19 +5,29 @@
 
 from logging import getLogger
 
+import sqlalchemy as sa
+
 from ggrc import db
 from ggrc.login import get_current_user_id
 from ggrc.models import all_models
+from ggrc.utils import query_chunks
 
 logger = getLogger(__name__)
 
+OBJECTS_WITHOUT_REVISIONS = sa.sql.table(
+    "objects_without_revisions",
+    sa.sql.column("obj_id", sa.Integer),
+    sa.sql.column("obj_type", sa.String),
+    sa.sql.column("action", sa.String),
+)
+
 
-def _get_new_objects():
-  """Returns list of new objects"""
-  result = db.session.execute("""
-      SELECT obj_id, obj_type, action FROM objects_without_revisions
-  """).fetchall()
-  return result
+def _get_new_objects_chunks(chunk_size, progress):
+  """Yield chunks of new objects ordered by the unique key."""
+  table = OBJECTS_WITHOUT_REVISIONS
+  query = db.session.query(table.c.obj_id, table.c.obj_type, table.c.action)
+  return query_chunks.iter_chunks(query, [table.c.obj_id, table.c.obj_type],
+                                  chunk_size=chunk_size, progress=progress)
 
 
 def _get_new_objects_count():
@@ -26,12 +36,6 @@ def _get_new_objects_count():
                             "FROM objects_without_revisions").scalar()
 
 
-def _get_chunks(objects, size):
-  """Yield sized chunks from objects."""
-  for i in xrange(0, len(objects), size):
-    yield objects[i:i + size]
-
-
 def do_missing_revisions():
   """Crate 'created/modified' revisions.
 
@@ -43,11 +47,9 @@ def do_missing_revisions():
   db.session.commit()
   revisions_table = all_models.Revision.__table__
   count = _get_new_objects_count()
-  chunk_size = 100
+  progress = query_chunks.ProgressLog("Missing revisions", count)
   logger.info("Crating revision content...")
-  for index, chunk in enumerate(_get_chunks(_get_new_objects(),
-                                            chunk_size), 1):
-    logger.info("Processing chunk %s of %s", index, count / chunk_size + 1)
+  for chunk in _get_new_objects_chunks(100, progress):
     revisions = []
     for obj_id, obj_type, action in chunk:
       model = getattr(all_models, obj_type, None)
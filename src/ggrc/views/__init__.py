@@ -27,7 +27,8 @@ from ggrc.builder.json import publish
 from ggrc.builder.json import publish_representation
 from ggrc.converters import get_importables, get_exportables
 from ggrc.extensions import get_extension_modules
-from ggrc.fulltext import get_indexer, mixin
+from ggrc.fulltext import outbox as fulltext_outbox
+from ggrc.fulltext import reindex as fulltext_reindex
 from ggrc.integrations import issues
 from ggrc.integrations import integrations_errors
 from ggrc.login import get_current_user
@@ -58,7 +59,6 @@ from ggrc.utils import revisions
 from ggrc.cache.utils import clear_permission_cache
 
 logger = logging.getLogger(__name__)
-REINDEX_CHUNK_SIZE = 100
 
 
 # Needs to be secured as we are removing @login_required
@@ -84,7 +84,8 @@ def reindex_snapshots(_):
   """Web hook to update the full text search index."""
   logger.info("Updating index for: %s", "Snapshot")
   with benchmark("Create records for %s" % "Snapshot"):
-    snapshot_indexer.reindex()
+    snapshot_indexer.reindex(
+        processes=getattr(settings, "REINDEX_PROCESSES", 1))
   return app.make_response(("success", 200, [("Content-Type", "text/html")]))
 
 
@@ -197,41 +198,21 @@ def start_update_audit_issues(audit_id, message):
 
 
 @helpers.without_sqlalchemy_cache
-def do_reindex(with_reindex_snapshots=False):
-  """Update the full text search index."""
+def do_reindex(with_reindex_snapshots=False, resume=False):
+  """Update the full text search index.
 
-  indexer = get_indexer()
-  indexed_models = {
-      m.__name__: m for m in all_models.all_models
-      if issubclass(m, mixin.Indexed) and m.REQUIRED_GLOBAL_REINDEX
-  }
-  people_query = db.session.query(all_models.Person.id,
-                                  all_models.Person.name,
-                                  all_models.Person.email)
-  indexer.cache["people_map"] = {p.id: (p.name, p.email) for p in people_query}
-  indexer.cache["ac_role_map"] = dict(db.session.query(
-      all_models.AccessControlRole.id,
-      all_models.AccessControlRole.name,
-  ))
-  for model_name in sorted(indexed_models.keys()):
-    logger.info("Updating index for: %s", model_name)
-    with benchmark("Create records for %s" % model_name):
-      model = indexed_models[model_name]
-      ids = [obj.id for obj in model.query]
-      ids_count = len(ids)
-      handled_ids = 0
-      for ids_chunk in utils.list_chunks(ids, chunk_size=REINDEX_CHUNK_SIZE):
-        handled_ids += len(ids_chunk)
-        logger.info("%s: %s / %s", model.__name__, handled_ids, ids_count)
-        model.bulk_record_update_for(ids_chunk)
-        db.session.commit()
-
-  if with_reindex_snapshots:
-    logger.info("Updating index for: %s", "Snapshot")
-    with benchmark("Create records for %s" % "Snapshot"):
-      snapshot_indexer.reindex()
-
-  indexer.invalidate_cache()
+  Args:
+    with_reindex_snapshots: reindex snapshots as well.
+    resume: skip partitions finished by an interrupted reindex.
+
+  Returns:
+    throughput report of the reindex.
+  """
+  return fulltext_reindex.run(
+      with_snapshots=with_reindex_snapshots,
+      processes=getattr(settings, "REINDEX_PROCESSES", 1),
+      resume=resume,
+  )
 
 
 @helpers.without_sqlalchemy_cache
@@ -533,6 +514,18 @@ def admin_full_reindex():
                          [('Content-Type', 'text/html')])))
 
 
+@app.route("/admin/fulltext_outbox", methods=["GET"])
+@login_required
+@admin_required
+def admin_fulltext_outbox():
+  """Get number of objects waiting for fulltext reindex and indexing lag."""
+  return app.make_response((
+      json.dumps(fulltext_outbox.get_status()),
+      200,
+      [("Content-Type", "application/json")],
+  ))
+
+
 @app.route("/admin/compute_attributes", methods=["POST"])
 @login_required
 @admin_required
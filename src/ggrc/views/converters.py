@@ -29,6 +29,7 @@ from werkzeug.exceptions import (
 from ggrc import db
 from ggrc.app import app
 from ggrc.converters import get_exportables
+from ggrc.converters import export_pool
 from ggrc.converters.base import ImportConverter, ExportConverter
 from ggrc.converters.import_helper import count_objects, \
     read_csv_file, get_export_filename, get_object_column_definitions
@@ -40,6 +41,7 @@ from ggrc.query.builder import QueryHelper
 from ggrc.login import login_required, get_current_user
 from ggrc import settings
 from ggrc.utils import benchmark, get_url_root
+from ggrc.utils import blob_store
 
 
 EXPORTABLES_MAP = {exportable.__name__: exportable for exportable
@@ -93,6 +95,23 @@ def export_file(export_to, filename, csv_string=None):
   raise BadRequest("Bad params")
 
 
+def export_stored_file(export_to, filename, storage_key):
+  """Export file from the blob store to csv file or gdrive file"""
+  store = blob_store.get_blob_store()
+  if store is None:
+    raise NotFound()
+  if export_to == "csv":
+    headers = [
+        ("Content-Type", "text/csv"),
+        ("Content-Disposition", "attachment"),
+    ]
+    return current_app.response_class(store.iter_chunks(storage_key),
+                                      headers=headers)
+  # Drive API uploads the whole file content with one request
+  return export_file(export_to, filename,
+                     "".join(store.iter_chunks(storage_key)))
+
+
 def handle_export_request_error(handle_function):
   """Decorator for handle exceptions during exporting"""
   @wraps(handle_function)
@@ -167,6 +186,69 @@ def make_export(objects):
   return csv_data, object_names
 
 
+def update_export_progress(ie_id, rows_written, rows_total):
+  """Store export progress outside of the export transaction."""
+  table = import_export.ImportExport.__table__
+  db.engine.execute(
+      table.update().where(table.c.id == ie_id).values(
+          rows_written=rows_written,
+          rows_total=rows_total,
+      )
+  )
+
+
+def make_export_to_store(converter, ie_id, store):
+  """Write export csv to the blob store row by row.
+
+  Args:
+    converter: ExportConverter with initialized block converters.
+    ie_id: id of the export job.
+    store: blob store the file is written to.
+
+  Returns:
+    key of the written file in the blob store.
+  """
+  storage_key = "exports/{}.csv".format(ie_id)
+
+  def report_progress(rows_written, rows_total):
+    update_export_progress(ie_id, rows_written, rows_total)
+
+  with store.open_write(storage_key) as output:
+    converter.export_csv_to(output, report_progress)
+  return storage_key
+
+
+def make_background_export(objects, ie_id, store):
+  """Make export of a background job.
+
+  With EXPORT_PROCESSES greater than 1 rows are rendered in a pool of worker
+  processes forked after block converters are initialized.
+
+  Returns:
+    tuple of csv content and key of the file written to the store, content
+    is None if the store is configured, the key is None otherwise.
+  """
+  query_helper = QueryHelper(objects)
+  converter = ExportConverter(ids_by_type=query_helper.get_ids())
+  with benchmark("Initialize block converters."):
+    converter.initialize_block_converters()
+  processes = getattr(settings, "EXPORT_PROCESSES", 1)
+  if processes > 1:
+    # Forked workers must not share database connections with this process.
+    # Export does not change any data, the commit only releases the
+    # connection.
+    db.session.commit()
+    db.engine.dispose()
+    converter.export_pool = export_pool.ExportPool(converter, processes)
+  try:
+    if store is None:
+      return converter.build_csv_from_row_data(), None
+    return None, make_export_to_store(converter, ie_id, store)
+  finally:
+    if converter.export_pool is not None:
+      converter.export_pool.close()
+
+
 def check_import_file():
   """Check if imported file format and type is valid"""
   if "file" not in request.files or not request.files["file"]:
@@ -235,13 +317,19 @@ def run_export(objects, ie_id, user_id, url_root):
       ie = import_export.get(ie_id)
       check_for_previous_run()
 
-      content, _ = make_export(objects)
+      store = blob_store.get_blob_store()
+      content, storage_key = make_background_export(objects, ie_id, store)
       db.session.refresh(ie)
       if ie.status == "Stopped":
+        if store is not None:
+          store.delete(storage_key)
         return
       ie.status = "Finished"
       ie.end_at = datetime.utcnow()
-      ie.content = content
+      if store is None:
+        ie.content = content
+      else:
+        ie.storage_key = storage_key
       db.session.commit()
       job_emails.send_email(job_emails.EXPORT_COMPLETED, user.email, url_root,
                             ie.title, ie_id)
@@ -490,6 +578,8 @@ def handle_file_download(id2):
   try:
     export_to = request.args.get("export_to")
     ie = import_export.get(id2)
+    if ie.storage_key:
+      return export_stored_file(export_to, ie.title, ie.storage_key)
     return export_file(export_to, ie.title, ie.content.encode("utf-8"))
   except (Forbidden, NotFound, Unauthorized):
     raise
@@ -549,8 +639,12 @@ def handle_delete(**kwargs):
   check_import_export_headers()
   try:
     ie = import_export.get(kwargs["id2"])
+    storage_key = ie.storage_key
     db.session.delete(ie)
     db.session.commit()
+    store = blob_store.get_blob_store()
+    if storage_key and store is not None:
+      store.delete(storage_key)
     return make_import_export_response("OK")
   except (Forbidden, NotFound):
     raise
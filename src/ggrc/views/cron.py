@@ -59,6 +59,11 @@ def half_hour_cron_endpoint():
   return job_runner("HALF_HOUR_CRON_JOBS")
 
 
+def fulltext_outbox_cron_endpoint():
+  """Endpoint running fulltext outbox jobs from all modules"""
+  return job_runner("FULLTEXT_OUTBOX_CRON_JOBS")
+
+
 def init_cron_views(app):
   """Init all cron jobs' endpoints"""
   app.add_url_rule(
@@ -75,3 +80,8 @@ def init_cron_views(app):
       "/half_hour_cron_endpoint", "half_hour_cron_endpoint",
       view_func=half_hour_cron_endpoint
   )
+
+  app.add_url_rule(
+      "/fulltext_outbox_cron_endpoint", "fulltext_outbox_cron_endpoint",
+      view_func=fulltext_outbox_cron_endpoint
+  )
@@ -24,10 +24,12 @@ from ggrc.models.audit import Audit
 from ggrc.models.program import Program
 from ggrc.rbac import permissions as rbac_permissions
 from ggrc.rbac.permissions_provider import DefaultUserPermissions
+from ggrc.rbac.permissions_provider import get_contributing_resource_types
 from ggrc.cache import utils as cache_utils
 from ggrc.services import signals
 from ggrc.services.registry import service
 from ggrc.utils import benchmark
+from ggrc_basic_permissions import compact
 from ggrc_basic_permissions.contributed_roles import BasicRoleDeclarations
 from ggrc_basic_permissions.converters.handlers import COLUMN_HANDLERS
 from ggrc_basic_permissions.models import Role
@@ -109,6 +111,32 @@ class UserPermissions(DefaultUserPermissions):
       with benchmark('load_permissions'):
         self._request_permissions = load_permissions_for(user)
 
+  @staticmethod
+  def resources_query_for(action, resource_type):
+    """Get query selecting ids of resources the user has permission for.
+
+    Resources in permissions are granted only by access control list
+    entries, so they can be selected with a query of a constant size instead
+    of listing all ids.
+
+    Returns:
+      query or None if the resources can't be selected with a query.
+    """
+    user = get_current_user()
+    if (action not in ("read", "update", "delete") or
+            user is None or user.is_anonymous()):
+      return None
+    acl = all_models.AccessControlList
+    acr = all_models.AccessControlRole
+    return db.session.query(acl.object_id).join(
+        acr, acl.ac_role_id == acr.id,
+    ).filter(
+        acl.person_id == user.id,
+        acl.object_type.in_(get_contributing_resource_types(resource_type)),
+        acl.object_type != all_models.Relationship.__name__,
+        getattr(acr, action).is_(True),
+    )
+
 
 def collect_permissions(src_permissions, context_id, permissions):
   for action, resource_permissions in src_permissions.items():
@@ -139,38 +167,40 @@ def collect_permissions(src_permissions, context_id, permissions):
             })
 
 
-def query_memcache(key):
+def query_memcache(user_id):
   """Check if cached permissions are available
 
+  Cached permissions are stored under a key that contains generation
+  counters of permissions, so the lookup doesn't write to cache.
+
   Args:
-      key (string): key of the stored permissions
+      user_id (int): id of the user whose permissions are requested
   Returns:
       cache (memcache_client): memcache client or None if caching
                                is not available
+      key (string): key of the stored permissions or None if caching
+                    is not available
       permissions_cache (dict): dict with all permissions or None if there
                                 was a cache miss
+      acl_version (int): id of the last access control list entry included
+                         in cached permissions
   """
   if not getattr(settings, 'MEMCACHE_MECHANISM', False):
-    return None, None
+    return None, None, None, None
 
   cache = cache_utils.get_cache_manager().cache_object.memcache_client
-  cached_keys_set = cache.get('permissions:list') or set()
-  if key not in cached_keys_set:
-    # We set the permissions:list variable so that we are able to batch
-    # remove all permissions related keys from memcache
-    cached_keys_set.add(key)
-    cache.set('permissions:list', cached_keys_set, PERMISSION_CACHE_TIMEOUT)
-    return cache, None
+  key = cache_utils.get_permission_cache_key(cache, user_id)
+  if key is None:
+    return None, None, None, None
 
   permissions_data = cache.get(key)
   if permissions_data:
     # permissions_cache is stored in compressed state,
     # need to decompress it before using
-    permissions_cache = cPickle.loads(zlib.decompress(permissions_data))
-    # If the key is both in permissions:list and in memcache itself
-    # it is safe to return the cached permissions
-    return cache, permissions_cache
-  return cache, None
+    cached = cPickle.loads(zlib.decompress(permissions_data))
+    permissions_cache = compact.unpack_permissions(cached["permissions"])
+    return cache, key, permissions_cache, cached["acl_version"]
+  return cache, key, None, None
 
 
 def load_default_permissions(permissions):
@@ -347,17 +377,44 @@ def _get_acl_filter():
   ]
 
 
-def load_access_control_list(user, permissions):
-  """Load permissions from access_control_list"""
+def load_access_control_list(user, permissions, acl_version=None):
+  """Load permissions from access_control_list
+
+  Permissions granted by ACL entries are merged into existing permissions,
+  so cached permissions can be updated with entries created after they were
+  loaded.
+
+  ACL ids are allocated on insert but entries become visible on commit of
+  their transaction, so a concurrent transaction can still commit entries
+  with lower ids than the highest loaded one. The returned version only
+  passes entries created PERMISSION_ACL_VERSION_LAG seconds ago or earlier,
+  newer entries are loaded again with the next delta.
+
+  Args:
+      user (Person): Person object
+      permissions (dict): dict where the permissions will be stored
+      acl_version (int): if given, only entries with greater id are loaded
+                         and the filter for referenced objects is not used
+  Returns:
+      id of the last loaded ACL entry older than the lag or acl_version if
+      no such entry was loaded
+  """
   acl = all_models.AccessControlList
   acr = all_models.AccessControlRole
-  additional_filters = _get_acl_filter()
+  lag = datetime.timedelta(
+      seconds=getattr(settings, "PERMISSION_ACL_VERSION_LAG", 600))
+  settled = acl.created_at <= datetime.datetime.utcnow() - lag
+  if acl_version is None:
+    additional_filters = _get_acl_filter()
+  else:
+    additional_filters = [acl.id > acl_version]
   access_control_list = db.session.query(
       acl.object_type,
       acl.object_id,
       sa.func.max(acr.read),
       sa.func.max(acr.update),
       sa.func.max(acr.delete),
+      sa.func.max(sa.case([(settled, acl.id)])),
   ).with_hint(
       acl, "USE INDEX (ix_person_object)"
   ).filter(
@@ -372,7 +429,11 @@ def load_access_control_list(user, permissions):
       acl.object_id,
   )
 
-  for object_type, object_id, read, update, delete in access_control_list:
+  acl_version = acl_version or 0
+  for (object_type, object_id, read, update, delete,
+       last_id) in access_control_list:
+    if last_id is not None:
+      acl_version = max(acl_version, last_id)
     actions = (("read", read), ("update", update), ("delete", delete))
     for action, allowed in actions:
       if not allowed:
@@ -381,9 +442,10 @@ def load_access_control_list(user, permissions):
           .setdefault(object_type, {})\
           .setdefault('resources', set())\
           .add(object_id)
+  return acl_version
 
 
-def store_results_into_memcache(permissions, cache, key):
+def store_results_into_memcache(permissions, cache, key, acl_version):
   """Load personal context for user
 
   Args:
@@ -391,22 +453,23 @@ def store_results_into_memcache(permissions, cache, key):
       cache (cache_manager): Cache manager that should be used for storing
                              permissions
       key (string): key of under which permissions should be stored
+      acl_version (int): id of the last ACL entry included in permissions
   Returns:
       None
   """
   if cache is None:
     return
 
-  cached_keys_set = cache.get('permissions:list') or set()
-  if key in cached_keys_set:
-    # Size of permissions dict can be too big for memcache (> 1 Mb),
-    # so compressed dict will be stored.
-    compressed_permissions = zlib.compress(cPickle.dumps(permissions))
+  # Size of permissions dict can be too big for memcache (> 1 Mb),
+  # so resource ids are packed and compressed.
+  compressed_permissions = zlib.compress(cPickle.dumps({
+      "permissions": compact.pack_permissions(permissions),
+      "acl_version": acl_version,
+  }, cPickle.HIGHEST_PROTOCOL))
 
-    # We only add the permissions to the cache if the
-    # key still exists in the permissions:list after
-    # the query has executed.
-    cache.set(key, compressed_permissions, PERMISSION_CACHE_TIMEOUT)
+  # If permissions have changed while they were loaded, the generation in
+  # the key is already outdated and the stored value is never read.
+  cache.set(key, compressed_permissions, PERMISSION_CACHE_TIMEOUT)
 
 
 def load_permissions_for(user):
@@ -428,12 +491,19 @@ def load_permissions_for(user):
   'terms' are the arguments to the 'condition'.
   """
   permissions = {}
-  key = 'permissions:{}'.format(user.id)
 
   with benchmark("load_permissions > query memcache"):
-    cache, result = query_memcache(key)
-    if result:
-      return result
+    cache, key, result, acl_version = query_memcache(user.id)
+
+  if result:
+    # ACL entries created after permissions were cached are loaded as a
+    # delta, other permission changes invalidate the cached permissions.
+    with benchmark("load_permissions > load access control list delta"):
+      new_acl_version = load_access_control_list(user, result, acl_version)
+    if new_acl_version != acl_version:
+      with benchmark("load_permissions > store results into memcache"):
+        store_results_into_memcache(result, cache, key, new_acl_version)
+    return result
 
   with benchmark("load_permissions > load default permissions"):
     load_default_permissions(permissions)
@@ -451,14 +521,14 @@ def load_permissions_for(user):
     load_personal_context(user, permissions)
 
   with benchmark("load_permissions > load access control list"):
-    load_access_control_list(user, permissions)
+    acl_version = load_access_control_list(user, permissions)
 
   if not hasattr(flask.g, "referenced_object_stubs"):
     # In some cases for optimization we only load a small chunk of permissions
     # and in that case we can not cache the value because it might not contain
     # the permissions information for any subsequent request.
     with benchmark("load_permissions > store results into memcache"):
-      store_results_into_memcache(permissions, cache, key)
+      store_results_into_memcache(permissions, cache, key, acl_version)
 
   return permissions
 
@@ -529,9 +599,12 @@ def handle_resource_deleted(sender, obj=None, service=None):
      and obj.context.related_object_id \
      and obj.id == obj.context.related_object_id \
      and obj.__class__.__name__ == obj.context.related_object_type:
-    db.session.query(UserRole) \
-        .filter(UserRole.context_id == obj.context_id) \
-        .delete()
+    user_roles = db.session.query(UserRole) \
+        .filter(UserRole.context_id == obj.context_id)
+    cache_utils.mark_users_permission_changes(
+        person_id for person_id, in user_roles.with_entities(
+            UserRole.person_id))
+    user_roles.delete()
 
 
 def contributed_services():
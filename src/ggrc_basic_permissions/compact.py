@@ -0,0 +1,90 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Compact representation of permissions stored in cache.
+
+Sets of resource ids are the biggest part of permissions of users with a lot
+of ACL entries. In cache they are stored as sorted delta encoded arrays of
+unsigned ints, identical arrays (e.g. read and update resources) are stored
+only once.
+"""
+
+import array
+
+
+ID_ARRAY_TYPE = "I"
+
+
+def pack_ids(ids):
+  """Pack set of positive ints into a delta encoded byte string."""
+  deltas = array.array(ID_ARRAY_TYPE)
+  previous = 0
+  for id_ in sorted(ids):
+    deltas.append(id_ - previous)
+    previous = id_
+  return deltas.tostring()
+
+
+def unpack_ids(data):
+  """Unpack set of ints packed with pack_ids."""
+  deltas = array.array(ID_ARRAY_TYPE)
+  deltas.fromstring(data)
+  ids = set()
+  current = 0
+  for delta in deltas:
+    current += delta
+    ids.add(current)
+  return ids
+
+
+def _is_packable(resources):
+  return isinstance(resources, set) and all(
+      isinstance(id_, (int, long)) and id_ >= 0 for id_ in resources)
+
+
+def pack_permissions(permissions):
+  """Replace resource sets in permissions with indexes of packed arrays.
+
+  Args:
+    permissions: permissions dict as built by load_permissions_for, it is
+      not modified.
+
+  Returns:
+    dict with "arrays" list of packed id arrays and "permissions" dict where
+    resource sets are replaced with indexes into the arrays list.
+  """
+  arrays = []
+  indexes = {}
+  packed = {}
+  for action, types in permissions.iteritems():
+    if not isinstance(types, dict):
+      packed[action] = types
+      continue
+    packed[action] = {}
+    for type_, type_permissions in types.iteritems():
+      if (isinstance(type_permissions, dict) and
+              _is_packable(type_permissions.get("resources"))):
+        type_permissions = dict(type_permissions)
+        data = pack_ids(type_permissions["resources"])
+        if data not in indexes:
+          indexes[data] = len(arrays)
+          arrays.append(data)
+        type_permissions["resources"] = indexes[data]
+      packed[action][type_] = type_permissions
+  return {"arrays": arrays, "permissions": packed}
+
+
+def unpack_permissions(packed):
+  """Restore permissions dict packed with pack_permissions."""
+  id_sets = [unpack_ids(data) for data in packed["arrays"]]
+  permissions = packed["permissions"]
+  for types in permissions.itervalues():
+    if not isinstance(types, dict):
+      continue
+    for type_permissions in types.itervalues():
+      if (isinstance(type_permissions, dict) and
+              isinstance(type_permissions.get("resources"), int)):
+        # Every action gets its own set as sets are extended by delta loads
+        type_permissions["resources"] = set(
+            id_sets[type_permissions["resources"]])
+  return permissions
@@ -6,6 +6,7 @@
 from sqlalchemy import and_
 
 from ggrc import db
+from ggrc.cache import utils as cache_utils
 from ggrc.converters import errors
 from ggrc.converters.handlers.handlers import UserColumnHandler
 from ggrc.models import Context
@@ -50,6 +51,7 @@ class UserRoleColumnHandler(UserColumnHandler):
         UserRole.role_id.in_(allowed_role_ids),
         UserRole.person_id == self.row_converter.obj.id)
     ).delete(synchronize_session="fetch")
+    cache_utils.mark_users_permission_changes([self.row_converter.obj.id])
 
   def insert_object(self):
     if self.dry_run or not self.value:
@@ -0,0 +1,66 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for invalidation of cached permissions."""
+
+from ggrc.cache import utils as cache_utils
+from ggrc.models import all_models
+
+from integration.ggrc import TestCase
+from integration.ggrc.api_helper import Api
+from integration.ggrc.models import factories
+from integration.ggrc_basic_permissions.models \
+    import factories as rbac_factories
+
+from appengine import base
+
+
+@base.with_memcache
+class TestPermissionCache(TestCase):
+  """Test cached permissions of a Program Editor of a mapped Control."""
+
+  def setUp(self):
+    super(TestPermissionCache, self).setUp()
+    self.api = Api()
+    creator = all_models.Role.query.filter_by(name="Creator").one()
+    program_editors = all_models.AccessControlRole.query.filter_by(
+        name="Program Editors", object_type="Program").one()
+    with factories.single_commit():
+      program = factories.ProgramFactory()
+      self.control = factories.ControlFactory()
+      self.person = factories.PersonFactory()
+      rbac_factories.UserRoleFactory(role=creator, person=self.person)
+      factories.AccessControlListFactory(
+          ac_role=program_editors, object=program, person=self.person)
+    response = self.api.post(all_models.Relationship, {"relationship": {
+        "source": {"id": program.id, "type": "Program"},
+        "destination": {"id": self.control.id, "type": "Control"},
+        "context": None,
+    }})
+    self.assertEqual(response.status_code, 201)
+    self.relationship_id = response.json["relationship"]["id"]
+
+  def get_control_as_person(self):
+    """Get the Control with permissions of the Program Editor."""
+    self.api.set_user(self.person)
+    response = self.api.get(all_models.Control, self.control.id)
+    self.api.set_user()
+    return response
+
+  def test_unrelated_write(self):
+    """Writes not changing permissions keep cached permissions."""
+    self.assert200(self.get_control_as_person())
+    client = cache_utils.get_cache_manager().cache_object.memcache_client
+    generation = client.get(cache_utils.PERMISSIONS_GENERATION_KEY)
+    control = all_models.Control.query.get(self.control.id)
+    response = self.api.modify_object(control, {"title": "New title"})
+    self.assert200(response)
+    self.assertEqual(client.get(cache_utils.PERMISSIONS_GENERATION_KEY),
+                     generation)
+
+  def test_unmap_revokes_cached_access(self):
+    """Deleting propagated ACL entries invalidates cached permissions."""
+    self.assert200(self.get_control_as_person())
+    relationship = all_models.Relationship.query.get(self.relationship_id)
+    self.assert200(self.api.delete(relationship))
+    self.assert403(self.get_control_as_person())
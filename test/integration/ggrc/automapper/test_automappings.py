@@ -5,6 +5,8 @@
 
 import itertools
 from contextlib import contextmanager
+
+import mock
 from sqlalchemy.orm import load_only
 
 import ggrc
@@ -402,6 +404,61 @@ class TestAutomappings(TestCase):
     # Parent id should now be None
     assert rel2_after_delete.parent_id is None
 
+  def test_automapping_fan_out(self):
+    """Test automappings of a relationship with many related objects."""
+    with factories.single_commit():
+      program = factories.ProgramFactory()
+      regulation = factories.RegulationFactory()
+      requirements = [factories.RequirementFactory() for _ in range(5)]
+      for requirement in requirements:
+        factories.RelationshipFactory(source=regulation,
+                                      destination=requirement)
+    program = models.Program.query.get(program.id)
+    regulation = models.Regulation.query.get(regulation.id)
+
+    with mock.patch.object(automapper.AutomapperGenerator, "CHUNK_SIZE", 2):
+      rel = self.create_mapping(program, regulation)
+
+    auto = Automapping.query.filter_by(
+        source_type=rel.source_type,
+        source_id=rel.source_id,
+        destination_type=rel.destination_type,
+        destination_id=rel.destination_id,
+    ).one()
+    automapped = models.Relationship.query.filter_by(automapping_id=auto.id)
+    self.assertEqual(
+        {automapper.AutomapperGenerator.order(
+            (r.source_type, r.source_id),
+            (r.destination_type, r.destination_id),
+        ) for r in automapped},
+        {automapper.AutomapperGenerator.order(
+            ("Program", program.id), ("Requirement", requirement.id),
+        ) for requirement in requirements},
+    )
+
+  def test_automapping_single_run(self):
+    """Test relationships of one commit are automapped in one run."""
+    generate = automapper.AutomapperGenerator.generate_automappings
+    with mock.patch.object(automapper.AutomapperGenerator,
+                           "generate_automappings",
+                           autospec=True,
+                           side_effect=generate) as generate_mock:
+      with factories.single_commit():
+        program = factories.ProgramFactory()
+        regulation = factories.RegulationFactory()
+        requirements = [factories.RequirementFactory() for _ in range(3)]
+        factories.RelationshipFactory(source=program, destination=regulation)
+        for requirement in requirements:
+          factories.RelationshipFactory(source=regulation,
+                                        destination=requirement)
+
+    self.assertEqual(generate_mock.call_count, 1)
+    program = models.Program.query.get(program.id)
+    for requirement in requirements:
+      requirement = models.Requirement.query.get(requirement.id)
+      self.assertIsNotNone(models.Relationship.find_related(program,
+                                                            requirement))
+
 
 class TestIssueAutomappings(TestCase):
   """Test suite for Issue-related automappings."""
@@ -0,0 +1,78 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for compiled JSON publishers."""
+
+from ggrc.builder import compiled
+from ggrc.builder import json
+from ggrc.models import all_models
+from integration.ggrc import TestCase
+from integration.ggrc.models import factories
+
+
+class TestCompiledPublisher(TestCase):
+  """Tests for CompiledPublisher."""
+
+  def setUp(self):
+    super(TestCompiledPublisher, self).setUp()
+    self.client.get("/login")
+
+  def test_relationship_equal_to_builder(self):
+    """Compiled Relationship JSON is equal to JSON built from objects."""
+    with factories.single_commit():
+      control = factories.ControlFactory()
+      ids = [
+          factories.RelationshipFactory(
+              source=control, destination=factories.MarketFactory()).id
+          for _ in range(3)
+      ]
+    publisher = compiled.get_compiled_publisher(all_models.Relationship)
+    self.assertIsNotNone(publisher)
+
+    compiled_json = json.publish_representation(publisher.publish(ids))
+    built_json = json.publish_representation({
+        obj.id: json.publish(obj)
+        for obj in all_models.Relationship.query.filter(
+            all_models.Relationship.id.in_(ids))
+    })
+    self.assertEqual(compiled_json, built_json)
+
+  def test_polymorphic_target_equal_to_builder(self):
+    """Stubs of polymorphic targets have types of the target objects."""
+    with factories.single_commit():
+      control = factories.ControlFactory()
+      control.categories.append(factories.ControlCategoryFactory())
+      control.assertions.append(
+          all_models.ControlAssertion(name="Control assertion"))
+    ids = [categorization.id
+           for categorization in all_models.Categorization.query]
+    publisher = compiled.get_compiled_publisher(all_models.Categorization)
+    self.assertIsNotNone(publisher)
+
+    compiled_json = json.publish_representation(publisher.publish(ids))
+    built_json = json.publish_representation({
+        obj.id: json.publish(obj)
+        for obj in all_models.Categorization.query.filter(
+            all_models.Categorization.id.in_(ids))
+    })
+    self.assertEqual(compiled_json, built_json)
+    self.assertEqual(
+        {json_obj["category"]["type"] for json_obj in compiled_json.values()},
+        {"ControlCategory", "ControlAssertion"},
+    )
+
+  def test_attribute_whitelist(self):
+    """Only whitelisted attributes are published."""
+    relationship_id = factories.RelationshipFactory(
+        source=factories.ControlFactory(),
+        destination=factories.MarketFactory(),
+    ).id
+    publisher = compiled.get_compiled_publisher(all_models.Relationship)
+    json_obj = publisher.publish([relationship_id], ["id", "source"])
+    self.assertEqual(set(json_obj[relationship_id]),
+                     {"id", "source", "selfLink"})
+
+  def test_not_compilable(self):
+    """Models with custom published attributes are not compiled."""
+    self.assertIsNone(
+        compiled.get_compiled_publisher(all_models.Assessment))
@@ -2,10 +2,14 @@
 # Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
 
 from mock import MagicMock
+from mock import patch
 
 import ggrc.builder
 import ggrc.models
+from ggrc.models import all_models
+from ggrc.builder.json import get_json_builder
 from ggrc.builder.json import publish
+from ggrc.builder.json import UpdateAttrHandler
 from ggrc.services.common import Resource
 from integration.ggrc import TestCase
 
@@ -111,3 +115,28 @@ class TestBuilder(TestCase):
     self.assertDictContainsSubset(
         {'prop_b': 'prop_b', 'mixin': 'mixin_b'},
         json_obj)
+
+  def test_publish_plan_cached(self):
+    """Attribute publishing is resolved only on the first publish."""
+    self.mock_service('MockPlanModel')
+    model = self.mock_model(
+        'MockPlanModel',
+        foo='bar',
+        id=1,
+        _publish_attrs=['foo'],
+    )
+    publish(model)
+    builder = get_json_builder(model)
+    with patch.object(builder, '_compile_publish_accessor') as compile_:
+      json_obj = publish(model)
+    self.assertFalse(compile_.called)
+    self.assertEqual('bar', json_obj['foo'])
+
+  def test_updater_cached(self):
+    """Attribute update is resolved once per model and attribute."""
+    updater = UpdateAttrHandler.get_updater(all_models.Control, 'title')
+    self.assertIs(
+        UpdateAttrHandler.get_updater(all_models.Control, 'title'), updater)
+    control = all_models.Control(title='old')
+    updater(control, {'title': 'new'})
+    self.assertEqual(control.title, 'new')
@@ -74,6 +74,38 @@ class TestBaseBlock(TestCase):
       )
       self.assertLess(counter.get, self.QUERY_LIMIT)
 
+  def test_chunked_row_data(self):
+    """Test export rows rendered in chunks with mappings of their chunk."""
+    with factories.single_commit():
+      regulations = [factories.RegulationFactory() for _ in range(5)]
+      markets = [factories.MarketFactory() for _ in range(5)]
+      for regulation, market in zip(regulations, markets):
+        factories.RelationshipFactory(source=regulation, destination=market)
+      expected = {
+          regulation.slug: market.slug
+          for regulation, market in zip(regulations, markets)
+      }
+
+    block = base_block.ExportBlockConverter(
+        mock.MagicMock(export_pool=None),
+        object_class=models.Regulation,
+        fields=["slug", "__mapping__:market"],
+        object_ids=[r.id for r in regulations],
+        class_name=models.Regulation.__name__,
+    )
+    slug_index = block.fields.index("slug")
+    market_index = block.fields.index("__mapping__:market")
+
+    with mock.patch.object(block, "ROW_CHUNK_SIZE", 2):
+      rows = list(block.generate_row_data())
+
+    self.assertEqual(
+        {row[slug_index]: row[market_index] for row in rows},
+        expected,
+    )
+    # Only mappings of the last chunk are kept in the cache
+    self.assertEqual(len(block.get_mapping_cache()), 1)
+
   def test_get_identifier_mappings(self):
     """Test _get_identifier_mappings function."""
     count = 3
@@ -0,0 +1,72 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for exports rendered in a pool of worker processes."""
+
+from datetime import datetime
+
+import mock
+
+from ggrc import settings
+from ggrc.converters import base_block
+from ggrc.converters import export_pool
+from ggrc.models import all_models
+from ggrc.views import converters
+
+from integration.ggrc import TestCase
+from integration.ggrc.models import factories
+
+
+class TestExportPool(TestCase):
+  """Tests for background exports with EXPORT_PROCESSES workers."""
+
+  def setUp(self):
+    super(TestExportPool, self).setUp()
+    self.client.get("/login")
+    for patcher in [
+        mock.patch.object(base_block.ExportBlockConverter,
+                          "ROW_CHUNK_SIZE", 2),
+        mock.patch("ggrc.views.converters.check_for_previous_run"),
+        mock.patch("ggrc.notifications.job_emails.send_email"),
+    ]:
+      patcher.start()
+      self.addCleanup(patcher.stop)
+    with factories.single_commit():
+      controls = [
+          factories.ControlFactory(title="Control {}".format(i))
+          for i in range(7)
+      ]
+    self.ids = [control.id for control in controls]
+    self.titles = [control.title for control in controls]
+
+  def run_export(self, processes):
+    """Run export job of all controls with the given number of workers."""
+    user = all_models.Person.query.first()
+    ie_id = factories.ImportExportFactory(
+        job_type="Export",
+        status="In Progress",
+        created_at=datetime.now(),
+        created_by=user,
+        title="export.csv",
+    ).id
+    objects = [{"object_name": "Control", "ids": self.ids}]
+    with mock.patch.object(settings, "EXPORT_PROCESSES", processes,
+                           create=True):
+      converters.run_export(objects, ie_id, user.id, "http://localhost/")
+    return all_models.ImportExport.query.get(ie_id)
+
+  def test_rows_rendered_in_workers(self):
+    """Export rendered by workers is equal to export rendered in process."""
+    in_process = self.run_export(1)
+    with mock.patch.object(export_pool.ExportPool, "render_chunks",
+                           autospec=True,
+                           side_effect=export_pool.ExportPool.render_chunks
+                           ) as render_chunks:
+      in_workers = self.run_export(2)
+
+    self.assertEqual(render_chunks.call_count, 1)
+    self.assertEqual(in_process.status, "Finished")
+    self.assertEqual(in_workers.status, "Finished")
+    self.assertEqual(in_workers.content, in_process.content)
+    for title in self.titles:
+      self.assertIn(title, in_workers.content)
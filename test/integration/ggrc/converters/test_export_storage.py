@@ -0,0 +1,89 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for exports written to the blob store."""
+
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+import mock
+
+from ggrc import settings
+from ggrc.models import all_models
+from ggrc.views import converters
+
+from integration.ggrc import TestCase
+from integration.ggrc.models import factories
+
+
+class TestExportStorage(TestCase):
+  """Tests for background exports written to the blob store."""
+
+  def setUp(self):
+    super(TestExportStorage, self).setUp()
+    self.client.get("/login")
+    self.headers = {
+        "Content-Type": "application/json",
+        "X-Requested-By": ["GGRC"],
+    }
+    self.storage_path = tempfile.mkdtemp()
+    self.addCleanup(shutil.rmtree, self.storage_path)
+    patcher = mock.patch.object(settings, "BLOB_STORAGE_PATH",
+                                self.storage_path, create=True)
+    patcher.start()
+    self.addCleanup(patcher.stop)
+
+  def run_export(self, object_name, ids):
+    """Create export job and run it in the current process."""
+    user = all_models.Person.query.first()
+    ie_job = factories.ImportExportFactory(
+        job_type="Export",
+        status="In Progress",
+        created_at=datetime.now(),
+        created_by=user,
+        title="export.csv",
+    )
+    ie_id, user_id = ie_job.id, user.id
+    objects = [{"object_name": object_name, "ids": ids}]
+    with mock.patch("ggrc.views.converters.check_for_previous_run"):
+      with mock.patch("ggrc.notifications.job_emails.send_email"):
+        converters.run_export(objects, ie_id, user_id,
+                              "http://localhost/")
+    return all_models.ImportExport.query.get(ie_id), user_id
+
+  def test_export_to_store(self):
+    """Export content is written to the store instead of the database."""
+    with factories.single_commit():
+      controls = [factories.ControlFactory(title="Control {}".format(i))
+                  for i in range(3)]
+    ids = [control.id for control in controls]
+
+    ie_job, user_id = self.run_export("Control", ids)
+
+    self.assertEqual(ie_job.status, "Finished")
+    self.assertIsNone(ie_job.content)
+    self.assertEqual((ie_job.rows_written, ie_job.rows_total), (3, 3))
+    path = os.path.join(self.storage_path, ie_job.storage_key)
+    self.assertTrue(os.path.exists(path))
+
+    response = self.client.get(
+        "/api/people/{}/exports/{}/download?export_to=csv".format(
+            user_id, ie_job.id),
+        headers=self.headers)
+    self.assert200(response)
+    for control in controls:
+      self.assertIn(control.title, response.data)
+
+  def test_delete_removes_file(self):
+    """Deleting export job removes its file from the store."""
+    control = factories.ControlFactory()
+    ie_job, user_id = self.run_export("Control", [control.id])
+    path = os.path.join(self.storage_path, ie_job.storage_key)
+
+    response = self.client.delete(
+        "/api/people/{}/exports/{}".format(user_id, ie_job.id),
+        headers=self.headers)
+    self.assert200(response)
+    self.assertFalse(os.path.exists(path))
@@ -1,8 +1,13 @@
 # Copyright (C) 2018 Google Inc.
 # Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
 
+from collections import OrderedDict
+
+from ggrc.converters import errors
+from ggrc.models import all_models
 from integration.ggrc import TestCase
 from integration.ggrc.generator import ObjectGenerator
+from integration.ggrc.models import factories
 
 
 class TestBasicCsvImport(TestCase):
@@ -29,3 +34,29 @@ class TestBasicCsvImport(TestCase):
     for i in range(1, 8):
       self.assertIn("reg-{}".format(i), response.data)
       self.assertIn("section-{}".format(i), response.data)
+
+  def test_single_audit_restriction(self):
+    """Row mapping Issue to Assessment of another Audit is rolled back."""
+    with factories.single_commit():
+      audit, other_audit = factories.AuditFactory(), factories.AuditFactory()
+      issue = factories.IssueFactory()
+      factories.RelationshipFactory(source=audit, destination=issue)
+      assessment = factories.AssessmentFactory(audit=other_audit)
+      factories.RelationshipFactory(source=other_audit,
+                                    destination=assessment)
+    audit_id, issue_id = audit.id, issue.id
+
+    response = self.import_data(OrderedDict([
+        ("object_type", "Issue"),
+        ("Code*", issue.slug),
+        ("map:Assessment", assessment.slug),
+    ]))
+
+    self._check_csv_response(response, {
+        "Issue": {
+            "row_errors": {errors.UNKNOWN_ERROR.format(line=3)},
+        },
+    })
+    related = all_models.Issue.query.get(issue_id).related_objects()
+    self.assertEqual({(obj.type, obj.id) for obj in related},
+                     {("Audit", audit_id)})
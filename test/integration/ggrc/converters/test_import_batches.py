@@ -0,0 +1,140 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for imports committed in batches of rows."""
+
+from collections import OrderedDict
+
+import mock
+
+from ggrc import settings
+from ggrc.converters import errors
+from ggrc.models import all_models
+from ggrc.utils import log_event
+
+from integration.ggrc import TestCase
+from integration.ggrc.models import factories
+
+
+class TestImportBatches(TestCase):
+  """Tests for rows committed in batches."""
+
+  def setUp(self):
+    super(TestImportBatches, self).setUp()
+    self.client.get("/login")
+    patcher = mock.patch.object(settings, "IMPORT_BATCH_SIZE", 2,
+                                create=True)
+    patcher.start()
+    self.addCleanup(patcher.stop)
+
+  def test_batch_import(self):
+    """Rows imported in batches get revisions of one event per batch."""
+    market = factories.MarketFactory()
+    data = [OrderedDict([
+        ("object_type", "Issue"),
+        ("Code*", ""),
+        ("Title*", "Test issue {}".format(i)),
+        ("Admin*", "user@example.com"),
+        ("map:Market", market.slug),
+    ]) for i in range(3)]
+
+    response = self.import_data(*data)
+
+    self._check_csv_response(response, {})
+    self.assertEqual(response[0]["created"], 3)
+    issues = all_models.Issue.query.order_by(all_models.Issue.id).all()
+    self.assertEqual(len(issues), 3)
+    for issue in issues:
+      self.assertEqual([obj.slug for obj in issue.related_objects()],
+                       [market.slug])
+    events = [
+        all_models.Revision.query.filter_by(
+            resource_type="Issue",
+            resource_id=issue.id,
+        ).one().event_id
+        for issue in issues
+    ]
+    self.assertEqual(events[0], events[1])
+    self.assertNotEqual(events[1], events[2])
+
+  def test_batch_import_update(self):
+    """Rows updated in batches are committed."""
+    with factories.single_commit():
+      issues = [factories.IssueFactory() for _ in range(3)]
+    data = [OrderedDict([
+        ("object_type", "Issue"),
+        ("Code*", issue.slug),
+        ("Title*", "Updated {}".format(issue.slug)),
+    ]) for issue in issues]
+
+    response = self.import_data(*data)
+
+    self._check_csv_response(response, {})
+    self.assertEqual(response[0]["updated"], 3)
+    for issue in all_models.Issue.query:
+      self.assertEqual(issue.title, "Updated {}".format(issue.slug))
+
+  def test_failed_batch(self):
+    """Rows of a batch that failed to commit are rolled back."""
+    data = [OrderedDict([
+        ("object_type", "Market"),
+        ("Code*", "market-failed-{}".format(i)),
+        ("Title*", "Test market {}".format(i)),
+        ("Admin*", "user@example.com"),
+    ]) for i in range(2)]
+    # A later row maps to an object of the failed batch
+    data.append(OrderedDict([
+        ("object_type", "Issue"),
+        ("Code*", ""),
+        ("Title*", "Test issue"),
+        ("Admin*", "user@example.com"),
+        ("map:Market", "market-failed-0"),
+    ]))
+    calls = []
+
+    def fail_first_event(session, obj):
+      calls.append(obj)
+      if len(calls) == 1:
+        raise ValueError("Failed event")
+      return log_event.log_event(session, obj)
+
+    with mock.patch("ggrc.converters.base_block.log_event",
+                    side_effect=fail_first_event):
+      response = self.import_data(*data)
+
+    self._check_csv_response(response, {
+        "Market": {
+            "created": 0,
+            "row_errors": {
+                errors.UNKNOWN_ERROR.format(line=3),
+                errors.UNKNOWN_ERROR.format(line=4),
+            },
+        },
+        "Issue": {
+            "created": 1,
+            "row_warnings": {
+                errors.UNKNOWN_OBJECT.format(line=8, object_type="Market",
+                                             slug="market-failed-0"),
+            },
+        },
+    })
+    self.assertEqual(all_models.Market.query.count(), 0)
+    issue = all_models.Issue.query.one()
+    self.assertEqual(issue.title, "Test issue")
+    self.assertEqual(issue.related_objects(), set())
+
+  def test_failed_post_commit_updates(self):
+    """Rows are not failed by errors after their commit."""
+    data = [OrderedDict([
+        ("object_type", "Issue"),
+        ("Code*", ""),
+        ("Title*", "Test issue {}".format(i)),
+        ("Admin*", "user@example.com"),
+    ]) for i in range(2)]
+
+    with mock.patch("ggrc.converters.base_block.update_snapshot_index",
+                    side_effect=ValueError("Failed index update")):
+      response = self.import_data(*data)
+
+    self._check_csv_response(response, {"Issue": {"created": 2}})
+    self.assertEqual(all_models.Issue.query.count(), 2)
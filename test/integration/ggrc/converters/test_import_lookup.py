@@ -0,0 +1,84 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for lookup indexes of import dry runs."""
+
+from collections import OrderedDict
+
+import mock
+
+from ggrc.converters import import_lookup
+from ggrc.models import all_models
+
+from integration.ggrc import TestCase
+from integration.ggrc.models import factories
+
+
+class TestImportLookup(TestCase):
+  """Tests for ImportLookup."""
+
+  def setUp(self):
+    super(TestImportLookup, self).setUp()
+    self.client.get("/login")
+
+  def import_with_lookup(self, data, dry_run):
+    """Import data and return lookups built by the import."""
+    lookups = []
+    build = import_lookup.ImportLookup.build
+
+    def build_and_store(lookup, block_converters):
+      lookups.append(lookup)
+      build(lookup, block_converters)
+
+    with mock.patch.object(import_lookup.ImportLookup, "build",
+                           build_and_store):
+      response = self.import_data(*data, dry_run=dry_run)
+    return response, lookups
+
+  def test_dry_run_lookup(self):
+    """Referenced people and objects are resolved before a dry run."""
+    with factories.single_commit():
+      person = factories.PersonFactory(email="lookup@example.com")
+      market = factories.MarketFactory()
+    data = [OrderedDict([
+        ("object_type", "Issue"),
+        ("Code*", "ISSUE-{}".format(i)),
+        ("Title*", "Issue {}".format(i)),
+        ("Admin*", "lookup@example.com\nunknown@example.com"),
+        ("map:Market", market.slug),
+    ]) for i in range(3)]
+
+    response, lookups = self.import_with_lookup(data, dry_run=True)
+
+    self.assertEqual(response[0]["created"], 3)
+    self.assertEqual(len(response[0]["row_warnings"]), 3)
+    lookup, = lookups
+    self.assertEqual(
+        {email: p and p.id for email, p in lookup.people.iteritems()},
+        {"lookup@example.com": person.id, "unknown@example.com": None},
+    )
+    self.assertEqual(
+        {(model.__name__, slug): obj and obj.id
+         for (model, slug), obj in lookup.objects.iteritems()},
+        {
+            ("Market", market.slug.lower()): market.id,
+            ("Issue", "issue-0"): None,
+            ("Issue", "issue-1"): None,
+            ("Issue", "issue-2"): None,
+        },
+    )
+    self.assertEqual(all_models.Issue.query.count(), 0)
+
+  def test_no_lookup_on_import(self):
+    """Lookup indexes are not built for imports that change data."""
+    data = [OrderedDict([
+        ("object_type", "Issue"),
+        ("Code*", ""),
+        ("Title*", "Issue"),
+        ("Admin*", "user@example.com"),
+    ])]
+
+    response, lookups = self.import_with_lookup(data, dry_run=False)
+
+    self._check_csv_response(response, {})
+    self.assertEqual(lookups, [])
@@ -0,0 +1,59 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for diff based update of fulltext records."""
+
+from ggrc import db
+from ggrc.fulltext import mysql
+from ggrc.models import all_models
+from integration.ggrc import TestCase
+from integration.ggrc.models import factories
+
+
+class TestDiffUpdate(TestCase):
+  """Tests for Indexed.bulk_record_update_for in diff mode."""
+
+  def setUp(self):
+    super(TestDiffUpdate, self).setUp()
+    with factories.single_commit():
+      self.control_id = factories.ControlFactory(title="old title").id
+
+  def _get_records(self):
+    """Get fulltext records of the control."""
+    record = mysql.MysqlRecordProperty
+    return {
+        (row.property, row.subproperty): row.content
+        for row in record.query.filter(record.type == "Control",
+                                       record.key == self.control_id)
+    }
+
+  def test_unchanged(self):
+    """Nothing is written if records are up to date."""
+    records = self._get_records()
+    touched = all_models.Control.bulk_record_update_for([self.control_id],
+                                                        diff=True)
+    self.assertEqual(touched, 0)
+    self.assertEqual(self._get_records(), records)
+
+  def test_changed_property(self):
+    """Only changed records are written."""
+    db.session.execute(
+        all_models.Control.__table__.update().where(
+            all_models.Control.id == self.control_id
+        ).values(title="new title", description="")
+    )
+    db.session.execute(
+        mysql.MysqlRecordProperty.__table__.insert().values(
+            key=self.control_id, type="Control", tags="",
+            property="stale", subproperty="", content="stale",
+        )
+    )
+    touched = all_models.Control.bulk_record_update_for([self.control_id],
+                                                        diff=True)
+    diff_records = self._get_records()
+    self.assertEqual(diff_records[("title", "")], "new title")
+    self.assertNotIn(("stale", ""), diff_records)
+    self.assertIn(touched, (2, 3))
+
+    all_models.Control.bulk_record_update_for([self.control_id], diff=False)
+    self.assertEqual(self._get_records(), diff_records)
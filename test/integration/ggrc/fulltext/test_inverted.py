@@ -0,0 +1,69 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for search in FULLTEXT inverted index."""
+
+import ddt
+import mock
+
+from ggrc import settings
+from ggrc.fulltext import inverted
+from integration.ggrc import TestCase
+from integration.ggrc.api_helper import Api
+from integration.ggrc.models import factories
+from integration.ggrc.query_helper import WithQueryApi
+
+
+@ddt.ddt
+class TestInvertedIndexer(WithQueryApi, TestCase):
+  """Tests for InvertedIndexer."""
+
+  def setUp(self):
+    super(TestInvertedIndexer, self).setUp()
+    self.indexer = inverted.InvertedIndexer(settings)
+    for target in ["ggrc.services.search.get_indexer",
+                   "ggrc.query.custom_operators.get_indexer"]:
+      patcher = mock.patch(target, return_value=self.indexer)
+      patcher.start()
+      self.addCleanup(patcher.stop)
+    self.api = Api()
+    self.client.get("/login")
+    with factories.single_commit():
+      self.matching_id = factories.ControlFactory(
+          title="Quarterly revenue reconciliation").id
+      factories.ControlFactory(title="Annual access review")
+
+  @ddt.data(
+      (u"revenue", u"+revenue*"),
+      (u"rev recon", u"+rev* +recon*"),
+      (u"a b", None),
+      (u"+rev* (x)", u"+rev*"),
+  )
+  @ddt.unpack
+  def test_match_query(self, terms, expected):
+    """Terms are converted to boolean mode prefix queries."""
+    self.assertEqual(self.indexer.get_match_query(terms), expected)
+
+  def test_ngram_match_query(self):
+    """Terms are searched as phrases in ngram indexes."""
+    self.indexer.parser = "ngram"
+    self.assertEqual(self.indexer.get_match_query(u"venue rec"),
+                     u'"venue rec"')
+
+  @ddt.data(u"revenue", u"quarterly rev", u"Reconcil")
+  def test_text_search(self, text):
+    """text_search finds objects with words starting with the terms."""
+    data = self._make_query_dict("Control")
+    data["filters"]["expression"] = {
+        "op": {"name": "text_search"},
+        "text": text,
+    }
+    controls = self._get_first_result_set(data, "Control", "values")
+    self.assertEqual([control["id"] for control in controls],
+                     [self.matching_id])
+
+  def test_search(self):
+    """/search finds objects in the index."""
+    response, _ = self.api.search("Control", query="revenue")
+    entries = response.json["results"]["entries"]
+    self.assertEqual([entry["id"] for entry in entries], [self.matching_id])
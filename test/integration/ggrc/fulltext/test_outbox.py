@@ -0,0 +1,65 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for asynchronous fulltext indexing with outbox."""
+
+import json
+
+import mock
+
+from ggrc import settings
+from ggrc.fulltext import mysql
+from ggrc.fulltext import outbox
+from ggrc.models import all_models
+from integration.ggrc import TestCase, Api
+from integration.ggrc.models import factories
+
+
+@mock.patch.object(settings, "FULLTEXT_INDEXING_MODE", "async", create=True)
+class TestFulltextOutbox(TestCase):
+  """Tests for fulltext outbox."""
+
+  def setUp(self):
+    super(TestFulltextOutbox, self).setUp()
+    self.api = Api()
+    self.client.get("/login")
+
+  @staticmethod
+  def _title_records(control_id):
+    return mysql.MysqlRecordProperty.query.filter(
+        mysql.MysqlRecordProperty.type == "Control",
+        mysql.MysqlRecordProperty.key == control_id,
+        mysql.MysqlRecordProperty.property == "title",
+    )
+
+  def test_edits_collapsed(self):
+    """Repeated edits are indexed once after the outbox is drained."""
+    control = factories.ControlFactory(title="old title")
+    control_id = control.id
+    outbox.drain()
+    for title in ["first title", "second title"]:
+      control = all_models.Control.query.get(control_id)
+      self.assert200(self.api.put(control, {"title": title}))
+    self.assertEqual(self._title_records(control_id).one().content,
+                     "old title")
+    pending = outbox.get_status()["pending"]
+    self.assertGreaterEqual(pending, 2)
+
+    with mock.patch.object(
+        all_models.Control, "bulk_record_update_for",
+        wraps=all_models.Control.bulk_record_update_for,
+    ) as update:
+      self.assertEqual(outbox.drain(), pending)
+    self.assertEqual(update.call_count, 1)
+    self.assertEqual(self._title_records(control_id).one().content,
+                     "second title")
+    self.assertEqual(outbox.get_status()["pending"], 0)
+
+  def test_status_api(self):
+    """Admin can get indexing lag."""
+    factories.ControlFactory()
+    response = self.client.get("/admin/fulltext_outbox")
+    self.assert200(response)
+    status = json.loads(response.data)
+    self.assertEqual(status["mode"], "async")
+    self.assertGreater(status["pending"], 0)
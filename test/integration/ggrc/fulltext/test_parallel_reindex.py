@@ -0,0 +1,76 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for partitioned and resumable full reindex."""
+
+import mock
+
+from ggrc.fulltext import mysql
+from ggrc.fulltext import reindex
+from ggrc.models import all_models
+from integration.ggrc import TestCase
+from integration.ggrc.models import factories
+
+
+class TestParallelReindex(TestCase):
+  """Tests for partitioned full reindex."""
+
+  def setUp(self):
+    super(TestParallelReindex, self).setUp()
+    with factories.single_commit():
+      self.control_ids = [factories.ControlFactory().id for _ in range(3)]
+    mysql.MysqlRecordProperty.query.delete()
+
+  def _control_records(self):
+    return mysql.MysqlRecordProperty.query.filter(
+        mysql.MysqlRecordProperty.type == "Control",
+        mysql.MysqlRecordProperty.property == "title",
+    )
+
+  def test_partitions(self):
+    """Id ranges of partitions are aligned to the partition size."""
+    partitions = reindex.plan_partitions(["Control"], partition_size=2)
+    for partition in partitions:
+      self.assertEqual(partition.min_id % 2, 0)
+      self.assertEqual(partition.max_id, partition.min_id + 1)
+    covered = {id_ for partition in partitions
+               for id_ in range(partition.min_id, partition.max_id + 1)}
+    self.assertTrue(set(self.control_ids) <= covered)
+
+  def test_reindex_with_checkpoints(self):
+    """Reindex stores checkpoints and reports throughput per model."""
+    report = reindex.run(["Control"], partition_size=2)
+
+    self.assertEqual(
+        {key for key, in self._control_records().values("key")},
+        set(self.control_ids),
+    )
+    self.assertEqual(report["models"]["Control"]["objects"], 3)
+    self.assertEqual(
+        sum(c.objects for c in reindex.ReindexCheckpoint.query), 3)
+
+  def test_resume(self):
+    """Resumed reindex skips finished partitions."""
+    reindex.run(["Control"], partition_size=2)
+    done = reindex.ReindexCheckpoint.query.first()
+    reindex.ReindexCheckpoint.query.filter(
+        reindex.ReindexCheckpoint.id != done.id).delete()
+
+    with mock.patch.object(
+        all_models.Control, "bulk_record_update_for",
+        wraps=all_models.Control.bulk_record_update_for,
+    ) as update:
+      report = reindex.run(["Control"], resume=True, partition_size=2)
+
+    reindexed = {id_ for call in update.call_args_list for id_ in call[0][0]}
+    self.assertFalse(reindexed & set(range(done.min_id, done.max_id + 1)))
+    self.assertEqual(report["models"]["Control"]["objects"],
+                     3 - done.objects)
+
+  def test_snapshot_partition(self):
+    """Snapshots are reindexed as a single partition."""
+    with mock.patch("ggrc.snapshotter.indexer.reindex",
+                    return_value=0) as snapshot_reindex:
+      report = reindex.run([], with_snapshots=True)
+    snapshot_reindex.assert_called_once_with(processes=1)
+    self.assertIn("Snapshot", report["models"])
@@ -217,7 +217,7 @@ class TestImportExports(TestCase):
     observed_columns = set(result.keys())
     expected_columns = set(
         column.name for column in all_models.ImportExport.__table__.columns
-        if column.name not in ('content', 'gdrive_metadata')
+        if column.name not in ('content', 'gdrive_metadata', 'storage_key')
     )
     self.assertEqual(observed_columns, expected_columns)
 
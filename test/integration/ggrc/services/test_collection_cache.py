@@ -0,0 +1,55 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for caching of collection GET resources."""
+
+import mock
+
+from ggrc import settings
+from ggrc.models import all_models
+
+from integration.ggrc import TestCase
+from integration.ggrc.api_helper import Api
+from integration.ggrc.models import factories
+
+from appengine import base
+
+
+@base.with_memcache
+class TestCollectionCache(TestCase):
+  """Test shared cache of published collection objects."""
+
+  def setUp(self):
+    super(TestCollectionCache, self).setUp()
+    self.api = Api()
+    with factories.single_commit():
+      self.control_id = factories.ControlFactory().id
+    self.key = "collection:controls:{}".format(self.control_id)
+
+  def get_controls(self):
+    response = self.api.get_query(all_models.Control, "")
+    self.assert200(response)
+    return response.json["controls_collection"]["controls"]
+
+  def test_disabled_by_default(self):
+    """Collection objects are not cached without COLLECTION_CACHE."""
+    with mock.patch.object(settings, "COLLECTION_CACHE", False, create=True):
+      self.get_controls()
+    self.assertIsNone(self.memcache_client.get(self.key))
+
+  def test_cached_objects(self):
+    """Published objects are cached and reused."""
+    with mock.patch.object(settings, "COLLECTION_CACHE", True, create=True):
+      controls = self.get_controls()
+      self.assertIsNotNone(self.memcache_client.get(self.key))
+      with mock.patch("ggrc.services.common.Resource."
+                      "get_resources_from_database") as from_database:
+        self.assertEqual(self.get_controls(), controls)
+    from_database.assert_not_called()
+
+  def test_pending_delete(self):
+    """Objects with pending DeleteOp entries are not cached."""
+    self.memcache_client.add("DeleteOp:" + self.key, "InProgress")
+    with mock.patch.object(settings, "COLLECTION_CACHE", True, create=True):
+      self.get_controls()
+    self.assertIsNone(self.memcache_client.get(self.key))
@@ -0,0 +1,79 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for streamed collection GET responses."""
+
+import json
+
+import mock
+
+from ggrc.models import all_models
+from ggrc.services import common
+from integration.ggrc import TestCase
+from integration.ggrc.api_helper import Api
+from integration.ggrc.models import factories
+
+
+class TestCollectionStream(TestCase):
+  """Test collection GET with `__stream` argument."""
+
+  def setUp(self):
+    super(TestCollectionStream, self).setUp()
+    self.api = Api()
+
+  def get_streamed(self, query=""):
+    """Get streamed Control collection and decode its body."""
+    response = self.api.client.get(
+        "/api/controls?__stream{}".format(query),
+        headers=self.api.headers,
+    )
+    self.assert200(response)
+    return json.loads(response.data)
+
+  def test_stream_matches_collection(self):
+    """Streamed collection contains the same objects as regular one."""
+    with factories.single_commit():
+      control_ids = [factories.ControlFactory().id for _ in range(7)]
+
+    with mock.patch.object(common.Resource, "STREAM_CHUNK_SIZE", 3):
+      streamed = self.get_streamed()
+    regular = self.api.get_query(all_models.Control, "").json
+
+    streamed_ids = [
+        obj["id"] for obj in streamed["controls_collection"]["controls"]
+    ]
+    self.assertEqual(streamed_ids, sorted(control_ids))
+    self.assertItemsEqual(
+        streamed["controls_collection"]["controls"],
+        regular["controls_collection"]["controls"],
+    )
+    self.assertIn("selfLink", streamed["controls_collection"])
+
+  def test_stream_empty_collection(self):
+    """Streamed empty collection is a valid JSON document."""
+    streamed = self.get_streamed()
+    self.assertEqual(streamed["controls_collection"]["controls"], [])
+
+  def test_stream_fields(self):
+    """Streamed collection respects `__fields` argument."""
+    with factories.single_commit():
+      control = factories.ControlFactory()
+
+    streamed = self.get_streamed("&__fields=id,title")
+    self.assertEqual(
+        streamed["controls_collection"]["controls"],
+        [{"id": control.id, "title": control.title}],
+    )
+
+  def test_stream_keeps_sort(self):
+    """Collection with `__sort` argument keeps the requested order."""
+    with factories.single_commit():
+      for title in ("b", "c", "a"):
+        factories.ControlFactory(title=title)
+
+    with mock.patch.object(common.Resource, "STREAM_CHUNK_SIZE", 2):
+      streamed = self.get_streamed("&__sort=title&__sort_desc=true")
+    self.assertEqual(
+        [obj["title"] for obj in streamed["controls_collection"]["controls"]],
+        ["c", "b", "a"],
+    )
@@ -0,0 +1,81 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for batched execution of several object queries in /query api."""
+
+import json
+
+from ggrc import utils
+
+from integration.ggrc import TestCase
+from integration.ggrc.models import factories
+from integration.ggrc.query_helper import WithQueryApi
+
+
+class TestBatchedQueries(WithQueryApi, TestCase):
+  """Test /query api with several object queries per request."""
+
+  def setUp(self):
+    super(TestBatchedQueries, self).setUp()
+    self.client.get("/login")
+    with factories.single_commit():
+      self.controls = [
+          factories.ControlFactory(title="control {}".format(i))
+          for i in range(5)
+      ]
+
+  def _title_query(self, titles, **kwargs):
+    """Make values query for Controls with given titles."""
+    return self._make_query_dict(
+        "Control",
+        expression=["title", "IN", titles],
+        order_by=[{"name": "title"}],
+        **kwargs
+    )
+
+  def test_batched_results(self):
+    """Each query gets its own results from a batch."""
+    queries = [
+        self._title_query(["control 0", "control 1", "control 2"]),
+        self._title_query(["control 2", "control 3"]),
+        self._title_query(["control 3", "control 4"], type_="ids"),
+        self._title_query(["control 0", "control 4"], limit=[1, 2]),
+    ]
+    expected = [self._get_first_result_set(query, "Control")
+                for query in queries]
+
+    response = self._post(queries)
+    self.assert200(response)
+    results = [result["Control"] for result in json.loads(response.data)]
+    self.assertEqual(results, expected)
+    self.assertEqual(
+        [obj["title"] for obj in results[1]["values"]],
+        ["control 2", "control 3"],
+    )
+    self.assertEqual(results[3]["count"], 1)
+    self.assertEqual(results[3]["total"], 2)
+
+  def test_batched_fields(self):
+    """Queries for the same objects can request different fields."""
+    queries = [
+        self._title_query(["control 0"]),
+        self._title_query(["control 0"]),
+    ]
+    queries[1]["fields"] = ["title"]
+    response = self._post(queries)
+    self.assert200(response)
+    results = [result["Control"] for result in json.loads(response.data)]
+    self.assertIn("slug", results[0]["values"][0])
+    self.assertEqual(results[1]["values"], [{"title": "control 0"}])
+
+  def test_objects_loaded_once(self):
+    """Objects for queries of the same type are loaded in one batch."""
+    query = self._title_query(["control 0", "control 1"])
+    with utils.QueryCounter() as counter:
+      self.assert200(self._post([query]))
+      single_query_count = counter.get
+    with utils.QueryCounter() as counter:
+      self.assert200(self._post([query] * 3))
+      batch_query_count = counter.get
+    # Only the id queries are executed for every object query.
+    self.assertEqual(batch_query_count - single_query_count, 2)
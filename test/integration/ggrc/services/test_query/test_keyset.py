@@ -0,0 +1,83 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for keyset pagination in /query api."""
+
+import ddt
+
+from integration.ggrc import TestCase
+from integration.ggrc.models import factories
+from integration.ggrc.query_helper import WithQueryApi
+
+
+@ddt.ddt
+class TestKeysetPagination(WithQueryApi, TestCase):
+  """Test /query api with cursor pagination."""
+
+  def setUp(self):
+    super(TestKeysetPagination, self).setUp()
+    self.client.get("/login")
+    with factories.single_commit():
+      # Duplicated titles check that id breaks ties between pages.
+      for title in ["b", "a", "c", "a", "d", "b", "e"]:
+        factories.ControlFactory(title=title)
+
+  def _get_page(self, cursor, order_by=None, **kwargs):
+    """Get one page of Controls for the cursor."""
+    query = self._make_query_dict("Control", type_="ids", limit=[0, 3],
+                                  order_by=order_by)
+    query["cursor"] = cursor
+    query.update(kwargs)
+    return self._get_first_result_set([query], "Control")
+
+  def _get_all_pages(self, order_by=None):
+    """Walk through all pages following the cursors."""
+    ids = []
+    cursor = ""
+    while cursor is not None:
+      page = self._get_page(cursor, order_by)
+      self.assertLessEqual(page["count"], 3)
+      self.assertNotIn("total", page)
+      ids.extend(page["ids"])
+      cursor = page["next_cursor"]
+    return ids
+
+  @ddt.data(
+      None,
+      [{"name": "title"}],
+      [{"name": "title", "desc": True}],
+      [{"name": "title", "desc": True}, {"name": "id"}],
+  )
+  def test_pages_match_unpaged_query(self, order_by):
+    """Cursor pages cover ordered query result once for {}."""
+    # Keyset pages are ordered by id after the requested columns.
+    full_order_by = list(order_by or [])
+    if {"name": "id"} not in full_order_by:
+      full_order_by.append({"name": "id"})
+    expected = self._get_first_result_set(
+        [self._make_query_dict("Control", type_="ids",
+                               order_by=full_order_by)],
+        "Control", "ids",
+    )
+    ids = self._get_all_pages(order_by)
+    self.assertEqual(len(ids), 7)
+    self.assertEqual(len(set(ids)), 7)
+    self.assertEqual(ids, expected)
+
+  def test_count_total(self):
+    """Total count is returned only if requested."""
+    page = self._get_page("", count_total=True)
+    self.assertEqual(page["total"], 7)
+    self.assertEqual(page["count"], 3)
+
+  def test_invalid_cursor(self):
+    """Invalid cursor is rejected."""
+    query = self._make_query_dict("Control", limit=[0, 3])
+    query["cursor"] = "invalid"
+    self.assert400(self._post([query]))
+
+  def test_cursor_requires_limit(self):
+    """Cursor pagination can't be used without limit."""
+    query = self._make_query_dict("Control")
+    query["cursor"] = ""
+    self.assert400(self._post([query]))
@@ -0,0 +1,80 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for permission filters of /query api for users with many objects."""
+
+import ddt
+import mock
+
+from ggrc.models import all_models
+from ggrc.rbac import permissions
+
+from integration.ggrc import TestCase
+from integration.ggrc.api_helper import Api
+from integration.ggrc.generator import ObjectGenerator
+from integration.ggrc.models import factories
+from integration.ggrc.query_helper import WithQueryApi
+
+
+@ddt.ddt
+class TestPermissionFilter(WithQueryApi, TestCase):
+  """Test resources filter of a Creator with ACL granted objects."""
+
+  def setUp(self):
+    super(TestPermissionFilter, self).setUp()
+    self.api = Api()
+    self.person = ObjectGenerator().generate_person(
+        data={"name": "Creator"}, user_role="Creator")[1]
+    with factories.single_commit():
+      acr = factories.AccessControlRoleFactory(
+          object_type="Control", read=True, update=False, delete=False)
+      update_acr = factories.AccessControlRoleFactory(
+          object_type="Control", read=False, update=True, delete=False)
+      controls = [factories.ControlFactory() for _ in range(5)]
+      for control in controls[:3]:
+        factories.AccessControlListFactory(
+            object=control, ac_role=acr, person=self.person)
+      for control in controls[3:]:
+        factories.AccessControlListFactory(
+            object=control, ac_role=update_acr, person=self.person)
+    self.readable_ids = [control.id for control in controls[:3]]
+    self.updatable_ids = [control.id for control in controls[3:]]
+    self.api.set_user(self.person)
+    self.client = self.api.client
+
+  def _get_ids(self, permissions_type="read"):
+    query = self._make_query_dict("Control", type_="ids")
+    query["permissions"] = permissions_type
+    return self._get_first_result_set(query, "Control", "ids")
+
+  @ddt.data(1000, 1)
+  def test_read_filter(self, limit):
+    """Only ACL granted objects are returned with in-list limit {0}."""
+    with mock.patch.object(permissions, "RESOURCES_IN_LIST_LIMIT", limit):
+      self.assertItemsEqual(self._get_ids(), self.readable_ids)
+
+  @ddt.data(1000, 1)
+  def test_update_filter(self, limit):
+    """Only roles with update permission grant it with in-list limit {0}."""
+    with mock.patch.object(permissions, "RESOURCES_IN_LIST_LIMIT", limit):
+      self.assertItemsEqual(self._get_ids("update"), self.updatable_ids)
+
+  def test_temporary_table(self):
+    """Resources are materialized if they can't be selected with a query."""
+    with mock.patch.object(permissions, "RESOURCES_IN_LIST_LIMIT", 1), \
+        mock.patch.object(permissions, "_get_resources_query",
+                          return_value=None):
+      self.assertItemsEqual(self._get_ids(), self.readable_ids)
+
+  def test_temporary_tables_in_search(self):
+    """Collection search refers to two materialized resource lists."""
+    with mock.patch.object(permissions, "RESOURCES_IN_LIST_LIMIT", 1), \
+        mock.patch.object(permissions, "_get_resources_query",
+                          return_value=None):
+      response = self.api.get_query(all_models.Control, "__search=title")
+    self.assert200(response)
+    self.assertItemsEqual(
+        [control["id"]
+         for control in response.json["controls_collection"]["controls"]],
+        self.readable_ids,
+    )
@@ -78,3 +78,27 @@ class TestResource(TestCase):
     self.assert400(response)
     self.assertEqual(response.json['message'], 'Query parameter "q" '
                      'specifying search terms must be provided.')
+
+  def test_counts_and_results(self):
+    """Test combined counts and results equal to separate calls."""
+    counts_response, _ = self.api.search("Control,Program", counts=True)
+    response = self.api.client.get(
+        "/search?q=&types=Control,Program&counts_and_results=true&limit=2")
+    self.assert200(response)
+    results = response.json["results"]
+
+    self.assertEqual(results["counts"],
+                     counts_response.json["results"]["counts"])
+    self.assertEqual(results["counts"]["Control"], 5)
+    self.assertEqual(len(results["entries"]["Control"]), 2)
+    all_ids = {entry["id"] for entry in self.search("Control")}
+    self.assertTrue(
+        {entry["id"] for entry in results["entries"]["Control"]} <= all_ids)
+
+  def test_counts_and_results_bad_limit(self):
+    """Test combined counts and results to fail on a non-numeric limit."""
+    response = self.api.client.get(
+        "/search?q=&types=Control&counts_and_results=true&limit=two")
+    self.assert400(response)
+    self.assertEqual(response.json['message'], 'Query parameter "limit" '
+                     'must be a non-negative integer.')
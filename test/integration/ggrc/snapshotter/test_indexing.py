@@ -12,6 +12,7 @@ from ggrc import db
 from ggrc import models
 from ggrc.models import all_models
 from ggrc.fulltext.mysql import MysqlRecordProperty as Record
+from ggrc.snapshotter import indexer
 from ggrc.snapshotter.indexer import delete_records
 
 from integration.ggrc.snapshotter import SnapshotterBaseTestCase
@@ -345,6 +346,33 @@ class TestSnapshotIndexing(SnapshotterBaseTestCase):
 
     self.assertEqual(records.count(), 66)
 
+  @ddt.data(1, 2)
+  def test_reindex_processes(self, processes):
+    """Test full reindex of snapshots in chunks and worker processes"""
+    self._check_csv_response(self._import_file("snapshotter_create.csv"), {})
+    program = db.session.query(models.Program).filter(
+        models.Program.slug == "Prog-13211"
+    ).one()
+    self.create_audit(program)
+    snapshot_ids = {s.id for s in db.session.query(models.Snapshot)}
+
+    def get_snapshot_records():
+      return set(Record.query.filter(Record.type == "Snapshot").values(
+          Record.key, Record.tags, Record.property, Record.subproperty,
+          Record.content))
+
+    expected = get_snapshot_records()
+    delete_records(snapshot_ids)
+    self.assertEqual(get_snapshot_records(), set())
+
+    with patch("ggrc.snapshotter.indexer.REINDEX_CHUNK_SIZE", 2):
+      handled = indexer.reindex(processes=processes)
+    # Records must be committed, not only written in the current session
+    db.session.rollback()
+
+    self.assertEqual(handled, len(snapshot_ids))
+    self.assertEqual(get_snapshot_records(), expected)
+
   def assert_indexed_fields(self, obj, search_property, values):
     """Assert index content in full text search table."""
     all_found_records = dict(Record.query.filter(
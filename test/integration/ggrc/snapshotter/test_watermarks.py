@@ -0,0 +1,115 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for snapshot updates with revision watermarks."""
+
+import mock
+
+from ggrc import db
+from ggrc import settings
+import ggrc.models as models
+from ggrc.snapshotter import watermarks
+from ggrc.snapshotter.datastructures import Pair
+from ggrc.snapshotter.datastructures import Stub
+
+from integration.ggrc.snapshotter import SnapshotterBaseTestCase
+
+
+class TestWatermarks(SnapshotterBaseTestCase):
+  """Tests for snapshot updates that skip unchanged objects."""
+
+  def setUp(self):
+    super(TestWatermarks, self).setUp()
+    for patcher in [
+        mock.patch.object(settings, "SNAPSHOT_CHANGE_TRACKING", True,
+                          create=True),
+        mock.patch.object(settings, "SNAPSHOT_WATERMARK_LAG", 0,
+                          create=True),
+    ]:
+      patcher.start()
+      self.addCleanup(patcher.stop)
+
+    program = self.create_object(models.Program, {
+        "title": "Test Program Snapshot 1"
+    })
+    self.controls = [
+        self.create_object(models.Control, {
+            "title": "Test Control Snapshot {}".format(i)
+        })
+        for i in range(2)
+    ]
+    for control in self.controls:
+      self.create_mapping(program, control)
+    self.create_audit(program)
+    self.audit = db.session.query(models.Audit).filter(
+        models.Audit.title.like("%Snapshotable audit%")).one()
+
+  def upsert(self, revisions=None):
+    """Run upsert operation on the audit."""
+    audit = self.refresh_object(self.audit)
+    snapshots = {"operation": "upsert"}
+    if revisions:
+      snapshots["revisions"] = revisions
+    self.api.modify_object(audit, {"snapshots": snapshots})
+
+  def get_snapshot(self, control):
+    return models.Snapshot.query.filter_by(
+        parent_type="Audit",
+        parent_id=self.audit.id,
+        child_type="Control",
+        child_id=control.id,
+    ).one()
+
+  def get_watermark(self):
+    return watermarks.get_watermark({Stub("Audit", self.audit.id)})
+
+  def test_update_changed_objects(self):
+    """Only snapshots of changed objects are updated and reindexed."""
+    self.upsert()
+    self.assertIsNotNone(self.get_watermark())
+
+    control = self.refresh_object(self.controls[0])
+    self.api.modify_object(control, {"title": "Test Control Snapshot EDIT"})
+    with mock.patch("ggrc.snapshotter.reindex_pairs") as reindex_pairs:
+      self.upsert()
+
+    audit = Stub("Audit", self.audit.id)
+    reindex_pairs.assert_called_once_with(
+        {Pair(audit, Stub("Control", control.id))})
+    self.assertEqual(self.get_snapshot(control).revision.content["title"],
+                     "Test Control Snapshot EDIT")
+    latest_revision = models.Revision.query.filter_by(
+        resource_type="Control",
+        resource_id=control.id,
+    ).order_by(models.Revision.id.desc()).first()
+    self.assertGreaterEqual(self.get_watermark(), latest_revision.id)
+
+  def test_selected_revision_clears_watermark(self):
+    """Update to a selected revision removes the watermark."""
+    self.upsert()
+    control = self.refresh_object(self.controls[0])
+    revision_id = self.get_snapshot(control).revision_id
+    self.api.modify_object(control, {"title": "Test Control Snapshot EDIT"})
+
+    self.upsert(revisions=[{
+        "parent": self.objgen.create_stub(self.audit),
+        "child": self.objgen.create_stub(control),
+        "revision_id": revision_id,
+    }])
+
+    self.assertIsNone(self.get_watermark())
+    self.assertEqual(self.get_snapshot(control).revision_id, revision_id)
+
+  def test_recent_revisions_not_passed(self):
+    """Revisions within the lag window are checked by the next update."""
+    with mock.patch.object(settings, "SNAPSHOT_WATERMARK_LAG", 600):
+      self.upsert()
+    first_revision = models.Revision.query.order_by(
+        models.Revision.id).first()
+    self.assertLess(self.get_watermark(), first_revision.id)
+
+    control = self.refresh_object(self.controls[0])
+    self.api.modify_object(control, {"title": "Test Control Snapshot EDIT"})
+    self.upsert()
+    self.assertEqual(self.get_snapshot(control).revision.content["title"],
+                     "Test Control Snapshot EDIT")
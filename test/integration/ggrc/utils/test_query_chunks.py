@@ -0,0 +1,43 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for chunked iteration over queries."""
+
+import ddt
+import mock
+
+from ggrc import db
+from ggrc.models import all_models
+from ggrc.utils import query_chunks
+
+from integration.ggrc import TestCase
+from integration.ggrc.models import factories
+
+
+@ddt.ddt
+class TestQueryChunks(TestCase):
+  """Tests for iter_chunks."""
+
+  def setUp(self):
+    super(TestQueryChunks, self).setUp()
+    with factories.single_commit():
+      for i in range(5):
+        factories.ControlFactory(title="Control {}".format(i % 2))
+
+  @ddt.data(False, True)
+  def test_composite_key(self, stream):
+    """All rows are yielded once in key order."""
+    control = all_models.Control
+    query = db.session.query(control.title, control.id)
+    progress = mock.Mock()
+
+    chunks = list(query_chunks.iter_chunks(
+        query, [control.title, control.id], chunk_size=2, stream=stream,
+        progress=progress,
+    ))
+
+    self.assertEqual([len(rows) for rows in chunks], [2, 2, 1])
+    rows = [tuple(row) for rows in chunks for row in rows]
+    self.assertEqual(rows, sorted(query.all()))
+    self.assertEqual(progress.call_args_list,
+                     [mock.call(2), mock.call(4), mock.call(5)])
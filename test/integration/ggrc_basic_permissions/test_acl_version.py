@@ -0,0 +1,75 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for ACL deltas of cached permissions."""
+
+import mock
+
+from ggrc import db
+from ggrc import settings
+from ggrc.models import all_models
+from ggrc_basic_permissions import load_access_control_list
+
+from integration.ggrc import TestCase
+from integration.ggrc.models import factories
+
+
+class TestAclVersion(TestCase):
+  """Test versions of ACL entries loaded into permissions."""
+
+  def setUp(self):
+    super(TestAclVersion, self).setUp()
+    with factories.single_commit():
+      self.person = factories.PersonFactory()
+      self.role = factories.AccessControlRoleFactory(
+          object_type="Control", read=True)
+      self.controls = [factories.ControlFactory() for _ in range(2)]
+      self.acls = [
+          factories.AccessControlListFactory(
+              ac_role=self.role, object=control, person=self.person)
+          for control in self.controls
+      ]
+
+  @staticmethod
+  def get_readable_ids(permissions):
+    """Get ids of controls readable with the permissions."""
+    resources = permissions.get("read", {}).get("Control", {})
+    return resources.get("resources", set())
+
+  def test_settled_entries_version(self):
+    """Entries older than the lag advance the ACL version."""
+    with mock.patch.object(settings, "PERMISSION_ACL_VERSION_LAG", 0,
+                           create=True):
+      permissions = {}
+      acl_version = load_access_control_list(self.person, permissions, 0)
+    self.assertEqual(acl_version, max(acl.id for acl in self.acls))
+    self.assertEqual(self.get_readable_ids(permissions),
+                     {control.id for control in self.controls})
+
+  def test_late_commit_of_lower_id(self):
+    """Entry committed after an entry with a higher id was loaded."""
+    # Entries of the test are newer than the default lag
+    lower_acl, higher_acl = sorted(self.acls, key=lambda acl: acl.id)
+    lower_id, lower_object_id = lower_acl.id, lower_acl.object_id
+    # Hide the entry with the lower id as if its transaction is still open
+    db.session.delete(lower_acl)
+    db.session.commit()
+
+    permissions = {}
+    acl_version = load_access_control_list(self.person, permissions, 0)
+    self.assertEqual(self.get_readable_ids(permissions),
+                     {higher_acl.object_id})
+    self.assertLess(acl_version, lower_id)
+
+    factories.AccessControlListFactory(
+        id=lower_id,
+        ac_role=self.role,
+        object=all_models.Control.query.get(lower_object_id),
+        person=self.person,
+    )
+    db.session.commit()
+
+    acl_version = load_access_control_list(self.person, permissions,
+                                           acl_version)
+    self.assertIn(lower_object_id, self.get_readable_ids(permissions))
+    self.assertLess(acl_version, lower_id)
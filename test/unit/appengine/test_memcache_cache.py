@@ -0,0 +1,80 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Test batched operations of MemCache collection cache."""
+
+from unittest import TestCase
+
+import mock
+
+from appengine import base
+from ggrc.cache.memcache import MemCache
+
+
+@base.with_memcache
+class TestMemCache(TestCase):
+  """Test MemCache get, add, update and remove operations."""
+
+  def setUp(self):
+    self.cache = MemCache()
+    self.cache.add("collection", "controls", {
+        1: {"id": 1, "title": "first"},
+        2: {"id": 2, "title": "second"},
+    })
+
+  def test_partial_get(self):
+    """Ids found in cache are returned even if some ids are missing."""
+    result = self.cache.get("collection", "controls", {"ids": [1, 3, 2]})
+    self.assertEqual(result.keys(), [1, 2])
+    self.assertEqual(result[2], {"id": 2, "title": "second"})
+
+  def test_get_attrs(self):
+    """Only requested attributes are returned."""
+    result = self.cache.get("collection", "controls",
+                            {"ids": [1], "attrs": ["title"]})
+    self.assertEqual(dict(result[1]), {"title": "first"})
+
+  def test_single_roundtrip(self):
+    """All ids are fetched with one get_multi call."""
+    with mock.patch.object(self.cache.memcache_client, "get_multi",
+                           wraps=self.cache.memcache_client.get_multi) as get:
+      self.cache.get("collection", "controls", {"ids": range(100)})
+    self.assertEqual(get.call_count, 1)
+
+  def test_add_overwrites(self):
+    """Adding existing entry overwrites it."""
+    result = self.cache.add("collection", "controls", {
+        2: {"id": 2, "title": "new second"},
+        3: {"id": 3, "title": "third"},
+    })
+    self.assertEqual(sorted(result), [2, 3])
+    cached = self.cache.get("collection", "controls", {"ids": [1, 2, 3]})
+    self.assertEqual(cached[2]["title"], "new second")
+    self.assertEqual(cached[3]["title"], "third")
+
+  def test_update_present_only(self):
+    """Only entries present in cache are updated."""
+    result = self.cache.update("collection", "controls", {
+        1: {"id": 1, "title": "new first"},
+        4: {"id": 4, "title": "fourth"},
+    }, 0)
+    self.assertEqual(result.keys(), [1])
+    cached = self.cache.get("collection", "controls", {"ids": [1, 4]})
+    self.assertEqual(cached.keys(), [1])
+    self.assertEqual(cached[1]["title"], "new first")
+
+  def test_remove(self):
+    """Removed entries are not returned anymore."""
+    self.cache.remove("collection", "controls", {1: None, 5: None})
+    cached = self.cache.get("collection", "controls", {"ids": [1, 2]})
+    self.assertEqual(cached.keys(), [2])
+
+  def test_add_multi_overwrites(self):
+    """add_multi stores both new and already cached entries."""
+    self.memcache_client.set("key_1", "old")
+    not_stored = self.cache.add_multi({"key_1": "new", "key_2": "value"})
+    self.assertFalse(not_stored)
+    self.assertEqual(
+        self.cache.get_multi(["key_1", "key_2", "key_3"]),
+        {"key_1": "new", "key_2": "value"},
+    )
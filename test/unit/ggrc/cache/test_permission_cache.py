@@ -0,0 +1,78 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for generation based invalidation of cached permissions."""
+
+import unittest
+
+import flask
+import mock
+
+from ggrc import app  # noqa - this is needed for imports to work
+from ggrc.cache import rediscache
+from ggrc.cache import utils
+
+
+class TestPermissionCacheKey(unittest.TestCase):
+  """Test permission cache keys and their invalidation."""
+
+  def setUp(self):
+    self.client = rediscache.RedisClient(
+        rediscache.FakeRedisServer().connection())
+    manager = mock.Mock()
+    manager.cache_object.memcache_client = self.client
+    patches = [
+        mock.patch.object(utils, "get_cache_manager", return_value=manager),
+        mock.patch.object(utils.settings, "MEMCACHE_MECHANISM", True,
+                          create=True),
+    ]
+    for patch in patches:
+      patch.start()
+      self.addCleanup(patch.stop)
+
+  def test_key_is_stable(self):
+    """Reading the key twice doesn't change it and doesn't write."""
+    key = utils.get_permission_cache_key(self.client, 1)
+    with mock.patch.object(self.client, "add_multi") as add_multi:
+      self.assertEqual(utils.get_permission_cache_key(self.client, 1), key)
+    add_multi.assert_not_called()
+
+  def test_clear_users(self):
+    """Clearing user permissions changes only keys of that user."""
+    first_key = utils.get_permission_cache_key(self.client, 1)
+    second_key = utils.get_permission_cache_key(self.client, 2)
+    utils.clear_users_permission_cache([1])
+    self.assertNotEqual(utils.get_permission_cache_key(self.client, 1),
+                        first_key)
+    self.assertEqual(utils.get_permission_cache_key(self.client, 2),
+                     second_key)
+
+  def test_clear_all(self):
+    """Clearing all permissions changes keys of all users."""
+    keys = [utils.get_permission_cache_key(self.client, user_id)
+            for user_id in (1, 2)]
+    utils.clear_permission_cache()
+    for user_id, key in zip((1, 2), keys):
+      self.assertNotEqual(
+          utils.get_permission_cache_key(self.client, user_id), key)
+
+  def test_evicted_generation(self):
+    """Evicted counter doesn't restore an old key."""
+    key = utils.get_permission_cache_key(self.client, 1)
+    self.client.delete(utils.PERMISSIONS_GENERATION_KEY)
+    with mock.patch("time.time", return_value=10 ** 10):
+      self.assertNotEqual(utils.get_permission_cache_key(self.client, 1), key)
+
+  def test_marked_users(self):
+    """Marked users get new keys after commit."""
+    first_key = utils.get_permission_cache_key(self.client, 1)
+    second_key = utils.get_permission_cache_key(self.client, 2)
+    with flask.Flask(__name__).app_context():
+      utils.mark_users_permission_changes([1, None])
+      self.assertEqual(utils.get_permission_cache_key(self.client, 1),
+                       first_key)
+      utils._invalidate_permission_changes(None)
+    self.assertNotEqual(utils.get_permission_cache_key(self.client, 1),
+                        first_key)
+    self.assertEqual(utils.get_permission_cache_key(self.client, 2),
+                     second_key)
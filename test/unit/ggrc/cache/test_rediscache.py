@@ -0,0 +1,108 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for Redis cache backend."""
+
+import unittest
+
+import mock
+
+from ggrc.cache import rediscache
+
+
+class TestEncoding(unittest.TestCase):
+  """Test RESP encoding of commands."""
+
+  def test_encode_command(self):
+    self.assertEqual(
+        rediscache.encode_command(["SET", "key", u"\xe9", 5]),
+        "*4\r\n$3\r\nSET\r\n$3\r\nkey\r\n$2\r\n\xc3\xa9\r\n$1\r\n5\r\n",
+    )
+
+
+class TestRedisClient(unittest.TestCase):
+  """Test memcache compatible client against the fake server."""
+
+  def setUp(self):
+    self.server = rediscache.FakeRedisServer()
+    self.client = rediscache.RedisClient(self.server.connection())
+
+  def test_multi_get_partial(self):
+    """get_multi returns only the found keys without prefix."""
+    self.client.set_multi({"1": {"id": 1}, "2": [2]}, key_prefix="c:")
+    self.assertEqual(
+        self.client.get_multi(["1", "2", "3"], key_prefix="c:"),
+        {"1": {"id": 1}, "2": [2]},
+    )
+
+  def test_pipelined(self):
+    """Multi-key operations are sent as a single pipeline."""
+    with mock.patch.object(self.client.connection, "execute",
+                           wraps=self.client.connection.execute) as execute:
+      self.client.set_multi({str(i): i for i in range(10)}, time=10)
+      self.client.get_multi([str(i) for i in range(10)])
+    self.assertEqual(execute.call_count, 2)
+
+  def test_add_and_cas(self):
+    """add stores only new keys and cas replaces only existing ones."""
+    self.client.set("a", 1)
+    self.assertEqual(self.client.add_multi({"a": 2, "b": 3}), ["a"])
+    self.assertEqual(self.client.cas_multi({"a": 4, "c": 5}), ["c"])
+    self.assertEqual(self.client.get_multi(["a", "b", "c"]),
+                     {"a": 4, "b": 3})
+
+  def test_ttl(self):
+    """Values expire after their TTL."""
+    with mock.patch("time.time", return_value=100):
+      self.client.set("a", "value", time=10)
+    with mock.patch("time.time", return_value=109):
+      self.assertEqual(self.client.get("a"), "value")
+    with mock.patch("time.time", return_value=111):
+      self.assertIsNone(self.client.get("a"))
+
+  def test_offset_multi(self):
+    """Counters are incremented atomically."""
+    self.client.offset_multi({"a": 1, "b": 1}, key_prefix="gen:")
+    self.assertEqual(self.client.offset_multi({"a": 1}, key_prefix="gen:"),
+                     {"a": 2})
+    self.assertEqual(self.client.get_multi(["a", "b"], key_prefix="gen:"),
+                     {"a": 2, "b": 1})
+
+  def test_delete(self):
+    self.client.set("a", 1)
+    self.assertEqual(self.client.delete("a"), rediscache.DELETE_SUCCESSFUL)
+    self.assertEqual(self.client.delete("a"), rediscache.DELETE_ITEM_MISSING)
+
+  def test_network_failure(self):
+    """Connection errors are reported as cache misses."""
+    with mock.patch.object(self.client.connection, "execute",
+                           side_effect=rediscache.RedisError("down")):
+      self.assertEqual(self.client.get_multi(["a"]), {})
+      self.assertEqual(self.client.add_multi({"a": 1}), ["a"])
+      self.assertEqual(self.client.delete("a"),
+                       rediscache.DELETE_NETWORK_FAILURE)
+
+
+class TestRedisCache(unittest.TestCase):
+  """Test collection cache operations on Redis backend."""
+
+  def setUp(self):
+    client = rediscache.RedisClient(rediscache.FakeRedisServer().connection())
+    self.cache = rediscache.RedisCache(client)
+    self.cache.add("collection", "controls", {
+        1: {"id": 1, "title": "first"},
+        2: {"id": 2, "title": "second"},
+    })
+
+  def test_get(self):
+    result = self.cache.get("collection", "controls", {"ids": [1, 3]})
+    self.assertEqual(result, {1: {"id": 1, "title": "first"}})
+
+  def test_update_and_remove(self):
+    self.cache.update("collection", "controls",
+                      {1: {"id": 1, "title": "new"}, 4: {"id": 4}}, 0)
+    self.cache.remove("collection", "controls", {2: None})
+    self.assertEqual(
+        self.cache.get("collection", "controls", {"ids": [1, 2, 4]}),
+        {1: {"id": 1, "title": "new"}},
+    )
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for query pagination helpers."""
+
+import datetime
+import unittest
+
+import ddt
+
+from ggrc.query import pagination
+from ggrc.query.exceptions import BadQueryException
+
+
+@ddt.ddt
+class TestKeysetCursor(unittest.TestCase):
+  """Test encoding and decoding of keyset pagination cursors."""
+
+  @ddt.data(
+      [1],
+      [u"title", 42],
+      [None, 3],
+      [datetime.datetime(2018, 1, 2, 3, 4, 5, 6), 7],
+      [datetime.date(2018, 1, 2), u"текст", 8],
+  )
+  def test_cursor_round_trip(self, values):
+    """Cursor keeps values and their types."""
+    cursor = pagination.encode_cursor(values)
+    self.assertEqual(pagination.decode_cursor(cursor), values)
+
+  @ddt.data("not a cursor", "e30=", "")
+  def test_invalid_cursor(self, cursor):
+    """Invalid cursor raises BadQueryException."""
+    with self.assertRaises(BadQueryException):
+      pagination.decode_cursor(cursor)
@@ -0,0 +1,146 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for query result cache."""
+
+import unittest
+
+import ddt
+import flask
+import mock
+import sqlalchemy as sa
+
+from ggrc import app  # noqa - this is needed for imports to work
+from ggrc.query import result_cache
+
+
+class TestLocalResultCache(unittest.TestCase):
+  """Test in-process query result cache."""
+
+  def setUp(self):
+    self.cache = result_cache.LocalResultCache(max_entries=2, expiry=60)
+
+  def test_lru_eviction(self):
+    """The least recently used entry is evicted."""
+    self.cache.set("a", 1)
+    self.cache.set("b", 2)
+    self.assertEqual(self.cache.get("a"), 1)
+    self.cache.set("c", 3)
+    self.assertEqual(self.cache.get("a"), 1)
+    self.assertIsNone(self.cache.get("b"))
+    self.assertEqual(self.cache.get("c"), 3)
+
+  def test_expiry(self):
+    """Expired entries are not returned."""
+    with mock.patch("time.time", return_value=100):
+      self.cache.set("a", 1)
+    with mock.patch("time.time", return_value=161):
+      self.assertIsNone(self.cache.get("a"))
+
+  def test_generations(self):
+    """Generation counters are bumped per model."""
+    self.cache.bump_generations(["Control", "Audit"])
+    self.cache.bump_generations(["Control"])
+    self.assertEqual(
+        self.cache.get_generations(["Control", "Audit", "Issue"]),
+        {"Control": 2, "Audit": 1, "Issue": 0},
+    )
+
+
+@mock.patch("ggrc.query.result_cache.get_current_user_id", return_value=1)
+class TestCacheKey(unittest.TestCase):
+  """Test query result cache keys."""
+
+  @staticmethod
+  def make_query(object_name, expression):
+    return {"object_name": object_name, "filters": {"expression": expression}}
+
+  def test_key_is_canonical(self, _):
+    """Key doesn't depend on the order of dict items."""
+    first = self.make_query("Control", {"left": "title", "right": "a"})
+    second = self.make_query("Control", {"right": "a", "left": "title"})
+    self.assertEqual(
+        result_cache.get_cache_key(first, [first], {"Control": 1}),
+        result_cache.get_cache_key(second, [second], {"Control": 1}),
+    )
+
+  def test_key_depends_on_generations(self, _):
+    """Key changes when a generation of dependent model changes."""
+    query = self.make_query("Control", {})
+    self.assertNotEqual(
+        result_cache.get_cache_key(query, [query], {"Control": 1}),
+        result_cache.get_cache_key(query, [query], {"Control": 2}),
+    )
+
+  def test_key_depends_on_user(self, user_id_mock):
+    """Key is different for different users."""
+    query = self.make_query("Control", {})
+    first_key = result_cache.get_cache_key(query, [query], {})
+    user_id_mock.return_value = 2
+    self.assertNotEqual(
+        first_key,
+        result_cache.get_cache_key(query, [query], {}),
+    )
+
+  def test_dependencies(self, _):
+    """Dependencies contain all objects from expression."""
+    query = self.make_query("Control", {
+        "left": {"object_name": "Program", "op": {"name": "relevant"}},
+        "op": {"name": "AND"},
+        "right": {"object_name": "__previous__", "ids": [0]},
+    })
+    previous = self.make_query("Audit", {"object_name": "Issue"})
+    dependencies = result_cache.get_dependencies(query, [previous, query])
+    self.assertTrue(
+        {"Control", "Program", "Audit", "Issue"}.issubset(dependencies))
+    self.assertTrue(
+        result_cache.ALWAYS_DEPENDS_ON.issubset(dependencies))
+    self.assertNotIn("__previous__", dependencies)
+
+
+@ddt.ddt
+class TestWrittenTable(unittest.TestCase):
+  """Test detection of tables changed by Core and text statements."""
+
+  table = sa.sql.table("relationships", sa.sql.column("id"))
+
+  @ddt.data(
+      "INSERT INTO relationships (id) VALUES (1)",
+      "insert ignore into `relationships` (id) select 1",
+      "  UPDATE relationships SET id = 1",
+      "DELETE FROM relationships WHERE id = 1",
+  )
+  def test_text_statements(self, statement):
+    """Target table of text statement {} is detected."""
+    self.assertEqual(result_cache.get_written_table(statement),
+                     "relationships")
+    self.assertEqual(result_cache.get_written_table(sa.text(statement)),
+                     "relationships")
+
+  def test_core_statements(self):
+    """Target table of Core insert, update and delete is detected."""
+    for statement in (self.table.insert(), self.table.update(),
+                      self.table.delete().prefix_with("IGNORE")):
+      self.assertEqual(result_cache.get_written_table(statement),
+                       "relationships")
+
+  @ddt.data(
+      "SELECT * FROM relationships",
+      "truncate objects_without_revisions",
+  )
+  def test_other_statements(self, statement):
+    """Statement {} is not treated as a write."""
+    self.assertIsNone(result_cache.get_written_table(statement))
+    self.assertIsNone(
+        result_cache.get_written_table(sa.select([self.table.c.id])))
+
+  @mock.patch("ggrc.query.result_cache._get_table_models",
+              return_value={"relationships": {"Relationship"}})
+  def test_after_execute(self, _):
+    """Models of tables changed by executed statements are collected."""
+    with flask.Flask(__name__).app_context():
+      result_cache.after_execute(None, self.table.insert())
+      result_cache.after_execute(None, sa.select([self.table.c.id]))
+      result_cache.mark_modified(["Control"])
+      self.assertEqual(result_cache._get_modified_models(),
+                       {"Relationship", "Control"})
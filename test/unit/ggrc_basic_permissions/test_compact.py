@@ -0,0 +1,44 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for compact representation of cached permissions."""
+
+import unittest
+
+from ggrc import app  # noqa - this is needed for imports to work
+from ggrc_basic_permissions import compact
+
+
+class TestCompactPermissions(unittest.TestCase):
+  """Test packing and unpacking of permissions."""
+
+  def test_pack_ids(self):
+    """Ids are restored after packing."""
+    ids = {5, 1, 100000, 3, 2 ** 31 - 1}
+    self.assertEqual(compact.unpack_ids(compact.pack_ids(ids)), ids)
+
+  def test_pack_permissions(self):
+    """Permissions are restored and identical sets are stored once."""
+    permissions = {
+        "read": {
+            "Control": {"resources": {1, 2, 3}, "contexts": [None]},
+            "Audit": {"resources": {7}},
+        },
+        "update": {"Control": {"resources": {1, 2, 3}}},
+        "__GGRC_ADMIN__": {"__GGRC_ALL__": {"contexts": [4]}},
+    }
+    packed = compact.pack_permissions(permissions)
+    self.assertEqual(len(packed["arrays"]), 2)
+    self.assertIsInstance(permissions["read"]["Control"]["resources"], set)
+    self.assertEqual(compact.unpack_permissions(packed), permissions)
+
+  def test_unpacked_sets_independent(self):
+    """Sets restored from one array can be extended separately."""
+    permissions = {
+        "read": {"Control": {"resources": {1}}},
+        "update": {"Control": {"resources": {1}}},
+    }
+    unpacked = compact.unpack_permissions(
+        compact.pack_permissions(permissions))
+    unpacked["read"]["Control"]["resources"].add(2)
+    self.assertEqual(unpacked["update"]["Control"]["resources"], {1})